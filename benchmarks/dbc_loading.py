@@ -0,0 +1,121 @@
+"""Benchmarks of loading DBC files using the built-in parser and using canmatrix, in the format of asv (airspeed velocity).
+
+The DBC files are generated from the synthetic rules. Nested multiplexers are written using extended multiplexing, such
+that a few frames with nested multiplexers with many values hold thousands of signals. Without asv, run the benchmarks
+from the repository root to print the load time of each parser::
+
+    python -m benchmarks.dbc_loading [--id-count N] [--mux-depth N] [--mux-values N] [--repeat N]
+"""
+import argparse
+import time
+
+from io import BytesIO
+
+import can_decoder
+
+from .synthetic import build_db, to_dbc
+
+
+def _load(dbc: bytes, parser: str) -> can_decoder.SignalDB:
+    return can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN", parser=parser)
+
+
+class DBCLoadingSuite(object):
+    params = (["native", "canmatrix"], [100, 1000], [0, 2])
+    param_names = ["parser", "id_count", "mux_depth"]
+    timeout = 300
+
+    def setup(self, parser: str, id_count: int, mux_depth: int):
+        if parser == "canmatrix":
+            try:
+                import canmatrix  # noqa: F401
+            except ImportError:
+                raise NotImplementedError("canmatrix is not installed")
+
+        self.dbc = to_dbc(build_db("J1939", id_count=id_count, mux_depth=mux_depth))
+        return
+
+    def time_load(self, parser: str, id_count: int, mux_depth: int):
+        _load(self.dbc, parser)
+        return
+
+    def peakmem_load(self, parser: str, id_count: int, mux_depth: int):
+        _load(self.dbc, parser)
+        return
+
+    pass
+
+
+class MultiplexedDBCLoadingSuite(object):
+    """Loading of a frame with two levels of extended multiplexing, holding about 1,500 (16 values) to 25,000 (64
+    values) signals.
+    """
+    params = (["native", "canmatrix"], [16, 64])
+    param_names = ["parser", "mux_values"]
+    timeout = 300
+
+    def setup(self, parser: str, mux_values: int):
+        DBCLoadingSuite.setup(self, parser, 1, 2)
+
+        self.dbc = to_dbc(build_db("J1939", id_count=1, mux_depth=2, mux_values=mux_values))
+        return
+
+    def time_load(self, parser: str, mux_values: int):
+        _load(self.dbc, parser)
+        return
+
+    pass
+
+
+class BulkDBCLoadingSuite(object):
+    """Loading of 24 DBC files, of which 12 are distinct, using load_dbcs with a varying number of worker processes.
+    """
+    params = ([1, 2, 4],)
+    param_names = ["workers"]
+    timeout = 300
+
+    def setup(self, workers: int):
+        self.dbcs = [
+            to_dbc(build_db("J1939", id_count=200, signal_density=0.8, seed=seed)) for seed in range(12)
+        ] * 2
+        return
+
+    def time_load(self, workers: int):
+        can_decoder.load_dbcs([BytesIO(dbc) for dbc in self.dbcs], workers=workers, use_custom_attribute="SPN")
+        return
+
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--id-count", type=int, default=2000)
+    parser.add_argument("--mux-depth", type=int, default=1)
+    parser.add_argument("--mux-values", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = build_db("J1939", id_count=args.id_count, mux_depth=args.mux_depth, mux_values=args.mux_values)
+    dbc = to_dbc(db)
+    print("{:,} frames, {:,} signals, {:,.1f} MiB".format(args.id_count, len(db.signals()), len(dbc) / 2 ** 20))
+
+    for name in ("native", "canmatrix"):
+        best = None
+
+        try:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                _load(dbc, name)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+        except ImportError:
+            print("{:<10} not installed".format(name))
+            continue
+
+        print("{:<10} {:>8.3f} s".format(name, best))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
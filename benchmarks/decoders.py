@@ -0,0 +1,192 @@
+"""Benchmarks of the DataFrame and iterator decoders on synthetic logs, in the format of asv (airspeed velocity).
+
+The "J1939" rules are decoded by the J1939 decoders, and the "OBD2" rules by the generic decoders. Without asv, run the
+benchmarks from the repository root to print the throughput and peak memory of each decoder::
+
+    python -m benchmarks.decoders [--records N] [--id-count N] [--mux-depth N] [--signal-density F] [--repeat N]
+                                  [--timestamp-format FORMAT]
+"""
+import argparse
+import time
+import tracemalloc
+
+import can_decoder
+
+from .synthetic import build_db, generate_records, to_data_frame
+
+
+# Number of records decoded by the asv benchmarks.
+RECORDS = 20000
+
+
+def _decode_data_frame(db: can_decoder.SignalDB, df) -> None:
+    can_decoder.DataFrameDecoder(db).decode_frame(df)
+    return
+
+
+def _decode_iterator(db: can_decoder.SignalDB, records, **kwargs) -> int:
+    count = 0
+
+    for _ in can_decoder.IteratorDecoder(records, db, **kwargs):
+        count += 1
+
+    return count
+
+
+class DataFrameDecoderSuite(object):
+    params = (["J1939", "OBD2"], [0, 2])
+    param_names = ["protocol", "mux_depth"]
+
+    def setup(self, protocol: str, mux_depth: int):
+        self.db = build_db(protocol, mux_depth=mux_depth)
+        self.df = to_data_frame(generate_records(self.db, RECORDS))
+        return
+
+    def time_decode(self, protocol: str, mux_depth: int):
+        _decode_data_frame(self.db, self.df)
+        return
+
+    def peakmem_decode(self, protocol: str, mux_depth: int):
+        _decode_data_frame(self.db, self.df)
+        return
+
+    def track_rows_per_second(self, protocol: str, mux_depth: int) -> float:
+        start = time.perf_counter()
+        _decode_data_frame(self.db, self.df)
+        return len(self.df) / (time.perf_counter() - start)
+
+    track_rows_per_second.unit = "rows/s"
+
+    pass
+
+
+class IteratorDecoderSuite(object):
+    params = (["J1939", "OBD2"], [0, 2], ["record", "batch", "scalar"])
+    param_names = ["protocol", "mux_depth", "mode"]
+
+    _mode_kwargs = {
+        "record": {},
+        "batch": {"batch_size": 1024},
+        "scalar": {"scalar": True},
+    }
+
+    def setup(self, protocol: str, mux_depth: int, mode: str):
+        self.db = build_db(protocol, mux_depth=mux_depth)
+        self.records = generate_records(self.db, RECORDS)
+        self.kwargs = self._mode_kwargs[mode]
+        return
+
+    def time_decode(self, protocol: str, mux_depth: int, mode: str):
+        _decode_iterator(self.db, self.records, **self.kwargs)
+        return
+
+    def peakmem_decode(self, protocol: str, mux_depth: int, mode: str):
+        _decode_iterator(self.db, self.records, **self.kwargs)
+        return
+
+    def track_rows_per_second(self, protocol: str, mux_depth: int, mode: str) -> float:
+        start = time.perf_counter()
+        _decode_iterator(self.db, self.records, **self.kwargs)
+        return len(self.records) / (time.perf_counter() - start)
+
+    track_rows_per_second.unit = "rows/s"
+
+    def track_signals_per_second(self, protocol: str, mux_depth: int, mode: str) -> float:
+        start = time.perf_counter()
+        count = _decode_iterator(self.db, self.records, **self.kwargs)
+        return count / (time.perf_counter() - start)
+
+    track_signals_per_second.unit = "signals/s"
+
+    pass
+
+
+class IteratorTimestampSuite(object):
+    """Cost of converting the timestamps of the decoded signals, for each timestamp format.
+    """
+    params = (["datetime", "ns", "datetime64", "raw"], ["record", "scalar"])
+    param_names = ["timestamp_format", "mode"]
+
+    def setup(self, timestamp_format: str, mode: str):
+        self.db = build_db("J1939")
+        self.records = generate_records(self.db, RECORDS)
+        self.kwargs = dict(IteratorDecoderSuite._mode_kwargs[mode], timestamp_format=timestamp_format)
+        return
+
+    def time_decode(self, timestamp_format: str, mode: str):
+        _decode_iterator(self.db, self.records, **self.kwargs)
+        return
+
+    def track_signals_per_second(self, timestamp_format: str, mode: str) -> float:
+        start = time.perf_counter()
+        count = _decode_iterator(self.db, self.records, **self.kwargs)
+        return count / (time.perf_counter() - start)
+
+    track_signals_per_second.unit = "signals/s"
+
+    pass
+
+
+def _measure(function, repeat: int):
+    """Run a function repeatedly, returning its result, the best time in seconds and the peak memory traced in bytes.
+    """
+    best = None
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Trace memory in a separate run, as tracing slows down the decoding.
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=RECORDS)
+    parser.add_argument("--id-count", type=int, default=16)
+    parser.add_argument("--mux-depth", type=int, default=0)
+    parser.add_argument("--signal-density", type=float, default=1.0)
+    parser.add_argument("--unknown-ratio", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timestamp-format", default=None)
+    args = parser.parse_args()
+
+    iterator_kwargs = {"timestamp_format": args.timestamp_format}
+
+    for protocol in ("J1939", "OBD2"):
+        db = build_db(
+            protocol,
+            id_count=args.id_count,
+            mux_depth=args.mux_depth,
+            signal_density=args.signal_density
+        )
+        records = generate_records(db, args.records, unknown_ratio=args.unknown_ratio)
+        df = to_data_frame(records)
+
+        cases = [
+            ("DataFrame", lambda: _decode_data_frame(db, df)),
+            ("Iterator", lambda: _decode_iterator(db, records, **iterator_kwargs)),
+            ("Iterator batch", lambda: _decode_iterator(db, records, batch_size=1024, **iterator_kwargs)),
+            ("Iterator scalar", lambda: _decode_iterator(db, records, scalar=True, **iterator_kwargs)),
+        ]
+
+        for name, function in cases:
+            count, elapsed, peak = _measure(function, args.repeat)
+            signals = "" if count is None else "{:>12,.0f} signals/s".format(count / elapsed)
+            print("{:<6} {:<16} {:>12,.0f} rows/s {:>10,.1f} MiB peak {}".format(
+                protocol, name, len(records) / elapsed, peak / 2 ** 20, signals
+            ).rstrip())
+
+    return
+
+
+if __name__ == "__main__":
+    main()
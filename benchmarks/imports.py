@@ -0,0 +1,45 @@
+"""Benchmarks of the package import time, in the format of asv (airspeed velocity).
+
+Each import is timed in a fresh interpreter. Without asv, run the benchmarks from the repository root::
+
+    python -m benchmarks.imports
+"""
+import subprocess
+import sys
+
+
+def timeraw_import_can_decoder():
+    return "import can_decoder"
+
+
+def timeraw_import_data_frame_decoder():
+    return "from can_decoder import DataFrameDecoder"
+
+
+def main():
+    for name, function in sorted(globals().items()):
+        if not name.startswith("timeraw_"):
+            continue
+
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", function()],
+            check=True,
+            capture_output=True,
+            text=True
+        ).stderr
+
+        # Sum the cumulative times of the top level imports, in microseconds.
+        total = 0
+
+        for line in output.splitlines():
+            fields = line.split("|")
+
+            if len(fields) == 3 and fields[1].strip().isdigit() and not fields[2].startswith("  "):
+                total += int(fields[1])
+        print("{:<40} {:>8.1f} ms".format(name[len("timeraw_"):], total / 1000))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
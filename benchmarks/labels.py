@@ -0,0 +1,111 @@
+"""Benchmarks of adding the value descriptions (VAL_) of the signals to the DataFrame output, in the format of asv
+(airspeed velocity).
+
+Compares the built-in Label column to mapping the raw values of each signal with Series.map after decoding. The 4 bit
+signals of the synthetic rules have small value tables, and the 16 bit signals are given sparse value tables spanning
+their full range. Without asv, run the benchmarks from the repository root to print the time of each method::
+
+    python -m benchmarks.labels [--records N] [--repeat N]
+"""
+import argparse
+import time
+
+from io import BytesIO
+
+import can_decoder
+
+from .synthetic import build_db, generate_records, to_data_frame, to_dbc
+
+
+# Number of records decoded by the asv benchmarks.
+RECORDS = 20000
+
+
+def build_labeled_db() -> can_decoder.SignalDB:
+    db = can_decoder.load_dbc(BytesIO(to_dbc(build_db("OBD2"))))
+
+    for locations in (db.get_signal_locations(name) for name in db.signals()):
+        for location in locations:
+            if location.Signal.size == 16:
+                location.Signal.values = {value: "State{}".format(value) for value in range(0, 0x10000, 257)}
+
+    return db
+
+
+def _decode_with_labels(db: can_decoder.SignalDB, df):
+    return can_decoder.DataFrameDecoder(db).decode_frame(df, labels=True)
+
+
+def _decode_with_map(db: can_decoder.SignalDB, df):
+    result = can_decoder.DataFrameDecoder(db).decode_frame(df)
+
+    tables = {}
+
+    for name in db.signals():
+        for location in db.get_signal_locations(name):
+            if len(location.Signal.values) != 0:
+                tables[name] = location.Signal.values
+
+    labels = result["Raw Value"].astype(object)
+    labels[:] = None
+
+    for name, values in tables.items():
+        mask = (result["Signal"] == name).to_numpy()
+        labels[mask] = result["Raw Value"][mask].map(values)
+
+    result["Label"] = labels.astype("category")
+
+    return result
+
+
+class LabelSuite(object):
+    params = (["labels", "map"],)
+    param_names = ["method"]
+
+    def setup(self, method: str):
+        self.db = build_labeled_db()
+        self.df = to_data_frame(generate_records(self.db, RECORDS))
+        return
+
+    def time_decode(self, method: str):
+        if method == "labels":
+            _decode_with_labels(self.db, self.df)
+        else:
+            _decode_with_map(self.db, self.df)
+
+        return
+
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=RECORDS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = build_labeled_db()
+    df = to_data_frame(generate_records(db, args.records))
+
+    cases = [
+        ("No labels", lambda: can_decoder.DataFrameDecoder(db).decode_frame(df)),
+        ("Label column", lambda: _decode_with_labels(db, df)),
+        ("Series.map", lambda: _decode_with_map(db, df)),
+    ]
+
+    for name, function in cases:
+        best = None
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        print("{:<16} {:>8.3f} s".format(name, best))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
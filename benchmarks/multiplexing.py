@@ -0,0 +1,150 @@
+"""Benchmarks of decoding heavily multiplexed frames, in the format of asv (airspeed velocity).
+
+The rules model OBD2 service 01 responses: a single response ID, with the service and the PID as nested multiplexers
+and a signal for each PID. Without asv, run the benchmarks from the repository root to print the throughput of each
+decoder::
+
+    python -m benchmarks.multiplexing [--records N] [--pid-count N] [--repeat N]
+"""
+import argparse
+import time
+
+from random import Random
+from typing import List
+
+import can_decoder
+
+from .synthetic import to_data_frame
+
+
+# Number of records decoded by the asv benchmarks.
+RECORDS = 20000
+
+
+def build_service_01_db(pid_count: int = 100) -> can_decoder.SignalDB:
+    """Create rules for OBD2 service 01 responses, with pid_count PIDs (up to 256) of alternating one and two byte
+    values.
+    """
+    db = can_decoder.SignalDB(protocol="OBD2")
+
+    pid = can_decoder.Signal("PIDMux", 16, 8, signal_is_little_endian=False)
+
+    for value in range(pid_count):
+        pid.add_multiplexed_signal(value, can_decoder.Signal(
+            signal_name="PID{:02X}".format(value),
+            signal_start_bit=24,
+            signal_size=8 if value % 2 == 0 else 16,
+            signal_factor=0.25,
+            signal_is_little_endian=False,
+        ))
+
+    service = can_decoder.Signal("ServiceMux", 8, 8, signal_is_little_endian=False)
+    service.add_multiplexed_signal(0x41, pid)
+
+    frame = can_decoder.Frame(frame_id=0x7E8, frame_size=8, frame_name="Response")
+    frame.add_signal(can_decoder.Signal("Length", 0, 8, signal_is_little_endian=False))
+    frame.add_signal(service)
+    db.add_frame(frame)
+
+    return db
+
+
+def generate_service_01_records(count: int, pid_count: int = 100, seed: int = 0) -> List[dict]:
+    """Generate responses for random PIDs, including a few PIDs outside the rules.
+    """
+    rng = Random(seed)
+    pid_range = min(pid_count + pid_count // 10 + 1, 256)
+    records = []
+
+    for i in range(count):
+        data = [4, 0x41, rng.randrange(pid_range)] + [rng.randrange(256) for _ in range(5)]
+
+        records.append({
+            "TimeStamp": 1577836800000000000 + i * 1000000,
+            "ID": 0x7E8,
+            "IDE": False,
+            "DataBytes": data,
+        })
+
+    return records
+
+
+def _decode_data_frame(db: can_decoder.SignalDB, df) -> None:
+    can_decoder.DataFrameDecoder(db).decode_frame(df)
+    return
+
+
+def _decode_iterator(db: can_decoder.SignalDB, records, **kwargs) -> None:
+    for _ in can_decoder.IteratorDecoder(records, db, **kwargs):
+        pass
+
+    return
+
+
+class MultiplexingSuite(object):
+    params = ([10, 100, 250], ["dataframe", "batch", "record"])
+    param_names = ["pid_count", "mode"]
+
+    def setup(self, pid_count: int, mode: str):
+        self.db = build_service_01_db(pid_count)
+        self.records = generate_service_01_records(RECORDS, pid_count)
+        self.df = to_data_frame(self.records)
+        return
+
+    def _decode(self, mode: str):
+        if mode == "dataframe":
+            _decode_data_frame(self.db, self.df)
+        elif mode == "batch":
+            _decode_iterator(self.db, self.records, batch_size=1024)
+        else:
+            _decode_iterator(self.db, self.records)
+
+        return
+
+    def time_decode(self, pid_count: int, mode: str):
+        self._decode(mode)
+        return
+
+    def track_rows_per_second(self, pid_count: int, mode: str) -> float:
+        start = time.perf_counter()
+        self._decode(mode)
+        return len(self.records) / (time.perf_counter() - start)
+
+    track_rows_per_second.unit = "rows/s"
+
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=RECORDS)
+    parser.add_argument("--pid-count", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = build_service_01_db(args.pid_count)
+    records = generate_service_01_records(args.records, args.pid_count)
+    df = to_data_frame(records)
+
+    cases = [
+        ("DataFrame", lambda: _decode_data_frame(db, df)),
+        ("Iterator", lambda: _decode_iterator(db, records)),
+        ("Iterator batch", lambda: _decode_iterator(db, records, batch_size=1024)),
+    ]
+
+    for name, function in cases:
+        best = None
+
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        print("{:<16} {:>12,.0f} rows/s".format(name, len(records) / best))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Synthetic CAN logs and matching decoding rules for the benchmarks.
+
+The rules are modeled on the manual test fixtures:
+
+* **J1939** - Extended IDs in the style of EEC1 (0x8CF004FE), a PGN per frame and little endian signals.
+* **OBD2** - Standard response IDs in the style of 0x7E8, with the first byte holding the payload length and big
+  endian signals. Decoded by the generic decoders.
+
+Multiplexers take a byte each, directly in front of the signals, like the ServiceMux and PIDMux signals of the OBD2
+fixture.
+"""
+from random import Random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import can_decoder
+
+
+# Sizes of the signals laid out in a payload, repeated until the payload is filled.
+_signal_sizes = (16, 8, 4, 4, 12, 4, 8)
+
+_default_dlc_mix = {8: 1.0}
+
+
+def _pick_dlc(rng: Random, dlc_mix: Dict[int, float]) -> int:
+    return rng.choices(list(dlc_mix.keys()), weights=list(dlc_mix.values()))[0]
+
+
+def _add_signals(
+        add_signal,
+        name: str,
+        first_bit: int,
+        last_bit: int,
+        little_endian: bool,
+        signal_density: float,
+        rng: Random
+) -> None:
+    """Lay out signals between two bit positions, keeping each signal with a probability of signal_density.
+    """
+    position = first_bit
+    index = 0
+
+    while True:
+        size = _signal_sizes[index % len(_signal_sizes)]
+
+        if position + size > last_bit:
+            break
+
+        if rng.random() < signal_density:
+            add_signal(can_decoder.Signal(
+                signal_name="{}_S{}".format(name, index),
+                signal_start_bit=position,
+                signal_size=size,
+                signal_factor=0.125 if size > 8 else 1,
+                signal_offset=-40.0 if size == 8 else 0,
+                signal_is_little_endian=little_endian,
+                signal_is_signed=size == 12,
+            ))
+
+        position += size
+        index += 1
+
+    return
+
+
+def _add_multiplexed_signals(
+        add_signal,
+        name: str,
+        mux_byte: int,
+        mux_depth: int,
+        mux_values: int,
+        dlc: int,
+        little_endian: bool,
+        signal_density: float,
+        rng: Random
+) -> None:
+    """Add a chain of mux_depth multiplexers, each with mux_values values, with the signals at the innermost level.
+    """
+    if mux_depth == 0:
+        _add_signals(add_signal, name, 8 * mux_byte, 8 * dlc, little_endian, signal_density, rng)
+        return
+
+    multiplexer = can_decoder.Signal(
+        signal_name="{}_Mux{}".format(name, mux_byte),
+        signal_start_bit=8 * mux_byte,
+        signal_size=8,
+        signal_is_little_endian=little_endian,
+    )
+
+    for value in range(mux_values):
+        _add_multiplexed_signals(
+            lambda signal, value=value: multiplexer.add_multiplexed_signal(value, signal),
+            "{}_M{}".format(name, value),
+            mux_byte + 1,
+            mux_depth - 1,
+            mux_values,
+            dlc,
+            little_endian,
+            signal_density,
+            rng
+        )
+
+    add_signal(multiplexer)
+    return
+
+
+def build_db(
+        protocol: Optional[str] = "J1939",
+        id_count: int = 16,
+        dlc_mix: Optional[Dict[int, float]] = None,
+        mux_depth: int = 0,
+        mux_values: int = 4,
+        signal_density: float = 1.0,
+        seed: int = 0
+) -> can_decoder.SignalDB:
+    """Create decoding rules with a frame per CAN ID.
+
+    :param protocol:        Either "J1939" or "OBD2".
+    :param id_count:        Number of frames (and distinct CAN IDs).
+    :param dlc_mix:         Relative weight of each payload length, drawn once per frame. Defaults to only 8 bytes.
+    :param mux_depth:       Number of nested multiplexers in each frame.
+    :param mux_values:      Number of values of each multiplexer.
+    :param signal_density:  Fraction of the signal positions in the payload holding a signal.
+    :param seed:            Seed for the random layout.
+    :return:                The decoding rules.
+    """
+    if protocol not in ("J1939", "OBD2"):
+        raise ValueError("Unknown protocol: \"{}\"".format(protocol))
+
+    rng = Random(seed)
+    dlc_mix = _default_dlc_mix if dlc_mix is None else dlc_mix
+
+    db = can_decoder.SignalDB(protocol=protocol)
+
+    for i in range(id_count):
+        dlc = _pick_dlc(rng, dlc_mix)
+
+        if protocol == "J1939":
+            # Priority 3 and source address 0xFE, with a PDU2 PGN per frame.
+            frame_id = 0x8C0000FE | ((0xF000 + i) << 8)
+            first_byte = 0
+            little_endian = True
+        else:
+            # Continue past the response IDs (0x7E8 to 0x7EF) for more than 8 frames, wrapping within 11 bits. The
+            # first byte is the payload length.
+            frame_id = (0x7E8 + i) & 0x7FF
+            first_byte = 1
+            little_endian = False
+
+        frame = can_decoder.Frame(frame_id=frame_id, frame_size=dlc, frame_name="Frame{}".format(i))
+
+        _add_multiplexed_signals(
+            frame.add_signal,
+            frame.name,
+            first_byte,
+            min(mux_depth, dlc - first_byte),
+            mux_values,
+            dlc,
+            little_endian,
+            signal_density,
+            rng
+        )
+
+        db.add_frame(frame)
+
+    return db
+
+
+def generate_records(
+        db: can_decoder.SignalDB,
+        count: int,
+        unknown_ratio: float = 0.0,
+        mux_values: int = 4,
+        seed: int = 0
+) -> List[dict]:
+    """Generate raw records for the frames in a database, in the format expected by the iterator decoders.
+
+    :param db:              Rules created by :py:func:`build_db`.
+    :param count:           Number of records.
+    :param unknown_ratio:   Fraction of the records with CAN IDs not in the database.
+    :param mux_values:      Number of values of each multiplexer, as passed to :py:func:`build_db`.
+    :param seed:            Seed for the random data.
+    :return:                List of records, one millisecond apart.
+    """
+    rng = Random(seed)
+    frames = list(db.frames.values())
+
+    # Precompute the multiplexer bytes of each frame, to keep the multiplexer values within range.
+    mux_bytes = {}
+
+    for frame in frames:
+        positions = []
+        signals = frame.signals
+
+        while len(signals) != 0 and signals[-1].is_multiplexer:
+            positions.append(signals[-1].start_bit // 8)
+            signals = signals[-1].signals.get(0, [])
+
+        mux_bytes[frame.id] = positions
+
+    records = []
+
+    for i in range(count):
+        frame = frames[rng.randrange(len(frames))]
+        data = list(rng.getrandbits(8 * frame.size).to_bytes(frame.size, "little"))
+
+        for position in mux_bytes[frame.id]:
+            data[position] = rng.randrange(mux_values)
+
+        frame_id = frame.id & 0x1FFFFFFF
+        is_extended = frame.id & 0x80000000 != 0
+
+        if db.protocol == "OBD2":
+            data[0] = frame.size - 1
+
+        if unknown_ratio > 0 and rng.random() < unknown_ratio:
+            # Move into a range not used by any frame.
+            frame_id = 0x18FE0000 | rng.randrange(0xFF) if is_extended else 0x100 + rng.randrange(0x100)
+
+        records.append({
+            "TimeStamp": 1577836800000000000 + i * 1000000,
+            "ID": frame_id,
+            "IDE": is_extended,
+            "DataBytes": data,
+        })
+
+    return records
+
+
+def to_data_frame(records: List[dict]):
+    """Convert records to the input format of the DataFrame decoders. Requires pandas.
+
+    :param records: Records from :py:func:`generate_records`.
+    :return:        DataFrame indexed by the timestamps.
+    """
+    import pandas as pd
+
+    result = pd.DataFrame(records)
+    result["TimeStamp"] = pd.to_datetime(result["TimeStamp"], unit="ns", utc=True)
+
+    return result.set_index("TimeStamp")
+
+
+def _walk_signals(signals: List[can_decoder.Signal], muxer: Optional[can_decoder.Signal] = None, mux_value: int = 0) \
+        -> Iterator[Tuple[can_decoder.Signal, Optional[can_decoder.Signal], int]]:
+    """Yield each signal with the multiplexer it belongs to (if any) and the corresponding multiplexer value.
+    """
+    for signal in signals:
+        yield signal, muxer, mux_value
+
+        for value, multiplexed_signals in signal.signals.items():
+            yield from _walk_signals(multiplexed_signals, signal, value)
+
+    return
+
+
+def to_dbc(db: can_decoder.SignalDB) -> bytes:
+    """Write rules from :py:func:`build_db` as a DBC file, e.g. to benchmark the DBC loading.
+
+    Nested multiplexers are written using extended multiplexing (SG_MUL_VAL_). Each signal gets an SPN attribute and
+    each 4 bit signal a value table, such that attributes and value descriptions are parsed as well.
+
+    :param db:  Rules created by :py:func:`build_db`.
+    :return:    Contents of the DBC file.
+    """
+    lines = [
+        "VERSION \"\"",
+        "",
+        "NS_ :",
+        "    CM_",
+        "    BA_DEF_",
+        "    BA_",
+        "    VAL_",
+        "    SG_MUL_VAL_",
+        "",
+        "BS_:",
+        "",
+        "BU_: Vector__XXX",
+        "",
+    ]
+    attributes = []
+    values = []
+    mux_values = []
+    spn = 0
+
+    for frame_id, frame in db.frames.items():
+        lines.append("BO_ {} {}: {} Vector__XXX".format(frame_id, frame.name, frame.size))
+
+        signals = list(_walk_signals(frame.signals))
+        extended = any(muxer is not None and signal.is_multiplexer for signal, muxer, _ in signals)
+
+        for signal, muxer, mux_value in signals:
+            start_bit = signal.start_bit
+
+            if not signal.is_little_endian:
+                start_bit = start_bit - start_bit % 8 + 7 - start_bit % 8
+
+            if muxer is None:
+                multiplex = " M" if signal.is_multiplexer else ""
+            else:
+                multiplex = " m{}{}".format(mux_value, "M" if signal.is_multiplexer else "")
+
+                if extended:
+                    mux_values.append("SG_MUL_VAL_ {} {} {} {}-{};".format(
+                        frame_id, signal.name, muxer.name, mux_value, mux_value
+                    ))
+
+            lines.append(" SG_ {}{} : {}|{}@{}{} ({},{}) [0|0] \"\" Vector__XXX".format(
+                signal.name,
+                multiplex,
+                start_bit,
+                signal.size,
+                1 if signal.is_little_endian else 0,
+                "-" if signal.is_signed else "+",
+                signal.factor,
+                signal.offset
+            ))
+
+            spn += 1
+            attributes.append("BA_ \"SPN\" SG_ {} {} {};".format(frame_id, signal.name, spn))
+
+            if signal.size == 4 and not signal.is_multiplexer:
+                values.append("VAL_ {} {} 0 \"Off\" 1 \"On\" 14 \"Error\" 15 \"Not available\" ;".format(
+                    frame_id, signal.name
+                ))
+
+        lines.append("")
+
+    lines.extend([
+        "BA_DEF_ SG_  \"SPN\" INT 0 524287;",
+        "BA_DEF_  \"ProtocolType\" STRING ;",
+        "BA_DEF_DEF_  \"SPN\" 0;",
+        "BA_DEF_DEF_  \"ProtocolType\" \"\";",
+        "BA_ \"ProtocolType\" \"{}\";".format(db.protocol),
+    ])
+    lines.extend(attributes)
+    lines.extend(values)
+    lines.extend(mux_values)
+    lines.append("")
+
+    return "\n".join(lines).encode("ascii")
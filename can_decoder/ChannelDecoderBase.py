@@ -0,0 +1,79 @@
+from contextlib import contextmanager, ExitStack
+from typing import Dict, Hashable, Iterator, Optional
+
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.DecodeProfiler import DecodeProfiler
+from can_decoder.DecodeStatistics import DecodeStatistics
+from can_decoder.DecoderBase import DecoderBase
+
+
+class ChannelDecoderBase(object):
+    """Base class for the decoders of data from several CAN buses. Holds a decoder for the database of each channel,
+    to which the data of the channel is routed.
+    """
+    def __init__(self, conversion_rules: ChannelSignalDB, decoders: Dict[Hashable, DecoderBase]):
+        """Set up routing to the decoders of each channel.
+
+        :param conversion_rules:    Rules of each channel.
+        :param decoders:            Decoder for the database of each channel.
+        """
+        self._db = conversion_rules
+        self._decoders = decoders
+
+        # Statistics to update while decoding, if enabled. Shared with the decoders of the channels.
+        self._statistics = None  # type: Optional[DecodeStatistics]
+
+        # Data errors collected by the decoders of all channels, reported in a single summary warning.
+        self._diagnostics = DecodeDiagnostics()
+
+        for decoder in decoders.values():
+            decoder._report_data_errors = False
+
+        return
+
+    @property
+    def diagnostics(self) -> DecodeDiagnostics:
+        """Data errors collected while decoding, see :py:attr:`can_decoder.DecoderBase.DecoderBase.diagnostics`.
+        """
+        return self._diagnostics
+
+    def _report_diagnostics(self) -> None:
+        """Issue a single summary warning for the collected data errors, unless statistics are collected.
+        """
+        if self._statistics is None and self._diagnostics:
+            self._diagnostics.warn(stacklevel=3)
+
+        return
+
+    @contextmanager
+    def profile(self, profiler: Optional[DecodeProfiler] = None) -> Iterator[DecodeProfiler]:
+        """Profile the decoding of all channels. See :py:meth:`can_decoder.DecoderBase.DecoderBase.profile`.
+        """
+        if profiler is None:
+            profiler = DecodeProfiler()
+
+        with ExitStack() as stack:
+            for decoder in self._decoders.values():
+                stack.enter_context(decoder.profile(profiler))
+
+            yield profiler
+
+        return
+
+    def _get_channel_decoder(self, channel, count: int) -> Optional[DecoderBase]:
+        """Get the decoder for a channel, counting the data of unknown channels in the statistics.
+
+        :param channel: Channel of the data.
+        :param count:   Number of records or rows of the data.
+        :return:        The decoder of the channel, or None if the channel has no database.
+        """
+        decoder = self._decoders.get(channel, None)
+
+        if decoder is None and self._statistics is not None:
+            self._statistics.frames_seen += count
+            self._statistics.unknown_channels[channel] += count
+
+        return decoder
+
+    pass
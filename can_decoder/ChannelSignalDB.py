@@ -0,0 +1,60 @@
+from typing import Dict, Hashable, Iterable, Optional, Union
+
+from can_decoder.SignalDB import SignalDB
+
+
+class ChannelSignalDB(object):
+    """Combination of signal databases, one per bus channel, for decoding logs with data from several CAN buses.
+    
+    Supply it in place of a :py:class:`can_decoder.SignalDB.SignalDB` to the DataFrame or iterator decoders, which then
+    route each record to the database of its channel.
+    """
+    def __init__(self, channels: Optional[Dict[Hashable, Union[SignalDB, Iterable[SignalDB]]]] = None):
+        """Create a new combination of signal databases.
+        
+        :param channels:    Map from bus channel to the signal database of the channel, or a list of signal databases
+                            to merge for the channel. See :py:meth:`add_channel`.
+        """
+        self.channels = {}  # type: Dict[Hashable, SignalDB]
+        
+        for channel, conversion_rules in (channels or {}).items():
+            self.add_channel(channel, conversion_rules)
+        
+        pass
+    
+    def add_channel(self, channel: Hashable, conversion_rules: Union[SignalDB, Iterable[SignalDB]]) -> SignalDB:
+        """Add the rules for a bus channel. Several databases for the same channel are merged into one, see
+        :py:meth:`can_decoder.SignalDB.SignalDB.merge`.
+        
+        :param channel:             Bus channel, as found in the channel field of the records.
+        :param conversion_rules:    Signal database, or list of signal databases, for the channel.
+        :return:                    The signal database used for the channel.
+        :raises ValueError:         If the channel is already added, or the databases can not be merged.
+        """
+        if channel in self.channels:
+            raise ValueError("Channel already added: {!r}".format(channel))
+        
+        if isinstance(conversion_rules, SignalDB):
+            result = conversion_rules
+        else:
+            try:
+                result = SignalDB.merge(conversion_rules)
+            except ValueError as e:
+                raise ValueError("Invalid rules for channel {!r}: {}".format(channel, e)) from e
+        
+        self.channels[channel] = result
+        
+        return result
+    
+    def __str__(self):
+        result = f"ChannelSignalDB with {len(self.channels)} channels"
+        
+        for channel, db in self.channels.items():
+            result += f"\n\tChannel {channel!r}:"
+            
+            for line in str(db).splitlines():
+                result += f"\n\t\t{line}"
+        
+        return result
+    
+    pass
@@ -1,11 +1,17 @@
-import canmatrix
+import hashlib
+import os
+import warnings
 
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from os import PathLike
-from typing import Union, BinaryIO, Sequence, Optional
+from typing import Dict, Iterable, Union, BinaryIO, List, Sequence, Optional
 
+from can_decoder.DBCParser import DBCParser
 from can_decoder.Frame import Frame
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
+from can_decoder.SignalDBSerializer import SignalDBSerializer
 
 
 def load_dbc(dbc_file: Union[str, PathLike, BinaryIO], *args, **kwargs) -> Optional[SignalDB]:
@@ -13,6 +19,61 @@ def load_dbc(dbc_file: Union[str, PathLike, BinaryIO], *args, **kwargs) -> Optio
     return loader.load_dbc(dbc_file=dbc_file, *args, **kwargs)
 
 
+def load_dbcs(
+        dbc_files: Iterable[Union[str, PathLike, BinaryIO]],
+        workers: Optional[int] = None,
+        merge: bool = False,
+        **kwargs
+) -> Union[List[SignalDB], SignalDB]:
+    """Load several DBC files, parsing them in parallel in a pool of processes.
+    
+    Files with identical content are only parsed once, and share the same signal database in the result.
+    
+    :param dbc_files:   Paths to DBC files, or files opened in binary mode.
+    :param workers:     Number of processes to parse in. Defaults to the number of CPUs. With a single worker, or a
+                        single distinct file, the files are parsed in this process.
+    :param merge:       Merge the loaded databases into one, see :py:meth:`can_decoder.SignalDB.SignalDB.merge`.
+    :param kwargs:      Keywords for :py:func:`load_dbc`, applied to all files.
+    :return:            List with the signal database of each file, in order. A single signal database if merging.
+    """
+    contents = []  # type: List[bytes]
+    
+    for dbc_file in dbc_files:
+        if all(hasattr(dbc_file, attr) for attr in ("seek", "read", "readline")):
+            contents.append(dbc_file.read())
+        else:
+            with open(dbc_file, "rb") as handle:
+                contents.append(handle.read())
+    
+    # Parse each distinct content once.
+    keys = [hashlib.sha256(content).digest() for content in contents]
+    distinct = dict(zip(keys, contents))
+    
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    workers = min(workers, len(distinct))
+    
+    if workers <= 1:
+        loaded = [_load_content(content, kwargs) for content in distinct.values()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            loaded = list(executor.map(_load_content, distinct.values(), [kwargs] * len(distinct)))
+    
+    databases = dict(zip(distinct.keys(), loaded))
+    result = [databases[key] for key in keys]
+    
+    if merge:
+        return SignalDB.merge(databases.values())
+    
+    return result
+
+
+def _load_content(content: bytes, kwargs: dict) -> SignalDB:
+    # Top level function, such that it can be called in the worker processes.
+    return load_dbc(BytesIO(content), **kwargs)
+
+
 class DBCLoader(object):
     def __init__(self):
         self._use_custom_attribute = None
@@ -20,6 +81,13 @@ class DBCLoader(object):
     
     def load_dbc(self, dbc_file: Union[str, PathLike, BinaryIO], *args, **kwargs) -> Optional[SignalDB]:
         """From a DBC file, load a set of frames and signals for conversion.
+        
+        The DBC file is parsed by the built-in streaming parser by default. Supply :code:`parser="canmatrix"` to parse
+        it using canmatrix instead, which must then be installed.
+        
+        Supply :code:`cache_dir` to keep the loaded rules in a binary cache in that directory, keyed on the content of
+        the DBC file and the loader options. Loading the same DBC file again then skips parsing, but still builds the
+        frames and signals, see :py:class:`can_decoder.SignalDBSerializer`.
 
         :param dbc_file:    Path to a DBC file.
         :param args:        Additional args.
@@ -30,35 +98,112 @@ class DBCLoader(object):
     
         # If a custom attribute is requested, determine the name here.
         self._use_custom_attribute = kwargs.get("use_custom_attribute", None)
+        
+        parser = kwargs.get("parser", "native")
+        
+        if parser == "native":
+            load_function = self._load_native
+        elif parser == "canmatrix":
+            load_function = self._load_canmatrix
+        else:
+            raise ValueError("Unknown parser: \"{}\"".format(parser))
     
+        cache_dir = kwargs.get("cache_dir", None)
+        
         # Attempt to determine the type of the input. Check for file-like first, attempt to use as a path second.
-        if all(hasattr(dbc_file, attr) for attr in ("seek", "read", "readline")):
-            dbc = canmatrix.formats.load_flat(dbc_file, "dbc")
+        if cache_dir is not None:
+            if all(hasattr(dbc_file, attr) for attr in ("seek", "read", "readline")):
+                content = dbc_file.read()
+            else:
+                with open(dbc_file, "rb") as handle:
+                    content = handle.read()
+            
+            cache_path = os.path.join(cache_dir, self._get_cache_key(content, parser) + ".candb")
+            
+            try:
+                return SignalDBSerializer.load(cache_path)
+            except (OSError, ValueError, KeyError, IndexError, TypeError):
+                # Missing or unusable (e.g. partially written or damaged) cache entry, parse the DBC file and (re)write
+                # the entry.
+                pass
+            
+            result = self._load(BytesIO(content), load_function)
+            
+            os.makedirs(cache_dir, exist_ok=True)
+            SignalDBSerializer.save(result, cache_path)
+        elif all(hasattr(dbc_file, attr) for attr in ("seek", "read", "readline")):
+            result = self._load(dbc_file, load_function)
         else:
             with open(dbc_file, "rb") as handle:
-                dbc = canmatrix.formats.load_flat(handle, "dbc")
+                result = self._load(handle, load_function)
+    
+        return result
+    
+    def _get_cache_key(self, content: bytes, parser: str) -> str:
+        """Get the name of the cache entry for a DBC file, from the content and all options affecting the result.
+        """
+        key = hashlib.sha256(content)
+        key.update(repr((SignalDBSerializer.version, parser, self._use_custom_attribute)).encode("utf-8"))
+        
+        return key.hexdigest()
+    
+    def _load(self, handle: BinaryIO, load_function) -> SignalDB:
+        protocol, dbc_frames = load_function(handle)
     
         # Create a new DB instance.
-        result = SignalDB(protocol=dbc.attribute("ProtocolType", None))
+        result = SignalDB(protocol=protocol)
     
         # Load all frames.
-        for dbc_frame in dbc:
-            frame = self._load_frame(dbc_frame=dbc_frame)
-            
-            if frame is not None:
-                result.add_frame(frame=frame)
+        for frame_id, dbc_frame in dbc_frames:
+            frame = self._load_frame(dbc_frame=dbc_frame, frame_id=frame_id)
             
             # Store in DB.
             result.add_frame(frame)
     
         return result
+    
+    @staticmethod
+    def _load_native(handle: BinaryIO):
+        """Parse a DBC file using the built-in parser.
+        
+        :param handle:  File opened in binary mode.
+        :return:        Tuple of the protocol and a list of tuples with the ID and the parsed frame.
+        """
+        dbc = DBCParser().parse(handle)
+        
+        return dbc.attributes.get("ProtocolType", None), list(dbc.frames.items())
+    
+    @staticmethod
+    def _load_canmatrix(handle: BinaryIO):
+        """Parse a DBC file using canmatrix.
+        
+        :param handle:  File opened in binary mode.
+        :return:        Tuple of the protocol and a list of tuples with the ID and the parsed frame.
+        """
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=DeprecationWarning)
+            warnings.filterwarnings("ignore", category=SyntaxWarning)
+            
+            import canmatrix.formats
+        
+        dbc = canmatrix.formats.load_flat(handle, "dbc")
+        
+        return dbc.attribute("ProtocolType", None), [
+            (dbc_frame.arbitration_id.to_compound_integer(), dbc_frame) for dbc_frame in dbc
+        ]
 
-    def _load_frame(self, dbc_frame: canmatrix.Frame) -> Frame:
+    def _load_frame(self, dbc_frame, frame_id: int) -> Frame:
+        """Convert a frame parsed by the built-in parser or by canmatrix.
+        """
         frame = Frame(
-            frame_id=dbc_frame.arbitration_id.to_compound_integer(),
+            frame_id=frame_id,
             frame_size=dbc_frame.size,
             frame_name=dbc_frame.name
         )
+        
+        # Index the signals of each multiplexer once, such that each signal is only visited once when loading the
+        # multiplexers, regardless of the number of multiplexers and the nesting.
+        children = None  # type: Optional[Dict[str, List]]
     
         # Loop over all signals, load multiplexed signals using special handler (And thus ignore them in
         # the loading loop).
@@ -66,9 +211,12 @@ class DBCLoader(object):
             if dbc_signal.is_multiplexer and dbc_signal.mux_val is None:
                 # Multiplexer, but is not self multiplexed. Check complexity.
                 if dbc_frame.is_complex_multiplexed is True:
+                    if children is None:
+                        children = self._get_multiplexed_signals(dbc_frame.signals)
+                    
                     signal = self._multiplexed_signal_loader_complex(
                         muxer_signal=dbc_signal,
-                        dbc_signals=dbc_frame.signals
+                        children=children
                     )
                 else:
                     signal = self._multiplexed_signal_loader_simple(
@@ -83,42 +231,75 @@ class DBCLoader(object):
             pass
     
         return frame
+    
+    @staticmethod
+    def _get_multiplexed_signals(dbc_signals: Sequence) -> Dict[str, List]:
+        """Group the signals of a frame with extended multiplexing on the name of their multiplexer.
+        
+        :param dbc_signals: All signals of the frame.
+        :return:            Map from multiplexer name to the signals it multiplexes, in the order of the frame.
+        """
+        result = {}  # type: Dict[str, List]
+        
+        for signal in dbc_signals:
+            muxer_name = signal.muxer_for_signal
+            
+            if muxer_name is None:
+                continue
+            
+            group = result.get(muxer_name, None)
+            
+            if group is None:
+                group = []
+                result[muxer_name] = group
+            
+            group.append(signal)
+        
+        return result
 
-    def _multiplexed_signal_loader_complex(self, muxer_signal: canmatrix.Signal, dbc_signals: Sequence[canmatrix.Signal]) -> Signal:
+    def _multiplexed_signal_loader_complex(self, muxer_signal, children: Dict[str, List]) -> Signal:
         # Convert root signal.
         multiplexed_signal = self._signal_loader(muxer_signal)
     
-        # Locate all signals this is multiplexing for.
-        for signal in dbc_signals:
-            if signal == muxer_signal:
+        # Load all signals this is multiplexing for.
+        for signal in children.get(muxer_signal.name, []):
+            if signal is muxer_signal:
                 continue
             
-            if signal.muxer_for_signal == muxer_signal.name:
-                if signal.is_multiplexer:
-                    # Nested loading required, as this is a multiplexer for another signal.
-                    multiplexed_signal.add_multiplexed_signal(
-                        signal.mux_val,
-                        self._multiplexed_signal_loader_complex(signal, dbc_signals)
-                    )
-                else:
-                    # Plain signal, use as normal.
-                    multiplexed_signal.add_multiplexed_signal(
-                        signal.mux_val,
-                        self._signal_loader(signal)
-                    )
-                    pass
-                pass
+            if signal.is_multiplexer:
+                # Nested loading required, as this is a multiplexer for another signal.
+                loaded_signal = self._multiplexed_signal_loader_complex(signal, children)
+            else:
+                # Plain signal, use as normal.
+                loaded_signal = self._signal_loader(signal)
+            
+            for mux_value in self._get_mux_values(signal):
+                multiplexed_signal.add_multiplexed_signal(mux_value, loaded_signal)
             pass
     
         return multiplexed_signal
+    
+    @staticmethod
+    def _get_mux_values(dbc_signal) -> List[Union[int, range]]:
+        """Get the multiplexer values a signal is present for. Extended multiplexing (SG_MUL_VAL_) can list ranges of
+        values, which are kept as ranges instead of adding the signal for each value. Otherwise the single value from
+        the signal definition is used.
+        """
+        if len(dbc_signal.mux_val_grp) == 0:
+            return [dbc_signal.mux_val]
+        
+        return [
+            minimum if minimum == maximum else range(minimum, maximum + 1)
+            for minimum, maximum in dbc_signal.mux_val_grp
+        ]
 
-    def _multiplexed_signal_loader_simple(self, muxer_signal: canmatrix.Signal, dbc_signals: Sequence[canmatrix.Signal]) -> Signal:
+    def _multiplexed_signal_loader_simple(self, muxer_signal, dbc_signals: Sequence) -> Signal:
         # Convert root signal.
         multiplexed_signal = self._signal_loader(muxer_signal)
     
         # Locate all signals this is multiplexing for.
         for signal in dbc_signals:
-            if signal == muxer_signal:
+            if signal is muxer_signal:
                 continue
                 
             if signal.is_multiplexer:
@@ -138,7 +319,7 @@ class DBCLoader(object):
     
         return multiplexed_signal
 
-    def _signal_loader(self, dbc_signal: canmatrix.Signal) -> Signal:
+    def _signal_loader(self, dbc_signal) -> Signal:
         signal = Signal(
             signal_name=dbc_signal.name,
             signal_start_bit=dbc_signal.start_bit,
@@ -147,7 +328,9 @@ class DBCLoader(object):
             signal_is_signed=dbc_signal.is_signed,
             signal_is_little_endian=dbc_signal.is_little_endian,
             signal_factor=dbc_signal.factor,
-            signal_offset=dbc_signal.offset
+            signal_offset=dbc_signal.offset,
+            signal_attributes={str(key): str(value) for key, value in dbc_signal.attributes.items()},
+            signal_values={int(key): str(value) for key, value in dbc_signal.values.items()}
         )
 
         if self._use_custom_attribute is not None:
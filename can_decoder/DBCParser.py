@@ -0,0 +1,345 @@
+import re
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Statement patterns. Only the fields used for decoding are captured, the remainder of each statement is ignored.
+_signal_pattern = re.compile(
+    r"^SG_\s+(\w+)\s*(M|m\d+M?)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*\(\s*([^,\s]+)\s*,\s*([^)\s]+)\s*\)"
+)
+_frame_pattern = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)")
+_frame_attribute_pattern = re.compile(r"^BA_\s+\"([^\"]+)\"\s+BO_\s+(\d+)\s+(.+?)\s*;")
+_signal_attribute_pattern = re.compile(r"^BA_\s+\"([^\"]+)\"\s+SG_\s+(\d+)\s+(\w+)\s+(.+?)\s*;")
+_global_attribute_pattern = re.compile(r"^BA_\s+\"([^\"]+)\"\s+(.+?)\s*;")
+_enum_definition_pattern = re.compile(r"^BA_DEF_\s+(?:(SG_|BO_|BU_|EV_)\s+)?\"([^\"]+)\"\s+ENUM\s+(.*?)\s*;")
+_values_pattern = re.compile(r"^VAL_\s+(\d+)\s+(\w+)\s+(.*);", re.DOTALL)
+_value_pattern = re.compile(r"(-?\d+)\s+\"((?:[^\"\\]|\\.)*)\"")
+_mux_values_pattern = re.compile(r"^SG_MUL_VAL_\s+(\d+)\s+(\w+)\s+(\w+)\s+(.*?)\s*;")
+_value_type_pattern = re.compile(r"^SIG_VALTYPE_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s*;")
+_enum_value_pattern = re.compile(r"\"([^\"]*)\"")
+
+# Frame holding the signals not assigned to any frame.
+_independent_signals_frame = "VECTOR__INDEPENDENT_SIG_MSG"
+
+
+class DBCSignal(object):
+    """Signal as described in a DBC file. Uses the same field names as the canmatrix signals, such that both can be
+    converted by :py:class:`can_decoder.DBCLoader.DBCLoader`.
+    """
+    __slots__ = (
+        "name",
+        "start_bit",
+        "size",
+        "is_little_endian",
+        "is_signed",
+        "is_float",
+        "factor",
+        "offset",
+        "is_multiplexer",
+        "mux_val",
+        "mux_val_grp",
+        "muxer_for_signal",
+        "attributes",
+        "values",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start_bit = 0
+        self.size = 0
+        self.is_little_endian = True
+        self.is_signed = False
+        self.is_float = False
+        self.factor = 1.0
+        self.offset = 0.0
+        self.is_multiplexer = False
+        self.mux_val = None  # type: Optional[int]
+        self.mux_val_grp = []  # type: List[List[int]]
+        self.muxer_for_signal = None  # type: Optional[str]
+        self.attributes = {}  # type: Dict[str, str]
+        self.values = {}  # type: Dict[int, str]
+        return
+
+    pass
+
+
+class DBCFrame(object):
+    """Frame as described in a DBC file. See :py:class:`DBCSignal`.
+    """
+    __slots__ = (
+        "id",
+        "name",
+        "size",
+        "signals",
+        "is_complex_multiplexed",
+        "attributes",
+        "_signals_by_name",
+    )
+
+    def __init__(self, frame_id: int, name: str, size: int):
+        self.id = frame_id
+        self.name = name
+        self.size = size
+        self.signals = []  # type: List[DBCSignal]
+        self.is_complex_multiplexed = False
+        self.attributes = {}  # type: Dict[str, str]
+        self._signals_by_name = {}  # type: Dict[str, DBCSignal]
+        return
+
+    def add_signal(self, signal: DBCSignal) -> None:
+        self.signals.append(signal)
+        self._signals_by_name[signal.name] = signal
+        return
+
+    def signal_by_name(self, name: str) -> Optional[DBCSignal]:
+        return self._signals_by_name.get(name, None)
+
+    pass
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == "\"" and value[-1] == "\"":
+        return value[1:-1]
+
+    return value
+
+
+class DBCParser(object):
+    """Streaming parser for DBC files, without any dependency on canmatrix.
+
+    Lines are parsed one statement at a time as they are read, keeping only the frames in memory. The statements
+    relevant for decoding are handled: BO_ (frames), SG_ (signals), SG_MUL_VAL_ (extended multiplexing), SIG_VALTYPE_
+    (float signals), BA_ (attributes, e.g. ProtocolType and SPN), BA_DEF_ (enumerated attribute values) and VAL_ (value
+    descriptions). All other statements are skipped.
+    """
+
+    def __init__(self, encoding: str = "iso-8859-1"):
+        """Create a new parser.
+
+        :param encoding:    Encoding of the DBC file.
+        """
+        self.encoding = encoding
+        self.frames = {}  # type: Dict[int, DBCFrame]
+        self.attributes = {}  # type: Dict[str, str]
+
+        # Enumerated attribute definitions, keyed on the object type and attribute name.
+        self._enum_definitions = {}  # type: Dict[Tuple[Optional[str], str], List[str]]
+
+        self._frame = None  # type: Optional[DBCFrame]
+
+        self._handlers = {
+            "BO_": self._parse_frame,
+            "SG_": self._parse_signal,
+            "BA_": self._parse_attribute,
+            "BA_DEF_": self._parse_attribute_definition,
+            "VAL_": self._parse_values,
+            "SG_MUL_VAL_": self._parse_mux_values,
+            "SIG_VALTYPE_": self._parse_value_type,
+        }
+        return
+
+    def parse(self, lines: Iterable[bytes]) -> "DBCParser":
+        """Parse the lines of a DBC file, e.g. a file opened in binary mode.
+
+        :param lines:   Iterable yielding the raw lines.
+        :return:        The parser, with the frames and global attributes loaded.
+        """
+        handlers = self._handlers
+        encoding = self.encoding
+        statement = None
+
+        for line in lines:
+            line = line.decode(encoding).strip()
+
+            if statement is not None:
+                # Continuation of a statement with a quoted string spanning several lines.
+                statement += "\n" + line
+            elif len(line) == 0:
+                continue
+            else:
+                statement = line
+
+            if (statement.count("\"") - statement.count("\\\"")) % 2 != 0:
+                continue
+
+            handler = handlers.get(statement.split(None, 1)[0], None)
+
+            if handler is not None:
+                handler(statement)
+
+            statement = None
+
+        self._finish()
+        return self
+
+    def _parse_frame(self, statement: str) -> None:
+        match = _frame_pattern.match(statement)
+
+        if match is None:
+            self._frame = None
+            return
+
+        frame = DBCFrame(frame_id=int(match.group(1)), name=match.group(2), size=int(match.group(3)))
+
+        self.frames[frame.id] = frame
+        self._frame = frame
+        return
+
+    def _parse_signal(self, statement: str) -> None:
+        match = _signal_pattern.match(statement)
+
+        if match is None or self._frame is None:
+            return
+
+        name, multiplex, start_bit, size, byte_order, sign, factor, offset = match.groups()
+
+        signal = DBCSignal(name)
+        signal.size = int(size)
+        signal.is_little_endian = byte_order == "1"
+        signal.is_signed = sign == "-"
+        signal.factor = float(factor)
+        signal.offset = float(offset)
+
+        start_bit = int(start_bit)
+
+        if not signal.is_little_endian:
+            # The start bit of big endian signals is given with the bits of each byte numbered from the MSB.
+            start_bit = start_bit - start_bit % 8 + 7 - start_bit % 8
+
+        signal.start_bit = start_bit
+
+        if multiplex == "M":
+            signal.is_multiplexer = True
+        elif multiplex is not None:
+            if multiplex.endswith("M"):
+                # Multiplexed signal which is also a multiplexer.
+                signal.is_multiplexer = True
+                multiplex = multiplex[:-1]
+                self._frame.is_complex_multiplexed = True
+
+            signal.mux_val = int(multiplex[1:])
+
+        self._frame.add_signal(signal)
+        return
+
+    def _get_signal(self, frame_id: str, signal_name: str) -> Optional[DBCSignal]:
+        frame = self.frames.get(int(frame_id), None)
+
+        if frame is None:
+            return None
+
+        return frame.signal_by_name(signal_name)
+
+    def _parse_attribute(self, statement: str) -> None:
+        match = _signal_attribute_pattern.match(statement)
+
+        if match is not None:
+            signal = self._get_signal(match.group(2), match.group(3))
+
+            if signal is not None:
+                signal.attributes[match.group(1)] = _unquote(match.group(4))
+
+            return
+
+        match = _frame_attribute_pattern.match(statement)
+
+        if match is not None:
+            frame = self.frames.get(int(match.group(2)), None)
+
+            if frame is not None:
+                frame.attributes[match.group(1)] = _unquote(match.group(3))
+
+            return
+
+        match = _global_attribute_pattern.match(statement)
+
+        if match is not None and match.group(2).split(None, 1)[0] not in ("BU_", "EV_"):
+            self.attributes[match.group(1)] = _unquote(match.group(2))
+
+        return
+
+    def _parse_attribute_definition(self, statement: str) -> None:
+        match = _enum_definition_pattern.match(statement)
+
+        if match is not None:
+            self._enum_definitions[(match.group(1), match.group(2))] = _enum_value_pattern.findall(match.group(3))
+
+        return
+
+    def _parse_values(self, statement: str) -> None:
+        match = _values_pattern.match(statement)
+
+        if match is None:
+            return
+
+        signal = self._get_signal(match.group(1), match.group(2))
+
+        if signal is not None:
+            for value, description in _value_pattern.findall(match.group(3)):
+                signal.values[int(value)] = description.replace("\\\"", "\"")
+
+        return
+
+    def _parse_mux_values(self, statement: str) -> None:
+        match = _mux_values_pattern.match(statement)
+
+        if match is None:
+            return
+
+        frame = self.frames.get(int(match.group(1)), None)
+        signal = None if frame is None else frame.signal_by_name(match.group(2))
+
+        if signal is None:
+            return
+
+        frame.is_complex_multiplexed = True
+        signal.muxer_for_signal = match.group(3)
+
+        for value_range in match.group(4).split(","):
+            minimum, maximum = value_range.split("-")
+            signal.mux_val_grp.append([int(minimum), int(maximum)])
+
+        return
+
+    def _parse_value_type(self, statement: str) -> None:
+        match = _value_type_pattern.match(statement)
+
+        if match is None:
+            return
+
+        signal = self._get_signal(match.group(1), match.group(2))
+
+        if signal is not None:
+            signal.is_float = True
+
+        return
+
+    def _finish(self) -> None:
+        """Resolve the information which may be given after the statements it refers to.
+        """
+        def resolve_enums(object_type: Optional[str], attributes: Dict[str, str]) -> None:
+            for name, value in attributes.items():
+                labels = self._enum_definitions.get((object_type, name), None)
+
+                if labels is not None and value.isdigit() and int(value) < len(labels):
+                    attributes[name] = labels[int(value)]
+
+            return
+
+        resolve_enums(None, self.attributes)
+
+        for frame_id, frame in list(self.frames.items()):
+            if frame.name == _independent_signals_frame:
+                del self.frames[frame_id]
+                continue
+
+            resolve_enums("BO_", frame.attributes)
+            frame.name = frame.attributes.pop("SystemMessageLongSymbol", frame.name)
+
+            for signal in frame.signals:
+                resolve_enums("SG_", signal.attributes)
+                signal.name = signal.attributes.pop("SystemSignalLongSymbol", signal.name)
+
+        return
+
+    pass
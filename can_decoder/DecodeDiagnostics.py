@@ -0,0 +1,92 @@
+import warnings
+
+from collections import Counter
+from typing import Dict
+
+from can_decoder.warnings.MissingDataWarning import MissingDataWarning
+from can_decoder.warnings.DataSizeMismatchWarning import DataSizeMismatchWarning
+
+
+class DecodeDiagnostics(object):
+    """Data errors collected by a decoder. Instead of a warning for every signal which could not be decoded, the errors
+    are counted here and reported in a single summary warning once the decoding is done.
+
+    * **missing_data** - Number of values per signal name which could not be decoded, since the data did not cover the
+      signal.
+    * **size_mismatches** - Number of values per signal name which could not be decoded, since the data was of the
+      wrong size.
+    """
+
+    def __init__(self):
+        self.missing_data = Counter()  # type: Counter
+        self.size_mismatches = Counter()  # type: Counter
+        return
+
+    def reset(self) -> None:
+        """Reset all counters.
+        """
+        self.missing_data.clear()
+        self.size_mismatches.clear()
+        return
+
+    def update(self, other: "DecodeDiagnostics") -> None:
+        """Add the errors collected in another instance.
+
+        :param other:   Diagnostics to add.
+        """
+        self.missing_data.update(other.missing_data)
+        self.size_mismatches.update(other.size_mismatches)
+        return
+
+    def __bool__(self) -> bool:
+        return len(self.missing_data) != 0 or len(self.size_mismatches) != 0
+
+    def as_dict(self) -> Dict:
+        """Get all diagnostics as a dictionary.
+
+        :return:    Dictionary with plain dictionaries in place of the counters.
+        """
+        return {
+            "missing_data": dict(self.missing_data),
+            "size_mismatches": dict(self.size_mismatches),
+        }
+
+    def summary(self) -> str:
+        """Get a description of the collected errors.
+
+        :return:    Single line summary, listing the affected signals.
+        """
+        parts = []
+
+        if self.missing_data:
+            parts.append("no data found for {}".format(self._format_counts(self.missing_data)))
+
+        if self.size_mismatches:
+            parts.append("could not shape data for {}".format(self._format_counts(self.size_mismatches)))
+
+        count = sum(self.missing_data.values()) + sum(self.size_mismatches.values())
+
+        return "Could not decode {} signal values: {}".format(count, "; ".join(parts))
+
+    @staticmethod
+    def _format_counts(counts: Counter) -> str:
+        return ", ".join("{} ({})".format(name, count) for name, count in counts.most_common())
+
+    def warn(self, stacklevel: int = 2) -> None:
+        """Issue a single warning summarizing the collected errors. A DataSizeMismatchWarning if any data was of the
+        wrong size, otherwise a MissingDataWarning.
+
+        :param stacklevel:  Stack level passed on to warnings.warn.
+        """
+        category = DataSizeMismatchWarning if self.size_mismatches else MissingDataWarning
+
+        warnings.warn(self.summary(), category, stacklevel=stacklevel + 1)
+        return
+
+    def __repr__(self) -> str:
+        return "DecodeDiagnostics(missing_data={}, size_mismatches={})".format(
+            sum(self.missing_data.values()),
+            sum(self.size_mismatches.values()),
+        )
+
+    pass
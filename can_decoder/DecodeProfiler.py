@@ -0,0 +1,176 @@
+import time
+import tracemalloc
+
+from typing import Dict, Tuple
+
+from can_decoder.Frame import Frame
+from can_decoder.Signal import Signal
+from can_decoder.SignalDB import SignalDB
+
+
+class DecodeProfiler(object):
+    """Records the wall time, number of rows and optionally the bytes allocated while decoding each frame and signal.
+    Enable it on a decoder using :py:meth:`can_decoder.DecoderBase.DecoderBase.profile`.
+
+    Times for a frame include the times of its signals. Rows are the number of CAN frames processed, which is 1 per
+    call when decoding record by record. Bytes are the net change in memory traced by :py:mod:`tracemalloc` (i.e.
+    allocations still alive afterwards, such as the decoded results), and only recorded with trace_memory enabled, as
+    tracing slows down the decoding considerably.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """Create a new profiler.
+
+        :param trace_memory:    Record the bytes allocated using tracemalloc.
+        """
+        self.trace_memory = trace_memory
+
+        # Entries of [calls, rows, time, bytes], keyed on the object identity of the frame or signal.
+        self._frames = {}  # type: Dict[int, list]
+        self._signals = {}  # type: Dict[int, list]
+
+        # Description of the frames and signals, keyed on the object identity.
+        self._frame_info = {}  # type: Dict[int, Tuple[int, str]]
+        self._signal_info = {}  # type: Dict[int, Tuple[int, str]]
+
+        self._started_tracing = False
+        return
+
+    def _enable(self, conversion_rules: SignalDB) -> None:
+        """Prepare for profiling a decoder using the supplied rules.
+        """
+        for frame in conversion_rules.frames.values():
+            self._frame_info[id(frame)] = (frame.id, frame.name)
+
+            def register(signals):
+                for signal in signals:
+                    self._signal_info[id(signal)] = (frame.id, signal.name)
+
+                    for multiplex in signal.signals.values():
+                        register(multiplex)
+
+            register(frame.signals)
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        return
+
+    def _disable(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        return
+
+    def start(self) -> Tuple[float, int]:
+        """Get a token marking the start of a measurement.
+
+        :return:    Token to pass to :py:meth:`add_frame` or :py:meth:`add_signal`.
+        """
+        if self.trace_memory:
+            return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+        return time.perf_counter(), 0
+
+    def _add(self, entries: Dict[int, list], key: int, rows: int, token: Tuple[float, int]) -> None:
+        elapsed = time.perf_counter() - token[0]
+        entry = entries.get(key, None)
+
+        if entry is None:
+            entry = [0, 0, 0.0, 0]
+            entries[key] = entry
+
+        entry[0] += 1
+        entry[1] += rows
+        entry[2] += elapsed
+
+        if self.trace_memory:
+            entry[3] += tracemalloc.get_traced_memory()[0] - token[1]
+
+        return
+
+    def add_frame(self, frame: Frame, rows: int, token: Tuple[float, int]) -> None:
+        """Record the decoding of a frame.
+
+        :param frame:   The decoded frame.
+        :param rows:    Number of CAN frames decoded.
+        :param token:   Token from :py:meth:`start`, taken before the decoding.
+        """
+        self._add(self._frames, id(frame), rows, token)
+
+        if id(frame) not in self._frame_info:
+            self._frame_info[id(frame)] = (frame.id, frame.name)
+
+        return
+
+    def add_signal(self, signal: Signal, rows: int, token: Tuple[float, int]) -> None:
+        """Record the decoding of a signal.
+
+        :param signal:  The decoded signal.
+        :param rows:    Number of CAN frames the signal was decoded from.
+        :param token:   Token from :py:meth:`start`, taken before the decoding.
+        """
+        self._add(self._signals, id(signal), rows, token)
+
+        if id(signal) not in self._signal_info:
+            self._signal_info[id(signal)] = (None, signal.name)
+
+        return
+
+    def reset(self) -> None:
+        """Discard all measurements.
+        """
+        self._frames.clear()
+        self._signals.clear()
+        return
+
+    def as_dict(self) -> Dict[str, list]:
+        """Get all measurements.
+
+        :return:    Dictionary with a list of measurements for "frames" and for "signals". Each measurement is a
+                    dictionary with the frame ID, the name, the number of calls, the number of rows, the time in
+                    seconds and the bytes allocated (None without trace_memory).
+        """
+        def export(entries, info):
+            result = []
+
+            for key, (calls, rows, elapsed, allocated) in entries.items():
+                frame_id, name = info[key]
+
+                result.append({
+                    "Frame ID": frame_id,
+                    "Name": name,
+                    "Calls": calls,
+                    "Rows": rows,
+                    "Time": elapsed,
+                    "Bytes": allocated if self.trace_memory else None,
+                })
+
+            return result
+
+        return {
+            "frames": export(self._frames, self._frame_info),
+            "signals": export(self._signals, self._signal_info),
+        }
+
+    def to_data_frame(self, kind: str = "frames"):
+        """Get the measurements as a pandas DataFrame, sorted by descending time. Requires pandas.
+
+        :param kind:    Either "frames" or "signals".
+        :return:        DataFrame with a row per frame or signal.
+        """
+        import pandas as pd
+
+        if kind not in ("frames", "signals"):
+            raise ValueError("Unknown kind: \"{}\"".format(kind))
+
+        result = pd.DataFrame(
+            self.as_dict()[kind],
+            columns=["Frame ID", "Name", "Calls", "Rows", "Time", "Bytes"]
+        )
+
+        return result.sort_values("Time", ascending=False, ignore_index=True)
+
+    pass
@@ -0,0 +1,70 @@
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+class DecodeStatistics(object):
+    """Counters collected while decoding, when supplied to a decoder. Counters accumulate until :py:meth:`reset` is
+    called, so a single instance can collect statistics across several decoders or calls.
+
+    * **frames_seen** - Number of CAN frames (records or rows) processed.
+    * **frames_decoded** - Number of CAN frames matching a frame in the database.
+    * **unknown_ids** - Number of CAN frames per CAN ID not found in the database. Extended IDs have the most
+      significant bit set.
+    * **unknown_channels** - Number of CAN frames per bus channel without a database, when decoding with a
+      :py:class:`can_decoder.ChannelSignalDB.ChannelSignalDB`.
+    * **invalid_values** - Number of values per signal name dropped as invalid (J1939 only).
+    * **size_mismatches** - Number of values per signal name which could not be decoded, since the data was missing or
+      of the wrong size.
+    * **phase_times** - Time in seconds spent per phase of the decoding.
+    """
+
+    def __init__(self):
+        self.frames_seen = 0
+        self.frames_decoded = 0
+        self.unknown_ids = Counter()  # type: Counter
+        self.unknown_channels = Counter()  # type: Counter
+        self.invalid_values = Counter()  # type: Counter
+        self.size_mismatches = Counter()  # type: Counter
+        self.phase_times = Counter()  # type: Counter
+        return
+
+    def reset(self) -> None:
+        """Reset all counters.
+        """
+        self.__init__()
+        return
+
+    def top_unknown_ids(self, count: int = 10) -> List[Tuple[int, int]]:
+        """Get the most frequent unknown CAN IDs.
+
+        :param count:   Maximum number of IDs to return.
+        :return:        List of tuples with the CAN ID and the number of frames, most frequent first.
+        """
+        return self.unknown_ids.most_common(count)
+
+    def as_dict(self) -> Dict:
+        """Get all statistics as a dictionary.
+
+        :return:    Dictionary with the statistics, with plain dictionaries in place of the counters.
+        """
+        return {
+            "frames_seen": self.frames_seen,
+            "frames_decoded": self.frames_decoded,
+            "unknown_ids": dict(self.unknown_ids),
+            "unknown_channels": dict(self.unknown_channels),
+            "invalid_values": dict(self.invalid_values),
+            "size_mismatches": dict(self.size_mismatches),
+            "phase_times": dict(self.phase_times),
+        }
+
+    def __repr__(self) -> str:
+        return "DecodeStatistics(frames_seen={}, frames_decoded={}, unknown_ids={}, invalid_values={}, " \
+               "size_mismatches={})".format(
+                    self.frames_seen,
+                    self.frames_decoded,
+                    sum(self.unknown_ids.values()),
+                    sum(self.invalid_values.values()),
+                    sum(self.size_mismatches.values()),
+                )
+
+    pass
@@ -3,17 +3,86 @@ import warnings
 import numpy as np
 
 from abc import ABCMeta, abstractmethod
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.DecodeProfiler import DecodeProfiler
+from can_decoder.DecodeStatistics import DecodeStatistics
+from can_decoder.MuxDispatch import MuxDispatch
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
+from can_decoder.ValueTable import ValueTable
 from can_decoder.warnings.MissingDataWarning import MissingDataWarning
 from can_decoder.warnings.DataSizeMismatchWarning import DataSizeMismatchWarning
 
 
+def _compile_mux_dispatch(signal: Signal) -> MuxDispatch:
+    return MuxDispatch(signal.signals)
+
+
+def _compile_value_table(signal: Signal) -> ValueTable:
+    return ValueTable(signal.values)
+
+
 class DecoderBase(object, metaclass=ABCMeta):
     def __init__(self, conversion_rules: SignalDB):
         self._db = conversion_rules
+        
+        # Statistics to update while decoding, if enabled.
+        self._statistics = None  # type: Optional[DecodeStatistics]
+        
+        # Data errors collected while decoding, reported in a single summary warning.
+        self._diagnostics = DecodeDiagnostics()
+        
+        # Disabled for decoders used internally by another decoder, which reports the data errors instead.
+        self._report_data_errors = True
+        
+        # Profiler to record the decoding of each frame and signal in, if enabled.
+        self._profiler = None  # type: Optional[DecodeProfiler]
+        
+        # Compiled multiplexer groups and value descriptions, by the id of the signal. Compiled on first use, and kept
+        # with the signal itself and its layout generation, such that the id of a discarded signal reused by a new
+        # signal is never matched, and a changed signal is compiled again.
+        self._mux_dispatch = {}  # type: Dict[int, Tuple[Signal, int, MuxDispatch]]
+        self._value_tables = {}  # type: Dict[int, Tuple[Signal, int, ValueTable]]
+        return
+    
+    @property
+    def diagnostics(self) -> DecodeDiagnostics:
+        """Data errors collected while decoding, e.g. signals not covered by the data of a frame.
+        """
+        return self._diagnostics
+    
+    def _report_diagnostics(self) -> None:
+        """Issue a single summary warning for the collected data errors, unless statistics are collected.
+        """
+        if self._report_data_errors and self._statistics is None and self._diagnostics:
+            self._diagnostics.warn(stacklevel=3)
+        
+        return
+    
+    @contextmanager
+    def profile(self, profiler: Optional[DecodeProfiler] = None) -> Iterator[DecodeProfiler]:
+        """Profile all decoding done by this decoder within the context, e.g. calls to decode_frame or iterating.
+        
+        :param profiler:    Profiler to record the measurements in. If None, a new profiler is created.
+        :return:            Context manager yielding the profiler.
+        """
+        if profiler is None:
+            profiler = DecodeProfiler()
+        
+        previous_profiler = self._profiler
+        
+        profiler._enable(self._db)
+        self._profiler = profiler
+        
+        try:
+            yield profiler
+        finally:
+            self._profiler = previous_profiler
+            profiler._disable()
+        
         return
     
     @classmethod
@@ -27,14 +96,71 @@ class DecoderBase(object, metaclass=ABCMeta):
         """
         raise NotImplementedError("")  # pragma: no cover
 
+    def _get_compiled(self, cache: Dict[int, tuple], source, compile_function: Callable):
+        """Get the compiled form of a signal or frame from a cache, compiling it if not present or if the layout of the
+        source has changed since it was compiled. Changes to a frame include changes to all of its signals.
+        
+        :param cache:               Cache of compiled forms, by the id of the source.
+        :param source:              Signal or frame to get the compiled form of.
+        :param compile_function:    Function compiling the source.
+        :return:                    The compiled form of the source.
+        """
+        entry = cache.get(id(source), None)
+        
+        if entry is None or entry[0] is not source or entry[1] != source._layout_generation:
+            entry = (source, source._layout_generation, compile_function(source))
+            cache[id(source)] = entry
+        
+        return entry[2]
+    
+    def _demultiplex(self, multiplexer: Signal, frame_data: np.ndarray) -> List[Tuple[Tuple[Signal, ...], np.ndarray]]:
+        """Decode a multiplexer and split the rows of the frame data on its values.
+        
+        :param multiplexer: Multiplexer signal.
+        :param frame_data:  Frame data as a 2D array of uint8 bytes, one row per frame.
+        :return:            List of the multiplexed signals and the row indices of each multiplexer value present.
+        """
+        dispatch = self._get_compiled(self._mux_dispatch, multiplexer, _compile_mux_dispatch)
+        
+        demultiplexed_ids = self._decode_signal_raw(multiplexer, frame_data, self._statistics, self._diagnostics)
+        
+        return dispatch.partition(demultiplexed_ids)
+    
+    def _get_label_codes(self, signal: Signal, signal_data_raw: np.ndarray) -> Tuple[ValueTable, np.ndarray]:
+        """Look up the labels of raw signal values in the value descriptions of the signal.
+        
+        :param signal:          Signal the values belong to.
+        :param signal_data_raw: Raw values, before conversion to physical values.
+        :return:                The value table of the signal, and the code of the label of each value in the table
+                                (-1 for values without a label).
+        """
+        table = self._get_compiled(self._value_tables, signal, _compile_value_table)
+        
+        raw_values = signal_data_raw.reshape(-1).astype(np.int64)
+        
+        if signal.is_signed and signal.size < 64:
+            # Value descriptions use the signed value.
+            raw_values = np.where(raw_values >= 1 << (signal.size - 1), raw_values - (1 << signal.size), raw_values)
+        
+        return table, table.lookup(raw_values)
+    
     @classmethod
-    def _extract_signal_bits(cls, signal: Signal, data: np.ndarray) -> np.ndarray:
+    def _extract_signal_bits(
+            cls,
+            signal: Signal,
+            data: np.ndarray,
+            statistics: Optional[DecodeStatistics] = None,
+            diagnostics: Optional[DecodeDiagnostics] = None
+    ) -> np.ndarray:
         """Given a signal description and an array of data bytes, extract the bits relevant for a signal. Result is
         returned as an array of signal data bytes. Handles endian changes.
 
-        :param signal:  Signal to extract data for.
-        :param data:    Array of data as uint8 bytes.
-        :return:        Array of signal data as uint8 bytes, in little endian format.
+        :param signal:      Signal to extract data for.
+        :param data:        Array of data as uint8 bytes.
+        :param statistics:  Statistics to count missing data in.
+        :param diagnostics: Diagnostics to collect missing data in. If None, a warning is issued instead, unless
+                            statistics are supplied.
+        :return:            Array of signal data as uint8 bytes, in little endian format.
         """
         # Determine the start and stop bits.
         start_bit = signal.start_bit
@@ -50,7 +176,13 @@ class DecoderBase(object, metaclass=ABCMeta):
         reduced_data = data[:, start_byte:stop_byte]  # type: np.ndarray
         
         if reduced_data.size == 0:
-            warnings.warn("No data found for signal {}".format(signal), MissingDataWarning)
+            if statistics is not None:
+                statistics.size_mismatches[signal.name] += data.shape[0]
+            
+            if diagnostics is not None:
+                diagnostics.missing_data[signal.name] += data.shape[0]
+            elif statistics is None:
+                warnings.warn("No data found for signal {}".format(signal), MissingDataWarning)
             return np.empty(shape=(data.shape[0], 0))
     
         # Determine how to read the data depending on the endianness.
@@ -73,16 +205,25 @@ class DecoderBase(object, metaclass=ABCMeta):
         return packed
 
     @classmethod
-    def _decode_signal_raw(cls, signal: Signal, data: np.ndarray) -> Optional[np.ndarray]:
+    def _decode_signal_raw(
+            cls,
+            signal: Signal,
+            data: np.ndarray,
+            statistics: Optional[DecodeStatistics] = None,
+            diagnostics: Optional[DecodeDiagnostics] = None
+    ) -> Optional[np.ndarray]:
         """Given a signal and frame data, extract the raw value of the signal.
 
-        :param signal:  Signal to extract.
-        :param data:    Frame data as an array of uint8 bytes.
-        :return:        Array of raw signal values, in the smallest possible dtype.
+        :param signal:      Signal to extract.
+        :param data:        Frame data as an array of uint8 bytes.
+        :param statistics:  Statistics to count missing or mismatched data in.
+        :param diagnostics: Diagnostics to collect missing or mismatched data in. If None, warnings are issued instead,
+                            unless statistics are supplied.
+        :return:            Array of raw signal values, in the smallest possible dtype.
         """
     
         # Extract only the bits relevant for this signal.
-        signal_data = cls._extract_signal_bits(signal, data)
+        signal_data = cls._extract_signal_bits(signal, data, statistics, diagnostics)
 
         if signal_data.size == 0:
             return signal_data
@@ -122,7 +263,13 @@ class DecoderBase(object, metaclass=ABCMeta):
         try:
             reshaped_data = signal_data.reshape(new_shape)
         except ValueError as e:
-            warnings.warn("Could not shape data for {}".format(signal), DataSizeMismatchWarning)
+            if statistics is not None:
+                statistics.size_mismatches[signal.name] += data.shape[0]
+            
+            if diagnostics is not None:
+                diagnostics.size_mismatches[signal.name] += data.shape[0]
+            elif statistics is None:
+                warnings.warn("Could not shape data for {}".format(signal), DataSizeMismatchWarning)
             return np.empty(shape=(new_shape[0], 0))
     
         # Interpret as single datatype.
@@ -1,13 +1,22 @@
 from typing import List, Optional
 
-from can_decoder.Signal import Signal
+from can_decoder.Signal import Signal, _hashed_attribute
 
 
 class Frame(object):
-    id = 0  # type: int
-    size = 0  # type: int
-    signals = None  # type: List[Signal]
-    multiplexer = None  # type: Optional[Signal]
+    __slots__ = (
+        "_id",
+        "_size",
+        "name",
+        "signals",
+        "multiplexer",
+        "_hash",
+        "_owners",
+        "_layout_generation",
+    )
+    
+    id = _hashed_attribute("_id")  # type: int
+    size = _hashed_attribute("_size")  # type: int
     
     def __init__(
             self,
@@ -15,15 +24,21 @@ class Frame(object):
             frame_size: int,
             frame_name: str = "",
     ) -> None:
-        self.id = frame_id
-        self.size = frame_size
-        self.name = frame_name
-        self.signals = []
+        self._id = frame_id
+        self._size = frame_size
+        self.name = frame_name  # type: str
+        self.signals = []  # type: List[Signal]
+        self.multiplexer = None  # type: Optional[Signal]
+        self._hash = None  # type: Optional[int]
+        
+        # Databases holding the frame, and the generation of the layout of the frame and all its signals. See Signal.
+        self._owners = []  # type: list
+        self._layout_generation = 0
     
     def _get_tuple(self):
         return (
-            self.id,
-            self.size
+            self._id,
+            self._size
         )
     
     def add_signal(self, *args, **kwargs) -> bool:
@@ -50,6 +65,8 @@ class Frame(object):
         if result:
             # Add the signal to the internal storage.
             self.signals.append(signal)
+            signal._add_owner(self)
+            self._layout_changed()
             
             # If the signal is a multiplexer, and no other signal is a multiplexer, set this as the root multiplexer.
             if self.multiplexer is None and signal.is_multiplexer:
@@ -65,6 +82,45 @@ Should the signal have been added to another signal as a multiplexed value?
         
         return result
     
+    def _add_owner(self, owner) -> None:
+        """Register a database holding this frame, to pass on changes of the layout to.
+        """
+        if not any(existing is owner for existing in self._owners):
+            self._owners.append(owner)
+        
+        return
+    
+    def _layout_changed(self) -> None:
+        """Mark the layout as changed, along with the databases holding the frame.
+        """
+        self._layout_generation += 1
+        
+        for owner in self._owners:
+            owner._layout_changed()
+        
+        return
+    
+    def leaf_signals(self) -> List[Signal]:
+        """Get all signals in the frame carrying values, i.e. excluding multiplexers. The order is fixed, depth first
+        through the multiplexed groups in insertion order.
+        
+        :return:    List of signals.
+        """
+        result = []
+        
+        def collect(signals: List[Signal]):
+            for signal in signals:
+                if signal.is_multiplexer:
+                    for multiplex in signal.signals.values():
+                        collect(multiplex)
+                else:
+                    result.append(signal)
+            return
+        
+        collect(self.signals)
+        
+        return result
+    
     def __str__(self) -> str:
         result = f"CAN Frame with name \"{self.name}\" and ID 0x{self.id:08X} - {self.size} bytes and {len(self.signals)} direct signals"
         
@@ -81,12 +137,34 @@ Should the signal have been added to another signal as a multiplexed value?
         return result
     
     def __hash__(self) -> int:
-        return hash(self._get_tuple())
+        # Cached until one of the hashed attributes is assigned.
+        if self._hash is None:
+            self._hash = hash(self._get_tuple())
+        
+        return self._hash
     
     def __eq__(self, other) -> bool:
         if not isinstance(other, Frame):
             return NotImplemented
         
+        if self is other:
+            return True
+        
+        # Differing hashes rule out equality without comparing the tuples.
+        if hash(self) != hash(other):
+            return False
+        
         return self._get_tuple() == other._get_tuple()
     
+    def __getstate__(self):
+        # Leave out the cached hash, see Signal.
+        return {slot: getattr(self, slot) for slot in Frame.__slots__ if slot != "_hash"}
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        
+        self._hash = None
+        return
+    
     pass
@@ -0,0 +1,157 @@
+from bisect import bisect_right
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Key of a multiplexer group, either a single value or a range of values from extended multiplexing (SG_MUL_VAL_).
+MuxKey = Union[int, range]
+
+
+class MuxDispatch(object):
+    """Multiplexer groups of a signal, compiled for demultiplexing many rows at once.
+
+    Groups are keyed on a multiplexer value, or on a range of values. The keys are split into disjoint intervals of
+    values, each holding the signals of all keys covering it, such that a range is kept as a single interval regardless
+    of the number of values it spans. Where keys overlap, the signals follow in the order the keys were added. A group
+    keyed on None is never selected.
+
+    Rows are demultiplexed by sorting them on the multiplexer value once, after which each value present is a contiguous
+    run of rows, and the runs of an interval are adjacent. This takes a single pass regardless of the number of
+    multiplexer values, where selecting the rows of each value separately takes a pass per value.
+    """
+    __slots__ = ("signals", "_groups", "_lowers", "_uppers", "_positions", "_has_ranges")
+
+    def __init__(self, groups: Mapping[MuxKey, Sequence]):
+        """Compile multiplexer groups. Later changes to the groups are not reflected.
+
+        :param groups:  Signals of each multiplexer value or range of values, e.g. the signals of a multiplexer signal.
+        """
+        # Keys starting and ending at each bound, by the order the keys were added.
+        starting = {}  # type: Dict[int, List[int]]
+        ending = {}  # type: Dict[int, List[int]]
+        group_list = list(groups.values())
+
+        for index, key in enumerate(groups.keys()):
+            if key is None:
+                # Simple multiplexing files the plain signals of the frame under None. They are decoded with the frame.
+                continue
+
+            lower, upper = (key.start, key.stop) if isinstance(key, range) else (key, key + 1)
+
+            if upper > lower:
+                starting.setdefault(lower, []).append(index)
+                ending.setdefault(upper, []).append(index)
+
+        signals = []
+        intervals = []  # type: List[Tuple[int, int]]
+        interval_groups = []  # type: List[tuple]
+        active = set()
+        bounds = sorted(starting.keys() | ending.keys())
+
+        # Sweep over the bounds, keeping track of the keys covering the interval up to the next bound.
+        for lower, upper in zip(bounds, bounds[1:]):
+            active.difference_update(ending.get(lower, ()))
+            active.update(starting.get(lower, ()))
+
+            if len(active) == 0:
+                continue
+
+            group = tuple(signal for index in sorted(active) for signal in group_list[index])
+            signals.extend(group)
+            intervals.append((lower, upper))
+            interval_groups.append(group)
+
+        self.signals = tuple(signals)
+        self._groups = interval_groups  # type: List[tuple]
+        self._lowers = [lower for lower, _ in intervals]  # type: List[int]
+        self._uppers = [upper for _, upper in intervals]  # type: List[int]
+
+        # Intervals of a single value are looked up directly.
+        self._positions = {
+            lower: position for position, (lower, upper) in enumerate(intervals) if upper - lower == 1
+        }  # type: Dict[int, int]
+        self._has_ranges = len(self._positions) != len(intervals)
+        return
+
+    def _locate(self, value: int) -> Optional[int]:
+        """Find the interval holding a multiplexer value.
+
+        :param value:   Multiplexer value.
+        :return:        Position of the interval, or None if no group covers the value.
+        """
+        position = self._positions.get(value, None)
+
+        if position is None and self._has_ranges:
+            position = bisect_right(self._lowers, value) - 1
+
+            if position < 0 or value >= self._uppers[position]:
+                return None
+
+        return position
+
+    def group(self, value: int) -> tuple:
+        """Get the signals multiplexed by a value.
+
+        :param value:   Multiplexer value.
+        :return:        Signals of the group, empty if the value has no group.
+        """
+        position = self._locate(value)
+
+        if position is None:
+            return ()
+
+        return self._groups[position]
+
+    def partition(self, mux_values: np.ndarray) -> List[Tuple[tuple, np.ndarray]]:
+        """Split rows on their multiplexer values.
+
+        :param mux_values:  Raw multiplexer value of each row.
+        :return:            List of the signals and the row indices of each group present, in order of the values. The
+                            rows of all values in a range form a single entry. Row indices are in ascending order.
+        """
+        mux_values = mux_values.reshape(-1)
+
+        if mux_values.size == 0:
+            return []
+        elif mux_values.size == 1:
+            signals = self.group(int(mux_values[0]))
+            return [(signals, np.zeros(1, dtype=np.intp))] if len(signals) != 0 else []
+
+        # A stable sort keeps the rows of each value in their original order.
+        order = np.argsort(mux_values, kind="stable")
+        sorted_values = mux_values[order]
+        bounds = (np.flatnonzero(sorted_values[1:] != sorted_values[:-1]) + 1).tolist()
+
+        # Runs of rows as [interval position, start, end, number of values].
+        runs = []  # type: List[List[int]]
+        starts = [0] + bounds
+        ends = bounds + [len(order)]
+
+        for start, end, value in zip(starts, ends, sorted_values[starts].tolist()):
+            position = self._locate(value)
+
+            if position is None or len(self._groups[position]) == 0:
+                continue
+
+            if len(runs) != 0 and runs[-1][0] == position:
+                # Another value of the same range, extend the run.
+                runs[-1][2] = end
+                runs[-1][3] += 1
+            else:
+                runs.append([position, start, end, 1])
+
+        result = []
+
+        for position, start, end, value_count in runs:
+            indices = order[start:end]
+
+            if value_count > 1:
+                # The rows are ordered on the value first, restore the order of the rows.
+                indices = np.sort(indices)
+
+            result.append((self._groups[position], indices))
+
+        return result
+
+    pass
@@ -1,16 +1,45 @@
-from typing import Dict, List, Union
+from operator import attrgetter
+from typing import Dict, List, Optional, Union
+
+
+def _hashed_attribute(slot: str) -> property:
+    """Create a property for an attribute included in the hash, stored in the given slot. Assigning the attribute
+    clears the cached hash.
+    """
+    def setter(self, value):
+        setattr(self, slot, value)
+        self._hash = None
+        return
+    
+    return property(attrgetter(slot), setter)
 
 
 class Signal(object):
-    name = ""  # type: str
-    factor = 1  # type: Union[int, float]
-    offset = 0  # type: Union[int, float]
-    start_bit = 0  # type: int
-    size = 0  # type: int
-    is_little_endian = True  # type: bool
-    is_signed = False  # type: bool
-    is_float = False  # type: bool
-    signals = None  # type: Dict[int, List[Signal]]
+    __slots__ = (
+        "_name",
+        "_factor",
+        "_offset",
+        "_start_bit",
+        "_size",
+        "_is_little_endian",
+        "_is_signed",
+        "_is_float",
+        "signals",
+        "attributes",
+        "_values",
+        "_hash",
+        "_owners",
+        "_layout_generation",
+    )
+    
+    name = _hashed_attribute("_name")  # type: str
+    factor = _hashed_attribute("_factor")  # type: Union[int, float]
+    offset = _hashed_attribute("_offset")  # type: Union[int, float]
+    start_bit = _hashed_attribute("_start_bit")  # type: int
+    size = _hashed_attribute("_size")  # type: int
+    is_little_endian = _hashed_attribute("_is_little_endian")  # type: bool
+    is_signed = _hashed_attribute("_is_signed")  # type: bool
+    is_float = _hashed_attribute("_is_float")  # type: bool
     
     def __init__(
             self,
@@ -21,17 +50,42 @@ class Signal(object):
             signal_is_signed: bool = False,
             signal_is_float: bool = False,
             signal_factor: Union[int, float] = 1,
-            signal_offset: Union[int, float] = 0
+            signal_offset: Union[int, float] = 0,
+            signal_attributes: Optional[Dict[str, str]] = None,
+            signal_values: Optional[Dict[int, str]] = None
     ) -> None:
-        self.name = signal_name
-        self.factor = signal_factor
-        self.offset = signal_offset
-        self.start_bit = signal_start_bit
-        self.size = signal_size
-        self.is_little_endian = signal_is_little_endian
-        self.is_signed = signal_is_signed
-        self.is_float = signal_is_float
-        self.signals = {}
+        self._name = signal_name
+        self._factor = signal_factor
+        self._offset = signal_offset
+        self._start_bit = signal_start_bit
+        self._size = signal_size
+        self._is_little_endian = signal_is_little_endian
+        self._is_signed = signal_is_signed
+        self._is_float = signal_is_float
+        # Multiplexed signals, keyed on a multiplexer value or a range of values.
+        self.signals = {}  # type: Dict[Union[int, range], List[Signal]]
+        self.attributes = {} if signal_attributes is None else signal_attributes  # type: Dict[str, str]
+        self._values = {} if signal_values is None else signal_values  # type: Dict[int, str]
+        self._hash = None  # type: Optional[int]
+        
+        # Incremented whenever the layout of the signal changes through add_multiplexed_signal or by assigning new value
+        # descriptions, and passed on to the signals, frames and databases holding it. Decoders compile the rules on
+        # first use, and compile them again once this changes. Changes made directly to the signal dictionaries are
+        # not tracked.
+        self._owners = []  # type: list
+        self._layout_generation = 0
+    
+    @property
+    def values(self) -> Dict[int, str]:
+        """Value descriptions of the signal, mapping raw values to labels.
+        """
+        return self._values
+    
+    @values.setter
+    def values(self, values: Dict[int, str]) -> None:
+        self._values = values
+        self._layout_changed()
+        return
     
     @property
     def is_multiplexer(self):
@@ -45,18 +99,38 @@ class Signal(object):
             self.signals[id] = mux_group
         
         mux_group.append(signal)
+        signal._add_owner(self)
+        self._layout_changed()
+        return
+    
+    def _add_owner(self, owner) -> None:
+        """Register a signal or frame holding this signal, to pass on changes of the layout to.
+        """
+        if not any(existing is owner for existing in self._owners):
+            self._owners.append(owner)
+        
+        return
+    
+    def _layout_changed(self) -> None:
+        """Mark the layout as changed, along with the signals, frames and databases holding the signal.
+        """
+        self._layout_generation += 1
+        
+        for owner in self._owners:
+            owner._layout_changed()
+        
         return
     
     def _get_tuple(self):
         return (
-            self.name,
-            self.factor,
-            self.offset,
-            self.start_bit,
-            self.size,
-            self.is_little_endian,
-            self.is_signed,
-            self.is_float,
+            self._name,
+            self._factor,
+            self._offset,
+            self._start_bit,
+            self._size,
+            self._is_little_endian,
+            self._is_signed,
+            self._is_float,
         )
     
     def __str__(self) -> str:
@@ -71,6 +145,9 @@ class Signal(object):
             result += f" multiplex for {len(self.signals)} group(s):"
             
             for group_id, signals in self.signals.items():
+                if isinstance(group_id, range):
+                    group_id = f"{group_id.start}-{group_id.stop - 1}"
+                
                 result += f"\n\tGroup with ID {group_id} and {len(signals)} signal(s):"
                 
                 for signal in signals:
@@ -82,12 +159,34 @@ class Signal(object):
         return result
 
     def __hash__(self) -> int:
-        return hash(self._get_tuple())
+        # Cached until one of the hashed attributes is assigned.
+        if self._hash is None:
+            self._hash = hash(self._get_tuple())
+        
+        return self._hash
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Signal):
             return NotImplemented
     
+        if self is other:
+            return True
+        
+        # Differing hashes rule out equality without comparing the tuples.
+        if hash(self) != hash(other):
+            return False
+    
         return self._get_tuple() == other._get_tuple()
+    
+    def __getstate__(self):
+        # Leave out the cached hash, as string hashes differ between interpreters.
+        return {slot: getattr(self, slot) for slot in Signal.__slots__ if slot != "_hash"}
+    
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        
+        self._hash = None
+        return
 
     pass
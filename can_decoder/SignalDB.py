@@ -1,7 +1,10 @@
-from typing import Optional, List
+from os import PathLike
+from typing import Dict, Iterable, Optional, List, Tuple, Union
 
 from can_decoder.Frame import Frame
 from can_decoder.Signal import Signal
+from can_decoder.SignalLocation import SignalLocation
+from can_decoder.support import get_j1939_pgn
 
 
 class SignalDB(object):
@@ -12,6 +15,17 @@ class SignalDB(object):
         """
         self._protocol = protocol
         self.frames = {}
+        
+        # Generation of the layout of all frames added with add_frame, see Signal.
+        self._layout_generation = 0
+        
+        # Indexes, built on the first lookup and built again once the layout has changed.
+        self._indexed_generation = None  # type: Optional[int]
+        self._indexed_frame_ids = []  # type: List[int]
+        self._signal_names = []  # type: List[str]
+        self._signals_by_name = {}  # type: Dict[str, List[SignalLocation]]
+        self._frames_by_name = {}  # type: Dict[str, Frame]
+        self._signals_by_attribute = {}  # type: Dict[str, Dict[str, List[SignalLocation]]]
         pass
     
     @property
@@ -29,30 +43,159 @@ class SignalDB(object):
         """
         if frame.id not in self.frames.keys():
             self.frames[frame.id] = frame
+            frame._add_owner(self)
+            self._layout_changed()
             return True
         
         return False
     
+    def _layout_changed(self) -> None:
+        """Mark the layout of the database as changed, e.g. by adding a frame or a signal to one of its frames.
+        """
+        self._layout_generation += 1
+        return
+    
+    def _update_indexes(self) -> None:
+        # Signals added to the frames change the layout generation. Frames placed in, replaced in or removed from the
+        # frames dictionary directly are picked up by comparing the frame objects, and are adopted such that later
+        # changes to their signals are tracked as well.
+        frame_ids = [id(frame) for frame in self.frames.values()]
+        
+        if self._indexed_generation == self._layout_generation and self._indexed_frame_ids == frame_ids:
+            return
+        
+        self._signal_names = []
+        self._signals_by_name = {}
+        self._frames_by_name = {}
+        self._signals_by_attribute = {}
+        
+        for frame in self.frames.values():
+            frame._add_owner(self)
+            self._index_frame(frame)
+        
+        self._indexed_generation = self._layout_generation
+        self._indexed_frame_ids = frame_ids
+        return
+    
+    def _index_frame(self, frame: Frame) -> None:
+        self._frames_by_name.setdefault(frame.name, frame)
+        
+        def index_signal(signal: Signal, mux_path: Tuple[Tuple[Signal, int], ...]):
+            location = SignalLocation(frame, mux_path, signal)
+            
+            self._signal_names.append(signal.name)
+            self._signals_by_name.setdefault(signal.name, []).append(location)
+            
+            for attribute, value in signal.attributes.items():
+                self._signals_by_attribute.setdefault(attribute, {}).setdefault(value, []).append(location)
+            
+            for mux_value, multiplex in signal.signals.items():
+                for sub_signal in multiplex:
+                    index_signal(sub_signal, mux_path + ((signal, mux_value),))
+            return
+        
+        for root_signal in frame.signals:
+            index_signal(root_signal, ())
+        
+        return
+    
     def signals(self) -> List[str]:
         """Get a list of all signals in the database.
         
         :return: List of all signals as strings.
         """
-        result = []
+        self._update_indexes()
+        return list(self._signal_names)
+    
+    def get_frame_by_name(self, name: str) -> Optional[Frame]:
+        """Look up a frame by name. If several frames share the name, the first added is returned.
+        
+        :param name: Name of the frame.
+        :return: The frame, or None if not found.
+        """
+        self._update_indexes()
+        return self._frames_by_name.get(name, None)
+    
+    def get_signal_locations(self, name: str) -> List[SignalLocation]:
+        """Look up all occurrences of a signal by name, e.g. to select the frames required to decode it.
+        
+        :param name: Name of the signal.
+        :return: List of locations, in the order the signals were added. Empty if not found.
+        """
+        self._update_indexes()
+        return list(self._signals_by_name.get(name, []))
+    
+    def get_signals_by_attribute(self, attribute: str, value: str) -> List[SignalLocation]:
+        """Look up all signals with a given attribute value, e.g. all signals for an SPN.
+        
+        :param attribute: Name of the attribute, e.g. "SPN".
+        :param value: Value of the attribute, as a string.
+        :return: List of locations, in the order the signals were added. Empty if not found.
+        """
+        self._update_indexes()
+        return list(self._signals_by_attribute.get(attribute, {}).get(value, []))
+    
+    def save(self, path: Union[str, PathLike]) -> None:
+        """Save the signal database to a file in a compact binary format, see
+        :py:class:`can_decoder.SignalDBSerializer.SignalDBSerializer`.
+        
+        :param path: Path to the output file.
+        """
+        from can_decoder.SignalDBSerializer import SignalDBSerializer
+        
+        SignalDBSerializer.save(self, path)
+        return
+    
+    @staticmethod
+    def load(path: Union[str, PathLike]) -> "SignalDB":
+        """Load a signal database saved by :py:meth:`save`.
+        
+        :param path: Path to the file.
+        :return: The loaded signal database.
+        """
+        from can_decoder.SignalDBSerializer import SignalDBSerializer
+        
+        return SignalDBSerializer.load(path)
+    
+    @staticmethod
+    def merge(databases: Iterable["SignalDB"]) -> "SignalDB":
+        """Merge several signal databases into a new database, sharing the frames. Requires the same protocol in all
+        databases and no conflicting frames. Frames conflict if they have the same ID, or for J1939 the same PGN, as
+        the decoders could not tell them apart.
+        
+        :param databases: Signal databases to merge.
+        :return: The merged signal database.
+        :raises ValueError: If no databases are supplied, or the databases can not be merged.
+        """
+        databases = list(databases)
+        
+        if len(databases) == 0:
+            raise ValueError("No signal databases to merge")
+        
+        protocols = set(db.protocol for db in databases)
+        
+        if len(protocols) != 1:
+            raise ValueError("Mixed protocols: {}".format(", ".join(sorted(str(protocol) for protocol in protocols))))
+        
+        protocol = protocols.pop()
+        result = SignalDB(protocol=protocol)
+        keys = {}  # type: Dict[int, int]
+        conflicts = []  # type: List[str]
+        
+        for db in databases:
+            for frame in db.frames.values():
+                key = get_j1939_pgn(frame.id) if protocol == "J1939" else frame.id
+                
+                if key in keys:
+                    conflicts.append("0x{:08X} and 0x{:08X}".format(keys[key], frame.id))
+                    continue
+                
+                keys[key] = frame.id
+                result.add_frame(frame)
+        
+        if len(conflicts) != 0:
+            raise ValueError("Conflicting frames: {}".format(", ".join(conflicts)))
         
-        def yield_signals(result_list: List[str], signal: Signal):
-            result_list.append(signal.name)
-            
-            if signal.is_multiplexer:
-                for multiplex in signal.signals.values():
-                    for sub_signal in multiplex:
-                        yield_signals(result_list=result_list, signal=sub_signal)
-            return
-
-        for frame in self.frames.values():
-            for signal in frame.signals:
-                yield_signals(result_list=result, signal=signal)
-            
         return result
     
     def __str__(self):
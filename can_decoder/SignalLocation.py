@@ -0,0 +1,13 @@
+from collections import namedtuple
+
+
+SignalLocation = namedtuple(
+    "SignalLocation", [
+        "Frame",
+        "MuxPath",
+        "Signal",
+    ]
+)
+SignalLocation.__doc__ = """Location of a signal in a signal database. MuxPath holds a tuple with a (multiplexer signal, multiplexer value) pair
+for each multiplexer level above the signal, starting from the root. The value is a range for signals present for a
+range of values (extended multiplexing). It is empty for signals placed directly in the frame."""
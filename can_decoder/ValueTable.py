@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class ValueTable(object):
+    """Value descriptions of a signal (VAL_ in DBC files), compiled for looking up the labels of many raw values at once.
+
+    Each distinct label is given a code, its index in :py:attr:`categories`. Raw values are mapped to the codes through a
+    dense array covering the range of the described values when the range is small, and by binary search in the sorted
+    values otherwise.
+    """
+    __slots__ = ("categories", "_minimum", "_dense", "_keys", "_codes")
+
+    # Largest range of raw values looked up through a dense array.
+    dense_limit = 4096
+
+    def __init__(self, values: Dict[int, str]):
+        """Compile a set of value descriptions.
+
+        :param values:  Map from raw value to label.
+        """
+        categories = list(dict.fromkeys(values.values()))
+        category_codes = {label: code for code, label in enumerate(categories)}
+
+        keys = sorted(values.keys())
+
+        self.categories = categories  # type: List[str]
+        self._keys = np.array(keys, dtype=np.int64)
+        self._codes = np.array([category_codes[values[key]] for key in keys], dtype=np.int32)
+        self._minimum = keys[0] if len(keys) != 0 else 0
+        self._dense = None  # type: Optional[np.ndarray]
+
+        if len(keys) != 0 and keys[-1] - keys[0] < self.dense_limit:
+            self._dense = np.full(keys[-1] - keys[0] + 1, -1, dtype=np.int32)
+            self._dense[self._keys - self._minimum] = self._codes
+
+        return
+
+    def lookup(self, raw_values: np.ndarray) -> np.ndarray:
+        """Get the label codes of raw values.
+
+        :param raw_values:  Raw integer values, sign extended for signed signals.
+        :return:            Array with the code of the label of each value, or -1 for values without a label.
+        """
+        raw_values = np.asarray(raw_values).reshape(-1).astype(np.int64, copy=False)
+
+        if len(self._keys) == 0:
+            return np.full(len(raw_values), -1, dtype=np.int32)
+
+        if self._dense is not None:
+            offsets = raw_values - self._minimum
+            in_range = (offsets >= 0) & (offsets < len(self._dense))
+
+            result = np.full(len(raw_values), -1, dtype=np.int32)
+            result[in_range] = self._dense[offsets[in_range]]
+
+            return result
+
+        positions = np.searchsorted(self._keys, raw_values)
+        np.minimum(positions, len(self._keys) - 1, out=positions)
+
+        return np.where(self._keys[positions] == raw_values, self._codes[positions], np.int32(-1))
+
+    pass
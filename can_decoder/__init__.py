@@ -1,27 +1,53 @@
+import importlib
+
 from can_decoder.exceptions import *
-from can_decoder.iterator import IteratorDecoder, DecodedSignal
+from can_decoder.iterator import IteratorDecoder, DecodedFrame, DecodedSignal, SignalStateCache
 from can_decoder.warnings import *
 
 from can_decoder.Frame import Frame
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
-
-try:
-    from can_decoder.dataframe import DataFrameDecoder
-except ModuleNotFoundError:
-    pass
-
-try:
-    import warnings
-
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=DeprecationWarning)
-        warnings.filterwarnings("ignore", category=SyntaxWarning)
-        
-        from can_decoder.DBCLoader import load_dbc
-except ModuleNotFoundError:
-    pass
+from can_decoder.SignalLocation import SignalLocation
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.SignalDBSerializer import SignalDBSerializer
+from can_decoder.DecodeStatistics import DecodeStatistics
+from can_decoder.DecodeProfiler import DecodeProfiler
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
 
 from ._version import get_versions
 __version__ = get_versions()["version"]
 del get_versions
+
+# Members loaded on first access, keeping the package import fast. The DataFrame decoders require pandas, which is only
+# imported when DataFrameDecoder is used. The asynchronous and listener decoders are loaded by the iterator package.
+_lazy_members = {
+    "AsyncIteratorDecoder": "can_decoder.iterator",
+    "DataFrameDecoder": "can_decoder.dataframe",
+    "ListenerDecoder": "can_decoder.iterator",
+    "load_dbc": "can_decoder.DBCLoader",
+    "load_dbcs": "can_decoder.DBCLoader",
+}
+
+
+def __getattr__(name: str):
+    module_name = _lazy_members.get(name, None)
+    
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        # Optional dependency not installed.
+        raise AttributeError("module {!r} has no attribute {!r} ({})".format(__name__, name, e)) from e
+    
+    result = getattr(module, name)
+    
+    # Cache on the module, such that later lookups skip this function.
+    globals()[name] = result
+    
+    return result
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_lazy_members.keys()))
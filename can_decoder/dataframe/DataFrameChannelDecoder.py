@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from pandas.api.types import union_categoricals
+
+from can_decoder.ChannelDecoderBase import ChannelDecoderBase
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.dataframe.DataFrameDecoder import DataFrameDecoder
+
+
+class DataFrameChannelDecoder(ChannelDecoderBase):
+    """Decoder for data from several CAN buses, created by :py:class:`DataFrameDecoder` when supplied with a
+    :py:class:`can_decoder.ChannelSignalDB.ChannelSignalDB`.
+    
+    The rows are routed on the channel column first, in a single vectorized pass. The rows of each channel are then
+    decoded by a decoder for the database of that channel, which looks up the frames by ID (or PGN for J1939) in turn.
+    Each row is thus decoded once, using the rules of its own bus only.
+    """
+    def __init__(self, conversion_rules: ChannelSignalDB):
+        """Create a new decoder using the supplied rules.
+        
+        :param conversion_rules:    Rules of each channel.
+        """
+        decoders = {channel: DataFrameDecoder(db) for channel, db in conversion_rules.channels.items()}
+        
+        super(DataFrameChannelDecoder, self).__init__(conversion_rules, decoders)
+        return
+    
+    def decode_frame(self, df: pd.DataFrame, *args, **kwargs) -> pd.DataFrame:
+        """Decode a dataframe with data from several CAN buses. Accepts the same arguments as
+        :py:meth:`can_decoder.dataframe.DataFrameDecoder.DataFrameDecoder.decode_frame`, and in addition:
+        
+        * **channel_column** - Name of the column holding the bus channel of each row. Defaults to "BusChannel". The
+          channel is added to the output in a column of the same name.
+        
+        Rows from channels without a database are skipped, and counted in the statistics as unknown channels.
+        
+        :param df: Dataframe to decode
+        :return: Dataframe
+        """
+        channel_column = kwargs.pop("channel_column", "BusChannel")
+        
+        if channel_column not in df.columns.values:
+            raise ValueError("Missing {} column in input data".format(channel_column))
+        
+        self._statistics = kwargs.get("statistics", None)
+        self._diagnostics = DecodeDiagnostics()
+        columns_to_drop = set(kwargs.get("columns_to_drop", []))
+        
+        # Route all rows at once. Each distinct channel value is given a code, and the rows are grouped on the codes.
+        # Rows without a channel get the code -1 in all versions of pandas, and are counted as an unknown channel None.
+        codes, channels = pd.factorize(df[channel_column])
+        channels = [None] + list(channels)
+        codes = codes + 1
+        
+        order = np.argsort(codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(codes[order])) + 1
+        
+        results = []
+        
+        for rows in np.split(order, bounds):
+            if len(rows) == 0:
+                continue
+            
+            channel = channels[codes[rows[0]]]
+            decoder = self._get_channel_decoder(channel, len(rows))
+            
+            if decoder is None:
+                continue
+            
+            result = decoder.decode_frame(df.iloc[rows], *args, **kwargs)
+            self._diagnostics.update(result.attrs["diagnostics"])
+            
+            if len(result) != 0:
+                if channel_column not in columns_to_drop:
+                    result[channel_column] = channel
+                
+                results.append(result)
+        
+        if len(results) != 0:
+            result = pd.concat(results)
+            
+            if "Label" in result.columns:
+                # The label categories differ between the channels.
+                result["Label"] = union_categoricals([entry["Label"] for entry in results])
+            
+            result = result.sort_index(kind="stable")
+        else:
+            result = pd.DataFrame()
+        
+        result.attrs["diagnostics"] = self._diagnostics
+        self._report_diagnostics()
+        
+        return result
+    
+    pass
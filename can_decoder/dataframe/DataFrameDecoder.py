@@ -1,11 +1,18 @@
+import time
+
 from abc import abstractmethod, ABCMeta
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
 from can_decoder.DecoderBase import DecoderBase
+from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
+from can_decoder.ValueTable import ValueTable
+from can_decoder.support import get_change_mask
 
 
 class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
@@ -15,8 +22,17 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
     registered sub-classes. An implementation is supplied for the generic case, as well as for J1939. To register
     decoders for other protocols, inherit from this class and implement
     :py:meth:`can_decoder.DecoderBase.DecoderBase.get_supported_protocols`.
+    
+    Rules for several CAN buses, as a :py:class:`can_decoder.ChannelSignalDB.ChannelSignalDB`, select the
+    :py:class:`can_decoder.dataframe.DataFrameChannelDecoder.DataFrameChannelDecoder`.
     """
     def __new__(cls, conversion_rules: SignalDB, *args, **kwargs):
+        if isinstance(conversion_rules, ChannelSignalDB):
+            # Rules per bus channel, route each channel to a decoder for its protocol.
+            from can_decoder.dataframe.DataFrameChannelDecoder import DataFrameChannelDecoder
+            
+            return DataFrameChannelDecoder(conversion_rules, *args, **kwargs)
+        
         # Examine the protocol field.
         dbc_protocol = conversion_rules.protocol
         
@@ -50,7 +66,16 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
         
         self._common_time_base = False
         self._columns_to_drop = set([])
+        self._change_only = False
+        self._deadband = 0.0
+        self._max_interval = None  # type: Optional[float]
         self._result = []  # type: List[pd.DataFrame]
+        
+        # Labels of the value descriptions in the output of a call, shared by all signals.
+        self._labels = False
+        self._label_categories = []  # type: List[str]
+        self._label_category_codes = {}  # type: Dict[str, int]
+        self._label_code_maps = {}  # type: Dict[int, Tuple[ValueTable, np.ndarray]]
         return
 
     @classmethod
@@ -89,6 +114,8 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
         
         :param df:      Signal DataFrame with all fields.
         """
+        if self._change_only:
+            df = self._filter_changes(df)
         
         # Determine which fields to show, and drop the remaining.
         columns_in_frame = set(df.columns)
@@ -98,6 +125,87 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
         
         return
     
+    def _get_label_column(self, signal: Signal, signal_data_raw: np.ndarray) -> Optional[np.ndarray]:
+        """Get the label codes of a signal for the Label column, if enabled. Must be called before converting the raw
+        values to physical values.
+        
+        :param signal:          Signal the values belong to.
+        :param signal_data_raw: Raw values of the signal.
+        :return:                Codes into the label categories of the output, -1 for values without a label. None if
+                                labels are disabled.
+        """
+        if not self._labels:
+            return None
+        
+        table, codes = self._get_label_codes(signal, signal_data_raw)
+        
+        # Translate the codes of the value table to codes of the output, once per table. The trailing -1 keeps
+        # values without a label at -1.
+        entry = self._label_code_maps.get(id(table), None)
+        
+        if entry is not None and entry[0] is table:
+            code_map = entry[1]
+        else:
+            output_codes = []
+            
+            for label in table.categories:
+                code = self._label_category_codes.get(label, None)
+                
+                if code is None:
+                    code = len(self._label_categories)
+                    self._label_category_codes[label] = code
+                    self._label_categories.append(label)
+                
+                output_codes.append(code)
+            
+            code_map = np.array(output_codes + [-1], dtype=np.int32)
+            self._label_code_maps[id(table)] = (table, code_map)
+        
+        return code_map[codes]
+    
+    def _filter_changes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove the rows of a signal DataFrame which do not report a change, see
+        :py:func:`can_decoder.support.get_change_mask`. Each CAN ID is handled as a separate series.
+        
+        :param df:      Signal DataFrame with all fields, in chronological order.
+        :return:        DataFrame with the remaining rows.
+        """
+        if len(df) == 0:
+            return df
+        
+        values = df["Physical Value"].to_numpy()
+        can_ids = df["CAN ID"].to_numpy()
+        time_stamps = None
+        max_interval = None
+        
+        if self._max_interval is not None:
+            if not isinstance(df.index, pd.DatetimeIndex):
+                raise ValueError("A maximum interval requires a DatetimeIndex")
+            
+            # Work in integer nanoseconds, like the iterator decoders.
+            time_stamps = ((df.index - df.index[0]) // pd.Timedelta(1, "ns")).to_numpy(dtype=np.int64)
+            max_interval = self._max_interval * 1E9
+        
+        if np.all(can_ids == can_ids[0]):
+            mask = get_change_mask(values, time_stamps, self._deadband, max_interval)
+        else:
+            mask = np.zeros(len(df), dtype=bool)
+            
+            # Group the rows on the CAN ID in a single sort. The stable sort keeps the rows of each ID in chronological
+            # order.
+            order = np.argsort(can_ids, kind="stable")
+            _, starts = np.unique(can_ids[order], return_index=True)
+            
+            for indices in np.split(order, starts[1:]):
+                mask[indices] = get_change_mask(
+                    values[indices],
+                    None if time_stamps is None else time_stamps[indices],
+                    self._deadband,
+                    max_interval
+                )
+        
+        return df[mask]
+    
     def decode_frame(self, df: pd.DataFrame, *args, **kwargs) -> pd.DataFrame:
         """Decode a dataframe in bulk using the loaded rules.
         
@@ -108,6 +216,19 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
         * **DataBytes** - A Python list of integers, where each integer has the value of the corresponding byte in the
           payload. Expects the first byte in the list to be the first byte on the wire.
         
+        Set **change_only** to only keep the values of each signal which differ from the last kept value by more than
+        **deadband** (default 0). With **max_interval** in seconds, a value is also kept once that time has passed since
+        the last kept value, which requires a DatetimeIndex. Changes are tracked within a single call.
+        
+        Set **labels** to add a categorical **Label** column, holding the value description (VAL_ in DBC files) of each
+        raw value. Values without a description are NaN.
+        
+        Supply a :py:class:`can_decoder.DecodeStatistics.DecodeStatistics` as **statistics** to collect statistics for
+        the call. Missing or mismatched data is then counted instead of issuing warnings.
+        
+        Data errors are collected in a :py:class:`can_decoder.DecodeDiagnostics.DecodeDiagnostics`, available as
+        :code:`attrs["diagnostics"]` of the result, and reported in a single summary warning.
+        
         :param df: Dataframe to decode
         :return: Dataframe 
         """
@@ -124,6 +245,21 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
         # Read options. Determine which columns to drop.
         self._columns_to_drop = set(kwargs.get("columns_to_drop", []))
         
+        # Determine if only changes should be reported.
+        self._change_only = kwargs.get("change_only", False)
+        self._deadband = kwargs.get("deadband", 0.0)
+        self._max_interval = kwargs.get("max_interval", None)
+        
+        # Determine if labels should be added.
+        self._labels = kwargs.get("labels", False) and "Label" not in self._columns_to_drop
+        self._label_categories = []
+        self._label_category_codes = {}
+        self._label_code_maps = {}
+        
+        # Determine if statistics should be collected.
+        self._statistics = kwargs.get("statistics", None)
+        self._diagnostics = DecodeDiagnostics()
+        
         # Handle output format.
         self._common_time_base = kwargs.pop("common_time_base", False)
         
@@ -133,15 +269,46 @@ class DataFrameDecoder(DecoderBase, metaclass=ABCMeta):
             self._result = []
             
         # Delegate decoding to specialization.
+        start_time = time.perf_counter()
+        
         self._decode_frame(df, *args, **kwargs)
+        
+        decode_time = time.perf_counter()
 
         if len(self._result) != 0:
             result = pd.concat(self._result)
+            
+            if self._labels:
+                result["Label"] = pd.Categorical.from_codes(
+                    result["Label"].to_numpy(), categories=self._label_categories
+                )
+            
             result = result.sort_index()
         else:
             result = pd.DataFrame()
         
+        if self._statistics is not None:
+            self._statistics.frames_seen += len(df)
+            self._statistics.phase_times["decode"] += decode_time - start_time
+            self._statistics.phase_times["output"] += time.perf_counter() - decode_time
+        
+        result.attrs["diagnostics"] = self._diagnostics
+        self._report_diagnostics()
+        
         return result
+    
+    def _count_frames(self, raw_ids: np.ndarray, supported: np.ndarray) -> None:
+        """Update the statistics with the number of decoded frames and the unknown IDs.
+        
+        :param raw_ids:     Fused IDs of all frames in the input.
+        :param supported:   Boolean array, True for the frames with a match in the database.
+        """
+        self._statistics.frames_decoded += int(np.count_nonzero(supported))
+        
+        unique_ids, counts = np.unique(raw_ids[~supported], return_counts=True)
+        self._statistics.unknown_ids.update(dict(zip(unique_ids.tolist(), counts.tolist())))
+        
+        return
 
     @abstractmethod
     def _decode_frame(self, df: pd.DataFrame, *args, **kwargs) -> None:
@@ -32,17 +32,8 @@ class DataFrameGenericDecoder(DataFrameDecoder):
         :param index:
         :param multiplexer:
         """
-        # Find corresponding multiplexer values.
-        demultiplexed_ids = self._decode_signal_raw(multiplexer, frame_data)
-        
-        # Bundle these into unique IDs.
-        unique_multiplexed_ids = np.unique(demultiplexed_ids)
-        
-        # Find signals for each ID.
-        for unique_id in unique_multiplexed_ids:
-            indices = np.where(demultiplexed_ids == unique_id)[0]
-            signals = multiplexer.signals.get(unique_id, [])
-            
+        # Split the rows on the multiplexer values, in a single pass.
+        for signals, indices in self._demultiplex(multiplexer, frame_data):
             # Shared variables amongs all signals for this ID.
             signal_data = frame_data[indices, :]
             signal_index = index[indices]
@@ -71,11 +62,16 @@ class DataFrameGenericDecoder(DataFrameDecoder):
         return
     
     def _decode(self, signal, signal_data, signal_index, signal_ids):
-        signal_data_raw = self._decode_signal_raw(signal, signal_data)
+        token = None if self._profiler is None else self._profiler.start()
+        
+        signal_data_raw = self._decode_signal_raw(signal, signal_data, self._statistics, self._diagnostics)
         
         if signal_data_raw.size == 0:
+            if token is not None:
+                self._profiler.add_signal(signal, len(signal_index), token)
             return
         
+        label_codes = self._get_label_column(signal, signal_data_raw)
         signal_data = self._decode_signal_raw_to_phys(signal, signal_data_raw)
     
         # Create a resulting series.
@@ -84,9 +80,15 @@ class DataFrameGenericDecoder(DataFrameDecoder):
         signal_result["Signal"] = signal.name
         signal_result["Raw Value"] = signal_data_raw
         signal_result["Physical Value"] = signal_data
+        
+        if label_codes is not None:
+            signal_result["Label"] = label_codes
 
         self._add_series(signal_result)
         
+        if token is not None:
+            self._profiler.add_signal(signal, len(signal_index), token)
+        
         return
     
     def _decode_frame(self, df: pd.DataFrame, *args, **kwargs):
@@ -103,7 +105,14 @@ class DataFrameGenericDecoder(DataFrameDecoder):
             if frame is not None:
                 supported_ids[unique_id] = frame
         
+        if self._statistics is not None:
+            self._count_frames(raw_ids, np.isin(raw_ids, list(supported_ids.keys())))
+        
+        profiler = self._profiler
+        
         for unique_id, frame in supported_ids.items():
+            token = None if profiler is None else profiler.start()
+            
             # Determine which data indices to use.
             id_indices = np.where(raw_ids == unique_id)[0]
             
@@ -133,6 +142,9 @@ class DataFrameGenericDecoder(DataFrameDecoder):
                         signal_index=frame_index
                     )
                 pass
+            
+            if token is not None:
+                profiler.add_frame(frame, len(id_indices), token)
         
         return
     
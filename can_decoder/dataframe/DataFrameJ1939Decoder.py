@@ -1,7 +1,6 @@
 import numpy as np
 import pandas as pd
 
-import warnings
 
 from typing import List, Optional
 
@@ -9,8 +8,7 @@ from can_decoder.dataframe.DataFrameDecoder import DataFrameDecoder
 from can_decoder.Frame import Frame
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
-from can_decoder.support import get_j1939_limit
-from can_decoder.warnings.DataSizeMismatchWarning import DataSizeMismatchWarning
+from can_decoder.support import get_j1939_limit, get_j1939_pgn
 
 
 class DataFrameJ1939Decoder(DataFrameDecoder):
@@ -33,15 +31,7 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
     
     @staticmethod
     def _calculate_pgn(frame_id):
-        pgn = (frame_id & 0x03FFFF00) >> 8
-    
-        pgn_f = (pgn & 0xFF00) >> 8
-        pgn_s = pgn & 0x00FF
-    
-        if pgn_f < 240:
-            pgn &= 0xFFFFFF00
-        
-        return pgn
+        return get_j1939_pgn(frame_id)
     
     @classmethod
     def get_supported_protocols(cls) -> Optional[List[str]]:
@@ -96,17 +86,8 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
         :param index:
         :param multiplexer:
         """
-        # Find corresponding multiplexer values.
-        demultiplexed_ids = self._decode_signal_raw(multiplexer, frame_data)
-    
-        # Bundle these into unique IDs.
-        unique_multiplexed_ids = np.unique(demultiplexed_ids)
-    
-        # Find signals for each ID.
-        for unique_id in unique_multiplexed_ids:
-            indices = np.where(demultiplexed_ids == unique_id)[0]
-            signals = multiplexer.signals.get(unique_id, [])
-        
+        # Split the rows on the multiplexer values, in a single pass.
+        for signals, indices in self._demultiplex(multiplexer, frame_data):
             # Shared variables amongs all signals for this ID.
             signal_data = frame_data[indices, :]
             signal_index = index[indices]
@@ -147,17 +128,26 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
             frame: Frame,
             ignore_invalid: bool
     ):
+        token = None if self._profiler is None else self._profiler.start()
+        
         # Get the raw representation.
-        signal_data_raw = self._decode_signal_raw(signal, signal_data)
+        signal_data_raw = self._decode_signal_raw(signal, signal_data, self._statistics, self._diagnostics)
     
         # Determine which measurements are invalid and need to be removed.
         valid_indices = np.array(range(0, len(signal_data_raw)), dtype=np.uint64)
         if ignore_invalid and not signal.is_signed:
             limit = get_j1939_limit(signal.size)
             valid_indices = np.argwhere(signal_data_raw < limit)[:, 0]
+            
+            invalid_count = len(signal_data_raw) - len(valid_indices)
+            
+            if self._statistics is not None and signal_data_raw.size != 0 and invalid_count > 0:
+                self._statistics.invalid_values[signal.name] += invalid_count
     
         if valid_indices.shape[0] == 0:
             # Early skip if no valid data is located.
+            if token is not None:
+                self._profiler.add_signal(signal, len(signal_index), token)
             return
     
         # Create a new DataFrame to contain the results.
@@ -165,6 +155,7 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
     
         # Get raw and decoded data.
         signal_data_raw = signal_data_raw[valid_indices]
+        label_codes = self._get_label_column(signal, signal_data_raw)
         signal_data = self._decode_signal_raw_to_phys(signal, signal_data_raw)
     
         # Add custom fields.
@@ -174,8 +165,14 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
         result["Signal"] = signal.name
         result["Raw Value"] = signal_data_raw
         result["Physical Value"] = signal_data
+        
+        if label_codes is not None:
+            result["Label"] = label_codes
     
         self._add_series(result)
+        
+        if token is not None:
+            self._profiler.add_signal(signal, len(signal_index), token)
     
         return
     
@@ -189,6 +186,7 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
         # Remove any IDs which are not extended (Cannot be J1939 data).
         extended_ids = np.where(raw_ids & np.uint32(0x80000000))[0]
         
+        all_raw_ids = raw_ids
         raw_ids = raw_ids[extended_ids]
         raw_index = df.index[extended_ids]
         
@@ -202,9 +200,17 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
         
         raw_pgns >>= 8
         
+        if self._statistics is not None:
+            supported = np.zeros(len(all_raw_ids), dtype=bool)
+            supported[extended_ids] = np.isin(raw_pgns, list(self._frames.keys()))
+            
+            self._count_frames(all_raw_ids, supported)
+        
         # Find a list of all unique PGNs.
         unique_pgns = np.unique(raw_pgns)
         
+        profiler = self._profiler
+        
         # Extract and decode each PGN in turn.
         for pgn in unique_pgns:
             # Determine if this PGN is supported.
@@ -214,6 +220,8 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
                 # Can't decode this message, continue.
                 continue
             
+            token = None if profiler is None else profiler.start()
+            
             # Extract the correct indices, and translate from the extended IDs to the full dataframe.
             id_indices = np.where(raw_pgns == pgn)[0]
             index = raw_index[id_indices]
@@ -222,7 +230,15 @@ class DataFrameJ1939Decoder(DataFrameDecoder):
             try:
                 self._decode_frame_with_well_formed_data(reduced_df, frame, raw_ids, id_indices)
             except ValueError as e:
-                warnings.warn("Could not shape data for PGN {}".format(pgn), DataSizeMismatchWarning)
+                # The data could not be combined into a single array, so none of the signals are decoded.
+                for signal in frame.leaf_signals():
+                    if self._statistics is not None:
+                        self._statistics.size_mismatches[signal.name] += len(index)
+                    
+                    self._diagnostics.size_mismatches[signal.name] += len(index)
+            
+            if token is not None:
+                profiler.add_frame(frame, len(index), token)
             
             pass
         
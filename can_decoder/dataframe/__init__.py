@@ -1,3 +1,4 @@
 from can_decoder.dataframe.DataFrameDecoder import DataFrameDecoder
 from can_decoder.dataframe.DataFrameGenericDecoder import DataFrameGenericDecoder
 from can_decoder.dataframe.DataFrameJ1939Decoder import DataFrameJ1939Decoder
+from can_decoder.dataframe.DataFrameChannelDecoder import DataFrameChannelDecoder
@@ -0,0 +1,171 @@
+import asyncio
+
+from collections import deque
+from concurrent.futures import Executor
+from typing import AsyncIterable, List, Optional
+
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.SignalDB import SignalDB
+from can_decoder.iterator.DecodedSignal import DecodedSignal
+from can_decoder.iterator.IteratorDecoder import IteratorDecoder
+
+
+# Marker placed in the record queue once the wrapped source is exhausted (or has failed).
+_end_of_records = object()
+
+
+class AsyncIteratorDecoder(object):
+    """Asynchronous counterpart to :py:class:`can_decoder.iterator.IteratorDecoder.IteratorDecoder`, for use with
+    :code:`async for` over an asynchronous record source (e.g. records parsed from an asyncio socket reader).
+
+    Records are read from the source by a background task. Whenever decoded signals are requested, all records which
+    have arrived in the meantime are decoded as a single micro-batch, up to :code:`batch_size` records. Batches of at
+    least :code:`executor_threshold` records are decoded in an executor, in order to not block the event loop.
+
+    If requesting the next signal fails or is cancelled, the background task is cancelled as well and the iteration
+    ends.
+    """
+    def __init__(
+            self,
+            wrapped: AsyncIterable,
+            conversion_rules: SignalDB,
+            batch_size: int = 1024,
+            executor_threshold: int = 256,
+            executor: Optional[Executor] = None,
+            *args,
+            **kwargs
+    ):
+        """Create a new asynchronous decoder using the supplied rules.
+
+        :param wrapped:             Asynchronous iterable yielding raw records.
+        :param conversion_rules:    Rules to utilize when doing conversions.
+        :param batch_size:          Maximum number of records to decode in a single batch.
+        :param executor_threshold:  Batches with at least this many records are decoded in the executor.
+        :param executor:            Executor to use for large batches. None selects the default executor of the loop.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        # Let the synchronous decoder handle the protocol selection and the actual decoding.
+        self._decoder = IteratorDecoder((), conversion_rules, *args, **kwargs)
+
+        self._wrapped = wrapped
+        self._batch_size = batch_size
+        self._executor_threshold = executor_threshold
+        self._executor = executor
+
+        self._records = None  # type: Optional[asyncio.Queue]
+        self._reader = None  # type: Optional[asyncio.Task]
+        self._exception = None  # type: Optional[BaseException]
+        self._exhausted = False
+        self._pending = deque()
+        return
+
+    @property
+    def diagnostics(self) -> DecodeDiagnostics:
+        """Data errors collected while decoding. See :py:attr:`can_decoder.DecoderBase.DecoderBase.diagnostics`.
+        """
+        return self._decoder.diagnostics
+
+    def __aiter__(self) -> "AsyncIteratorDecoder":
+        return self
+
+    async def __anext__(self) -> DecodedSignal:
+        try:
+            while len(self._pending) == 0:
+                batch = await self._read_batch()
+
+                if len(batch) >= self._executor_threshold:
+                    loop = asyncio.get_running_loop()
+                    decoded = await loop.run_in_executor(self._executor, self._decoder._decode_records, batch)
+                else:
+                    decoded = self._decoder._decode_records(batch)
+
+                self._pending.extend(decoded)
+        except BaseException:
+            # Do not leave the background task reading from the source once the iteration has ended.
+            self._cancel_reader()
+            raise
+
+        return self._pending.popleft()
+
+    async def aclose(self) -> None:
+        """Stop reading from the wrapped source and discard any records not yet decoded.
+        """
+        reader = self._reader
+        self._cancel_reader()
+
+        if reader is not None:
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
+
+        self._pending.clear()
+        return
+
+    def _cancel_reader(self) -> None:
+        """Cancel the background task, if still running, and end the iteration.
+        """
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+
+        self._exhausted = True
+        return
+
+    async def _read_source(self) -> None:
+        """Background task moving records from the wrapped source to the record queue.
+        """
+        try:
+            async for record in self._wrapped:
+                await self._records.put(record)
+        except Exception as e:
+            # Re-raised in the consumer once all records read before the failure have been decoded.
+            self._exception = e
+
+        await self._records.put(_end_of_records)
+        return
+
+    async def _read_batch(self) -> List:
+        """Wait for at least one record, then collect all records already available, up to the batch size.
+
+        :return:    List of raw records. Never empty.
+        """
+        if self._exhausted:
+            self._raise_end()
+
+        if self._reader is None:
+            # Bound the queue to apply backpressure on the source if decoding falls behind.
+            self._records = asyncio.Queue(maxsize=self._batch_size)
+            self._reader = asyncio.get_running_loop().create_task(self._read_source())
+
+        batch = []
+        record = await self._records.get()
+
+        while True:
+            if record is _end_of_records:
+                self._exhausted = True
+                break
+
+            batch.append(record)
+
+            if len(batch) >= self._batch_size or self._records.empty():
+                break
+
+            record = self._records.get_nowait()
+
+        if len(batch) == 0:
+            self._raise_end()
+
+        return batch
+
+    def _raise_end(self) -> None:
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+        # Report all data errors at once, at the end of the iteration.
+        self._decoder._report_diagnostics()
+        raise StopAsyncIteration
+
+    pass
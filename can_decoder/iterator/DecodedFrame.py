@@ -0,0 +1,12 @@
+from collections import namedtuple
+
+
+DecodedFrame = namedtuple(
+    "DecodedFrame", [
+        "TimeStamp",
+        "CanID",
+        "Signals",
+        "SignalValuesRaw",
+        "SignalValuesPhysical",
+    ]
+)
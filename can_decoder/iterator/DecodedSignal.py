@@ -1,5 +1,7 @@
 from collections import namedtuple
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 
 
 _decoded_signal_named_tuple = namedtuple(
@@ -13,9 +15,36 @@ _decoded_signal_named_tuple = namedtuple(
 )
 
 
+def time_stamp_to_datetime(time_stamp) -> datetime:
+    """Convert a timestamp in nanoseconds since epoch to a timezone aware datetime.
+    
+    :param time_stamp:  Nanoseconds since epoch.
+    :return:            Corresponding datetime in UTC.
+    """
+    return datetime.utcfromtimestamp(time_stamp * 1E-9).replace(tzinfo=timezone.utc)
+
+
 class DecodedSignal(_decoded_signal_named_tuple):
+    def as_datetime(self) -> datetime:
+        """Get the timestamp as a datetime, regardless of the timestamp format selected when decoding.
+        
+        :return:    Timestamp as a timezone aware datetime.
+        """
+        time_stamp = self.TimeStamp
+        
+        if isinstance(time_stamp, datetime):
+            return time_stamp
+        elif isinstance(time_stamp, np.datetime64):
+            time_stamp = time_stamp.astype("datetime64[ns]").astype(np.int64)
+        
+        return time_stamp_to_datetime(time_stamp)
+    
     def __eq__(self, other):
-        if (self.TimeStamp - other.TimeStamp) != timedelta(0):
+        if isinstance(self.TimeStamp, datetime):
+            if (self.TimeStamp - other.TimeStamp) != timedelta(0):
+                return False
+        elif self.TimeStamp != other.TimeStamp:
+            # Timestamps which have not been converted, e.g. from scalar decoding.
             return False
         
         if self.CanID != other.CanID:
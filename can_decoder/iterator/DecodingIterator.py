@@ -0,0 +1,319 @@
+import queue
+import threading
+import time
+
+from abc import abstractmethod, ABCMeta
+from collections import deque
+from typing import Iterable, List, Optional, Sequence
+
+from can_decoder.DecodeStatistics import DecodeStatistics
+from can_decoder.Frame import Frame
+from can_decoder.iterator.DecodedSignal import DecodedSignal
+
+
+# Marker placed in the read-ahead queue once the wrapped iterator is exhausted.
+_end_of_records = object()
+
+
+def _read_records(wrapped_iter, batch_size: int, max_delay: Optional[float], batch: Optional[List] = None) -> List:
+    """Read up to a full batch of records from an iterator, or less if the maximum delay is exceeded.
+    
+    :param wrapped_iter:    Iterator to read from.
+    :param batch_size:      Maximum number of records to read.
+    :param max_delay:       Maximum time in seconds since the first record was read. Only checked when a record is read.
+    :param batch:           Empty list to read the records into, which keeps the records read if the iterator fails.
+    :return:                List of raw records. Never empty.
+    :raises StopIteration:  If the iterator is exhausted before any record is read.
+    """
+    if batch is None:
+        batch = []
+    
+    deadline = None
+    
+    while len(batch) < batch_size:
+        try:
+            data = wrapped_iter.__next__()
+        except StopIteration:
+            if len(batch) == 0:
+                raise
+            break
+        
+        batch.append(data)
+        
+        if max_delay is not None:
+            now = time.monotonic()
+            
+            if deadline is None:
+                deadline = now + max_delay
+            elif now >= deadline:
+                break
+    
+    return batch
+
+
+def _read_ahead(wrapped_iter, batch_size: int, max_delay: Optional[float], records: queue.Queue, stop: threading.Event):
+    """Thread target reading batches of records into a bounded queue, until the iterator is exhausted, fails or the
+    stop event is set. The queue receives lists of records, followed by either the end marker or the exception raised by
+    the iterator.
+    
+    Only holds references to the objects it needs, such that the decoder itself can be garbage collected.
+    """
+    while not stop.is_set():
+        batch = []
+        
+        try:
+            items = [_read_records(wrapped_iter, batch_size, max_delay, batch)]
+        except StopIteration:
+            items = [_end_of_records]
+        except Exception as e:
+            # Pass on the records read before the failure first.
+            items = [batch, e] if len(batch) > 0 else [e]
+        
+        for item in items:
+            # Block while the queue is full, but keep checking for a shutdown.
+            while not stop.is_set():
+                try:
+                    records.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+        
+        if not isinstance(items[-1], list):
+            break
+    
+    return
+
+
+class DecodingIterator(object, metaclass=ABCMeta):
+    """Base class for the iterator decoders, reading raw records from a wrapped iterable and yielding the decoded
+    signals. Records are read one at a time or in batches, optionally in a background thread, and passed to
+    :py:meth:`_decode_record` or :py:meth:`_decode_batch` of the subclass, which queue the decoded signals in the FIFO.
+    """
+    def __init__(
+            self,
+            wrapped: Iterable,
+            batch_size: int = 1,
+            max_delay: Optional[float] = None,
+            scalar: bool = False,
+            read_ahead: int = 0,
+            statistics: Optional[DecodeStatistics] = None
+    ):
+        """Set up the reading of records. See :py:class:`can_decoder.iterator.IteratorDecoder.IteratorDecoder` for the
+        parameters.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        elif read_ahead < 0:
+            raise ValueError("Read ahead must not be negative")
+        elif scalar and batch_size > 1:
+            raise ValueError("Scalar decoding can not be combined with batches")
+        
+        self._wrapped = wrapped
+        self._wrapped_iter = None
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._scalar = scalar
+        self._statistics = statistics
+        
+        # Read-ahead thread and the bounded queue of record batches it fills, created when iteration starts.
+        self._read_ahead = read_ahead
+        self._reader = None  # type: Optional[threading.Thread]
+        self._reader_queue = None  # type: Optional[queue.Queue]
+        self._reader_stop = None  # type: Optional[threading.Event]
+        self._reader_done = False
+        
+        # The iterator is only consumed from a single thread, so a plain deque suffices as FIFO.
+        self._signal_fifo = deque()
+        return
+    
+    def __iter__(self) -> Iterable[DecodedSignal]:
+        self._wrapped_iter = self._wrapped.__iter__()
+        self._diagnostics.reset()
+        
+        if self._read_ahead > 0:
+            self.close()
+            
+            self._reader_queue = queue.Queue(maxsize=self._read_ahead)
+            self._reader_stop = threading.Event()
+            self._reader_done = False
+            self._reader = threading.Thread(
+                target=_read_ahead,
+                args=(self._wrapped_iter, self._batch_size, self._max_delay, self._reader_queue, self._reader_stop),
+                name="IteratorDecoder read-ahead",
+                daemon=True
+            )
+            self._reader.start()
+        
+        return self
+    
+    def close(self) -> None:
+        """Stop the read-ahead thread, if any, and wait for it to finish. Records not yet decoded are discarded, and
+        the iteration ends.
+        """
+        if self._reader is None:
+            return
+        
+        self._reader_stop.set()
+        
+        # Unblock the thread if it is waiting for room in the queue.
+        try:
+            while True:
+                self._reader_queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        self._reader.join()
+        self._reader = None
+        self._reader_done = True
+        self._signal_fifo.clear()
+        return
+    
+    def __del__(self):
+        # Let a running read-ahead thread exit, without waiting for it.
+        if getattr(self, "_reader_stop", None) is not None:
+            self._reader_stop.set()
+        
+        return
+    
+    @abstractmethod
+    def _decode_record(self, data, locate: bool = False) -> Optional[Frame]:
+        """Decode a single raw record, queueing any decoded signals in the internal FIFO.
+        
+        :param data:    Raw record, in any format supported by the record adapter.
+        :param locate:  Locate the frame matching the record, even if not required for statistics or profiling.
+        :return:        The frame matching the record if located, otherwise None.
+        """
+        raise NotImplementedError()  # pragma: no cover
+    
+    @abstractmethod
+    def _decode_batch(self, records: Sequence) -> None:
+        """Decode a batch of raw records, queueing any decoded signals in the internal FIFO in the same order as record
+        by record decoding would.
+        
+        :param records: Raw records, in any format supported by the record adapter.
+        """
+        raise NotImplementedError()  # pragma: no cover
+    
+    @abstractmethod
+    def _report_diagnostics(self) -> None:
+        """Report the data errors collected during the iteration, called once the wrapped iterator is exhausted.
+        """
+        raise NotImplementedError()  # pragma: no cover
+    
+    def _decode_records(self, records: Sequence) -> List[DecodedSignal]:
+        """Decode a batch of records in one go, independent of the wrapped iterator.
+        
+        :param records: Raw records to decode.
+        :return:        List of all signals decoded from the records, in order.
+        """
+        start_time = time.perf_counter()
+        
+        if self._scalar:
+            for data in records:
+                self._decode_record(data)
+        else:
+            self._decode_batch(records)
+        
+        if self._statistics is not None:
+            self._statistics.phase_times["decode"] += time.perf_counter() - start_time
+        
+        return self._drain()
+    
+    def _drain(self) -> List[DecodedSignal]:
+        """Remove all decoded signals from the internal FIFO.
+        
+        :return:    List of the decoded signals, in order.
+        """
+        result = list(self._signal_fifo)
+        self._signal_fifo.clear()
+        
+        return result
+    
+    def _read_batch(self) -> List:
+        """Read up to a full batch of records from the wrapped iterator, or less if the maximum delay is exceeded.
+        
+        :return:    List of raw records. Never empty.
+        """
+        return _read_records(self._wrapped_iter, self._batch_size, self._max_delay)
+    
+    def _get_read_ahead_batch(self) -> List:
+        """Get the next batch of records from the read-ahead thread.
+        
+        :return:    List of raw records. Never empty.
+        """
+        if self._reader_done:
+            raise StopIteration()
+        
+        item = self._reader_queue.get()
+        
+        if isinstance(item, list):
+            return item
+        
+        # The thread has finished, either since the wrapped iterator is exhausted or since it failed.
+        self._reader_done = True
+        self._reader.join()
+        self._reader = None
+        
+        if item is _end_of_records:
+            raise StopIteration()
+        
+        raise item
+    
+    def _decode_read_ahead_batch(self, batch: List) -> None:
+        if self._batch_size > 1:
+            self._decode_batch(batch)
+        else:
+            self._decode_record(batch[0])
+        
+        return
+    
+    def _read_and_decode_timed(self) -> None:
+        """Read and decode the next record or batch of records, recording the time spent in each phase.
+        """
+        start_time = time.perf_counter()
+        
+        if self._read_ahead > 0:
+            batch = self._get_read_ahead_batch()
+        elif self._batch_size > 1:
+            batch = self._read_batch()
+        else:
+            batch = None
+            data = self._wrapped_iter.__next__()
+        
+        read_time = time.perf_counter()
+        
+        if batch is None:
+            self._decode_record(data)
+        elif self._read_ahead > 0:
+            self._decode_read_ahead_batch(batch)
+        else:
+            self._decode_batch(batch)
+        
+        self._statistics.phase_times["read"] += read_time - start_time
+        self._statistics.phase_times["decode"] += time.perf_counter() - read_time
+        return
+    
+    def __next__(self) -> DecodedSignal:
+        signal_fifo = self._signal_fifo
+        
+        try:
+            while not signal_fifo:
+                if self._statistics is not None:
+                    self._read_and_decode_timed()
+                elif self._read_ahead > 0:
+                    self._decode_read_ahead_batch(self._get_read_ahead_batch())
+                elif self._batch_size > 1:
+                    self._decode_batch(self._read_batch())
+                else:
+                    # Extract data from the wrapped iterator.
+                    data = self._wrapped_iter.__next__()
+                    
+                    self._decode_record(data)
+        except StopIteration:
+            # Report all data errors at once, at the end of the iteration.
+            self._report_diagnostics()
+            raise
+        
+        return signal_fifo.popleft()
+    
+    pass
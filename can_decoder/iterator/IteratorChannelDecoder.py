@@ -0,0 +1,148 @@
+import heapq
+import inspect
+
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from can_decoder.ChannelDecoderBase import ChannelDecoderBase
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.Frame import Frame
+from can_decoder.iterator.DecodingIterator import DecodingIterator
+from can_decoder.iterator.IteratorDecoder import IteratorDecoder
+from can_decoder.iterator.RecordAdapter import RecordAdapter
+
+
+# Returned for records without a channel.
+_no_channel = object()
+
+
+class IteratorChannelDecoder(ChannelDecoderBase, DecodingIterator):
+    """Decoder for records from several CAN buses, created by :py:class:`IteratorDecoder` when supplied with a
+    :py:class:`can_decoder.ChannelSignalDB.ChannelSignalDB`.
+
+    Each record is routed on its channel to a decoder for the database of that channel, which looks up the frame by ID
+    (or PGN for J1939) in turn. When decoding in batches, the records of a batch are grouped on their channels in one
+    pass, the records of each channel are decoded together, and the results of the channels are merged back into the
+    order of the records.
+    """
+    def __init__(self, wrapped: Iterable, conversion_rules: ChannelSignalDB, *args, channel_field: str = "BusChannel",
+                 **kwargs):
+        """Create a new decoder. Accepts the same arguments as :py:class:`IteratorDecoder`, and in addition:
+
+        :param channel_field:   Key or attribute name holding the bus channel in the raw records. For python-can
+                                Messages, use "channel".
+        """
+        arguments = inspect.signature(IteratorDecoder.__init__).bind(None, wrapped, conversion_rules, *args, **kwargs)
+        arguments.apply_defaults()
+
+        settings = dict(arguments.arguments)
+        del settings["self"], settings["wrapped"], settings["conversion_rules"]
+
+        if settings["record_adapter"] is None:
+            settings["record_adapter"] = RecordAdapter()
+
+        # Decoders for each channel, sharing the record adapter, statistics and diagnostics with this decoder.
+        decoders = {channel: IteratorDecoder((), db, **settings) for channel, db in conversion_rules.channels.items()}
+
+        ChannelDecoderBase.__init__(self, conversion_rules, decoders)
+        DecodingIterator.__init__(
+            self,
+            wrapped,
+            batch_size=settings["batch_size"],
+            max_delay=settings["max_delay"],
+            scalar=settings["scalar"],
+            read_ahead=settings["read_ahead"],
+            statistics=settings["statistics"]
+        )
+
+        for decoder in decoders.values():
+            decoder._diagnostics = self._diagnostics
+
+        self._record_adapter = settings["record_adapter"]
+        self._channel_field = channel_field
+        self._channel_getters = {}  # type: Dict[type, Callable]
+        return
+
+    @property
+    def record_adapter(self) -> RecordAdapter:
+        """Adapter converting the raw records, shared by the decoders of all channels.
+        """
+        return self._record_adapter
+
+    def _get_channel(self, data):
+        """Get the channel of a raw record. Records without a channel are counted as malformed.
+
+        :param data:    Raw record.
+        :return:        The channel, or _no_channel if not found.
+        """
+        getter = self._channel_getters.get(type(data), None)
+
+        if getter is None:
+            getter = itemgetter(self._channel_field) if isinstance(data, dict) else attrgetter(self._channel_field)
+            self._channel_getters[type(data)] = getter
+
+        try:
+            return getter(data)
+        except (KeyError, AttributeError, TypeError):
+            self._record_adapter.malformed_records += 1
+            return _no_channel
+
+    def _decode_record(self, data, locate: bool = False) -> Optional[Frame]:
+        channel = self._get_channel(data)
+
+        if channel is _no_channel:
+            return None
+
+        decoder = self._get_channel_decoder(channel, 1)
+
+        if decoder is None:
+            return None
+
+        frame = decoder._decode_record(data, locate=locate)
+        self._signal_fifo.extend(decoder._drain())
+        return frame
+
+    def _decode_batch(self, records: Sequence) -> None:
+        if len(records) == 0:
+            return
+        
+        # Route all records at once. Each distinct channel is given a code, and the records are grouped on the codes.
+        codes = {}  # type: Dict[Hashable, int]
+        get_channel = self._get_channel
+        record_codes = np.array([codes.setdefault(get_channel(data), len(codes)) for data in records], dtype=np.intp)
+        channels = list(codes.keys())
+        
+        order = np.argsort(record_codes, kind="stable")
+        bounds = np.flatnonzero(np.diff(record_codes[order])) + 1
+        
+        decoded = []
+        
+        for rows in np.split(order, bounds):
+            channel = channels[record_codes[rows[0]]]
+            
+            if channel is _no_channel:
+                continue
+            
+            decoder = self._get_channel_decoder(channel, len(rows))
+            
+            if decoder is None:
+                continue
+            
+            origins = []  # type: List[int]
+            decoder._decode_batch([records[i] for i in rows.tolist()], origins)
+            
+            # Tag each entry with the index of its record in the batch.
+            decoded.append(list(zip(rows[origins].tolist(), decoder._drain())))
+        
+        if len(decoded) == 1:
+            self._signal_fifo.extend(entry for _, entry in decoded[0])
+        elif len(decoded) > 1:
+            # Each channel is in record order, restore the order between the channels. The timestamps may not be in
+            # order, e.g. with clock skew between the buses, so the records are merged on their index instead.
+            self._signal_fifo.extend(entry for _, entry in heapq.merge(*decoded, key=itemgetter(0)))
+        
+        return
+    
+    pass
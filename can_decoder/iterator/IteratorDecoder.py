@@ -1,18 +1,57 @@
-import queue
-
 from abc import abstractmethod, ABCMeta
 from datetime import datetime
-from typing import Iterable
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 
+from can_decoder.ChannelSignalDB import ChannelSignalDB
+from can_decoder.DecodeStatistics import DecodeStatistics
 from can_decoder.DecoderBase import DecoderBase
+from can_decoder.Frame import Frame
+from can_decoder.MuxDispatch import MuxDispatch
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
-from can_decoder.iterator.can_record import can_record
-from can_decoder.iterator.DecodedSignal import DecodedSignal
+from can_decoder.iterator.DecodedFrame import DecodedFrame
+from can_decoder.iterator.DecodedSignal import DecodedSignal, time_stamp_to_datetime
+from can_decoder.iterator.DecodingIterator import DecodingIterator
+from can_decoder.iterator.RecordAdapter import RecordAdapter
+from can_decoder.iterator.ScalarSignal import ScalarSignal
+from can_decoder.iterator.SignalStateCache import SignalStateCache
+
+
+_new_tuple = tuple.__new__
+
+
+def _time_stamp_to_ns(time_stamp) -> int:
+    return int(time_stamp)
+
+
+def _time_stamp_to_datetime64(time_stamp) -> np.datetime64:
+    return np.datetime64(int(time_stamp), "ns")
+
+
+def _time_stamp_as_is(time_stamp):
+    return time_stamp
+
 
+# Supported output formats for the timestamps of the decoded signals.
+_time_stamp_converters = {
+    "datetime": time_stamp_to_datetime,
+    "ns": _time_stamp_to_ns,
+    "datetime64": _time_stamp_to_datetime64,
+    "raw": _time_stamp_as_is,
+}
 
-class IteratorDecoder(DecoderBase, metaclass=ABCMeta):
+
+class IteratorDecoder(DecoderBase, DecodingIterator, metaclass=ABCMeta):
     def __new__(cls, wrapped: Iterable, conversion_rules: SignalDB, *args, **kwargs):
+        if isinstance(conversion_rules, ChannelSignalDB):
+            # Rules per bus channel, route each channel to a decoder for its protocol.
+            from can_decoder.iterator.IteratorChannelDecoder import IteratorChannelDecoder
+            
+            return IteratorChannelDecoder(wrapped, conversion_rules, *args, **kwargs)
+        
         # Examine the protocol field.
         dbc_protocol = conversion_rules.protocol
     
@@ -37,19 +76,111 @@ class IteratorDecoder(DecoderBase, metaclass=ABCMeta):
     
         return super(IteratorDecoder, cls).__new__(result)
     
-    def __init__(self, wrapped: Iterable, conversion_rules: SignalDB):
-        super().__init__(conversion_rules=conversion_rules)
+    def __init__(
+            self,
+            wrapped: Iterable,
+            conversion_rules: SignalDB,
+            batch_size: int = 1,
+            max_delay: Optional[float] = None,
+            scalar: bool = False,
+            timestamp_format: Optional[str] = None,
+            output: str = "signal",
+            state_cache: Optional[SignalStateCache] = None,
+            change_only: bool = False,
+            deadband: float = 0.0,
+            max_interval: Optional[float] = None,
+            read_ahead: int = 0,
+            record_adapter: Optional[RecordAdapter] = None,
+            statistics: Optional[DecodeStatistics] = None
+    ):
+        """Create a new iterator decoder using the supplied rules.
+        
+        :param wrapped:             Iterable yielding raw records.
+        :param conversion_rules:    Rules to utilize when doing conversions.
+        :param batch_size:          Number of records to buffer from the wrapped iterator and decode vectorized in one
+                                    go. The default of 1 decodes record by record.
+        :param max_delay:           Maximum time in seconds a buffered record may wait for the batch to fill up. Only
+                                    checked when a record is read from the wrapped iterator. None waits for a full
+                                    batch.
+        :param scalar:              Decode record by record using plain Python integers instead of numpy.
+        :param timestamp_format:    Format of the decoded timestamps. Either "datetime" for timezone aware datetimes,
+                                    "ns" for integer nanoseconds since epoch, "datetime64" for numpy datetime64 or
+                                    "raw" for the timestamps as found in the records. Defaults to "datetime", or "raw"
+                                    when decoding with the scalar path.
+        :param output:              Either "signal" to yield a DecodedSignal per signal, or "frame" to yield a single
+                                    DecodedFrame per record, with the values in the order of Frame.leaf_signals.
+        :param state_cache:         Cache to update with the latest value of each signal as it is decoded.
+        :param change_only:         Only output a value if the physical value differs from the last output value of
+                                    the same signal and CAN ID by more than the deadband.
+        :param deadband:            Largest difference in physical value which is not considered a change.
+        :param max_interval:        With change_only, also output a value once this many seconds have passed since
+                                    the last output value. None disables this.
+        :param read_ahead:          Number of batches (of batch_size records) to read ahead from the wrapped iterator
+                                    in a background thread, overlapping I/O with decoding. The default of 0 reads
+                                    records on demand. Call close() to stop the thread early.
+        :param record_adapter:      Adapter converting the raw records. Defaults to a RecordAdapter for records using
+                                    the can_record field names, or python-can Messages.
+        :param statistics:          Statistics to update while decoding. Missing or mismatched data is then counted
+                                    instead of issuing warnings.
+        """
+        DecoderBase.__init__(self, conversion_rules=conversion_rules)
+        DecodingIterator.__init__(
+            self,
+            wrapped,
+            batch_size=batch_size,
+            max_delay=max_delay,
+            scalar=scalar,
+            read_ahead=read_ahead,
+            statistics=statistics
+        )
+        
+        if timestamp_format is None:
+            timestamp_format = "raw" if scalar else "datetime"
+        
+        if timestamp_format not in _time_stamp_converters:
+            raise ValueError("Unknown timestamp format: \"{}\"".format(timestamp_format))
+        
+        if output not in ("signal", "frame"):
+            raise ValueError("Unknown output: \"{}\"".format(output))
+        
+        self._convert_time_stamp = _time_stamp_converters[timestamp_format]
+        self._record_adapter = RecordAdapter() if record_adapter is None else record_adapter
+        
+        # Scalar representations of the frame signals, compiled on first use. Keyed on the frame object identity.
+        self._scalar_frames = {}  # type: Dict[int, Tuple[Frame, int, List[ScalarSignal]]]
+        
+        # For per-frame output, map each signal to the names in the layout of its frame and its position in the layout.
+        # Keyed on the signal object identity, and laid out again when the layout of the database changes.
+        self._frame_output = output == "frame"
+        self._frame_layouts = {}  # type: Dict[int, Tuple[Signal, Tuple[Tuple[str, ...], int]]]
+        self._frame_layouts_generation = None  # type: Optional[int]
+        self._pending_frame = None
+        
+        if self._frame_output:
+            self._add_data = self._add_frame_data
+        
+        # Raw timestamp of the record being decoded, as used by the change only output and the state cache.
+        self._record_time_stamp = None
+        
+        # For change only output, the last output physical value and raw timestamp. Keyed on the signal object identity
+        # and CAN ID.
+        self._deadband = deadband
+        self._max_interval = None if max_interval is None else max_interval * 1E9
+        self._last_values = {}  # type: Dict[Tuple[int, int], Tuple[float, float]]
+        
+        if change_only:
+            self._add_changed_output_data = self._add_data
+            self._add_data = self._add_changed_data
+        
+        # The state cache is updated with every decoded value, including values dropped by the change only output.
+        self._state_cache = state_cache
+        
+        if state_cache is not None:
+            self._add_output_data = self._add_data
+            self._add_data = self._add_cached_data
         
-        self._wrapped = wrapped
-        self._wrapped_iter = None
-
-        self._signal_fifo = queue.Queue()
         return
 
-    def __iter__(self) -> Iterable[DecodedSignal]:
-        self._wrapped_iter = self._wrapped.__iter__()
-        return self
-    
     @abstractmethod
     def _get_data(self, data):
         """
@@ -58,6 +189,31 @@ class IteratorDecoder(DecoderBase, metaclass=ABCMeta):
         """
         raise NotImplementedError()  # pragma: no cover
     
+    def _locate_frame(self, data) -> Tuple[Optional[Frame], Optional[int]]:
+        """Locate the frame matching a record, as used by the batch decoding.
+        
+        :param data:    Raw record.
+        :return:        Tuple of the matching frame (None if not supported) and the CAN ID to report for the record.
+        """
+        raise NotImplementedError("Batch decoding is not supported by {}".format(type(self).__name__))
+    
+    def _get_valid_indices(self, signal: Signal, signal_data_raw: np.ndarray) -> Optional[np.ndarray]:
+        """Determine which of the raw values of a signal are valid, as used by the batch decoding.
+        
+        :param signal:          Signal the raw values belong to.
+        :param signal_data_raw: Raw signal values.
+        :return:                Indices of the valid values, or None if all values are valid.
+        """
+        return None
+    
+    def _get_scalar_limit(self, signal: Signal) -> Optional[int]:
+        """Determine the lowest invalid raw value of a signal, as used by the scalar decoding.
+        
+        :param signal:  Signal to determine the limit for.
+        :return:        The lowest invalid raw value, or None if all values are valid.
+        """
+        return None
+    
     def _add_data(
             self,
             index: datetime,
@@ -66,41 +222,401 @@ class IteratorDecoder(DecoderBase, metaclass=ABCMeta):
             data_physical: float,
             signal: Signal
     ):
-        self._signal_fifo.put_nowait(
-            DecodedSignal(
-                TimeStamp=index,
-                CanID=can_id,
-                SignalValueRaw=data_raw,
-                SignalValuePhysical=data_physical,
-                Signal=signal.name
+        # Construct the tuple directly, skipping the generated namedtuple constructor. Fields are in declaration order.
+        self._signal_fifo.append(_new_tuple(DecodedSignal, (index, can_id, signal.name, data_raw, data_physical)))
+        return
+    
+    def _add_frame_data(
+            self,
+            index: datetime,
+            can_id: int,
+            data_raw: float,
+            data_physical: float,
+            signal: Signal
+    ):
+        """Replaces _add_data for per-frame output, collecting the values of the current record.
+        """
+        entry = self._frame_layouts.get(id(signal), None)
+        
+        if entry is None or entry[0] is not signal or self._frame_layouts_generation != self._db._layout_generation:
+            self._update_frame_layouts()
+            entry = self._frame_layouts[id(signal)]
+        
+        names, position = entry[1]
+        pending = self._pending_frame
+        
+        if pending is None:
+            pending = (index, can_id, names, [None] * len(names), [None] * len(names))
+            self._pending_frame = pending
+        
+        pending[3][position] = data_raw
+        pending[4][position] = data_physical
+        return
+    
+    def _add_changed_data(
+            self,
+            index: datetime,
+            can_id: int,
+            data_raw: float,
+            data_physical: float,
+            signal: Signal
+    ):
+        """Replaces _add_data for change only output, dropping values which do not report a change.
+        """
+        key = (id(signal), can_id)
+        time_stamp = self._record_time_stamp
+        last = self._last_values.get(key, None)
+        
+        if last is not None and abs(data_physical - last[0]) <= self._deadband:
+            if self._max_interval is None or time_stamp - last[1] < self._max_interval:
+                return
+        
+        self._last_values[key] = (data_physical, time_stamp)
+        self._add_changed_output_data(index, can_id, data_raw, data_physical, signal)
+        return
+    
+    def _add_cached_data(
+            self,
+            index: datetime,
+            can_id: int,
+            data_raw: float,
+            data_physical: float,
+            signal: Signal
+    ):
+        """Replaces _add_data when a state cache is used, updating the cache before passing the data on.
+        """
+        self._state_cache.update(signal, int(self._record_time_stamp), data_raw, data_physical)
+        self._add_output_data(index, can_id, data_raw, data_physical, signal)
+        return
+    
+    def _update_frame_layouts(self) -> None:
+        # Lay out all frames at once, as the frame of the signal is not known.
+        self._frame_layouts.clear()
+        self._frame_layouts_generation = self._db._layout_generation
+        
+        for frame in self._db.frames.values():
+            signals = frame.leaf_signals()
+            names = tuple(leaf_signal.name for leaf_signal in signals)
+            
+            for position, leaf_signal in enumerate(signals):
+                self._frame_layouts[id(leaf_signal)] = (leaf_signal, (names, position))
+        
+        return
+    
+    def _end_record(self) -> None:
+        """Called after all signals of a record have been decoded. Emits the pending record for per-frame output.
+        """
+        pending = self._pending_frame
+        
+        if pending is not None:
+            self._pending_frame = None
+            self._signal_fifo.append(
+                _new_tuple(DecodedFrame, (pending[0], pending[1], pending[2], tuple(pending[3]), tuple(pending[4])))
             )
-        )
+        
         return
     
-    def __next__(self) -> DecodedSignal:
-        while self._signal_fifo.empty():
-            # Extract data from the wrapped iterator.
-            data = self._wrapped_iter.__next__()
-            
-            if isinstance(data, dict):
-                try:
-                    data = can_record(
-                        TimeStamp=data["TimeStamp"],
-                        ID=data["ID"],
-                        IDE=data["IDE"],
-                        DataBytes=data["DataBytes"],
-                        )
-                except KeyError as e:
-                    print("Missing key in data dictionary: {}, skipping".format(str(e)))
-                    continue
+    @property
+    def record_adapter(self) -> RecordAdapter:
+        """Adapter converting the raw records, including the counts of malformed and skipped records.
+        """
+        return self._record_adapter
+    
+    def _decode_record(self, data, locate: bool = False) -> Optional[Frame]:
+        """Decode a single raw record, queueing any decoded signals in the internal FIFO.
+        
+        :param data:    Raw record, in any format supported by the record adapter.
+        :param locate:  Locate the frame matching the record, even if not required for statistics or profiling.
+        :return:        The frame matching the record if located, otherwise None.
+        """
+        data = self._record_adapter(data)
+        
+        if data is None:
+            return None
+        
+        frame = None
+        
+        if locate or self._statistics is not None or self._profiler is not None:
+            frame, _ = self._locate_frame(data)
             
+            if self._statistics is not None:
+                self._count_frame(data, frame)
+            
+            if frame is None:
+                return None
+        
+        token = None if self._profiler is None else self._profiler.start()
+        
+        self._record_time_stamp = data.TimeStamp
+        
+        if self._scalar:
+            self._get_data_scalar(data)
+        else:
             self._get_data(data)
         
-        return self._signal_fifo.get_nowait()
+        if self._frame_output:
+            self._end_record()
+        
+        if token is not None:
+            self._profiler.add_frame(frame, 1, token)
+        
+        return frame
+    
+    def _count_frame(self, data, frame: Optional[Frame]) -> None:
+        """Update the statistics for a record.
+        
+        :param data:    The record.
+        :param frame:   Frame matching the record, or None if the record is not supported.
+        """
+        statistics = self._statistics
+        statistics.frames_seen += 1
+        
+        if frame is not None:
+            statistics.frames_decoded += 1
+        elif data.IDE:
+            statistics.unknown_ids[data.ID | 0x80000000] += 1
+        else:
+            statistics.unknown_ids[data.ID] += 1
+        
+        return
+    
+    def _compile_scalar_frame(self, frame: Frame) -> List[ScalarSignal]:
+        return self._compile_scalar_signals(frame.signals)
+    
+    def _compile_scalar_signals(self, signals: List[Signal]) -> List[ScalarSignal]:
+        result = []
+        
+        for signal in signals:
+            scalar_signal = ScalarSignal(signal, limit=self._get_scalar_limit(signal))
+            
+            if signal.is_multiplexer:
+                scalar_signal.signals = MuxDispatch({
+                    mux_id: self._compile_scalar_signals(mux_signals) for mux_id, mux_signals in signal.signals.items()
+                })
+            
+            result.append(scalar_signal)
+        
+        return result
+    
+    def _get_data_scalar(self, data) -> None:
+        """Decode a single record using the scalar representation of the signals.
+        
+        :param data:    Raw record.
+        """
+        frame, can_id = self._locate_frame(data)
+        
+        if frame is None:
+            # Frame not supported, skip.
+            return
+        
+        scalar_signals = self._get_compiled(self._scalar_frames, frame, self._compile_scalar_frame)
+        
+        data_bytes = data.DataBytes
+        
+        self._decode_scalar(
+            scalar_signals=scalar_signals,
+            little=int.from_bytes(data_bytes, "little"),
+            big=int.from_bytes(data_bytes, "big"),
+            bit_length=8 * len(data_bytes),
+            time_stamp=self._convert_time_stamp(data.TimeStamp),
+            can_id=can_id
+        )
+        
+        return
+    
+    def _decode_scalar(self, scalar_signals: Sequence[ScalarSignal], little: int, big: int, bit_length: int, time_stamp, can_id: int):
+        add_data = self._add_data
+        statistics = self._statistics
+        diagnostics = self._diagnostics
+        profiler = self._profiler
+        
+        for scalar_signal in scalar_signals:
+            if scalar_signal.signals is not None:
+                # Recurse into the signals for the current multiplexer value.
+                mux_id = scalar_signal.extract(little, big, bit_length, statistics, diagnostics)
+                
+                if mux_id is not None:
+                    self._decode_scalar(scalar_signal.signals.group(mux_id), little, big, bit_length, time_stamp, can_id)
+                
+                continue
+            
+            if profiler is not None:
+                token = profiler.start()
+            
+            result = scalar_signal.decode(little, big, bit_length, statistics, diagnostics)
+            
+            if result is not None:
+                add_data(time_stamp, can_id, result[0], result[1], scalar_signal.signal)
+            
+            if profiler is not None:
+                profiler.add_signal(scalar_signal.signal, 1, token)
+        
+        return
+    
+    def _decode_batch(self, records: Sequence, origins: Optional[List[int]] = None) -> None:
+        """Decode a batch of raw records vectorized, queueing any decoded signals in the internal FIFO in the same order
+        as record by record decoding would.
+        
+        :param records: Raw records, in any format supported by the record adapter.
+        :param origins: If supplied, extended with the index in the batch of the record of each queued entry.
+        """
+        # Group the records by frame and payload length, such that each group can be decoded as a single array.
+        records = [self._record_adapter(data) for data in records]
+        groups = {}  # type: Dict[Tuple[int, int], Tuple[Frame, List[int]]]
+        can_ids = [None] * len(records)
+        time_stamps = [None] * len(records)
+        
+        for record_index, data in enumerate(records):
+            if data is None:
+                continue
+            
+            frame, can_id = self._locate_frame(data)
+            
+            if self._statistics is not None:
+                self._count_frame(data, frame)
+            
+            if frame is None:
+                continue
+            
+            can_ids[record_index] = can_id
+            time_stamps[record_index] = self._convert_time_stamp(data.TimeStamp)
+            
+            key = (id(frame), len(data.DataBytes))
+            group = groups.get(key, None)
+            
+            if group is None:
+                group = (frame, [])
+                groups[key] = group
+            
+            group[1].append(record_index)
+        
+        # Decode each group, collecting the values of each signal together with the originating record indices.
+        decoded = []  # type: List[Tuple[np.ndarray, np.ndarray, np.ndarray, Signal]]
+        
+        profiler = self._profiler
+        
+        for frame, record_indices in groups.values():
+            token = None if profiler is None else profiler.start()
+            
+            frame_data = np.array([list(records[i].DataBytes) for i in record_indices], dtype=np.uint8)
+            
+            self._decode_batch_signals(
+                signals=frame.signals,
+                frame_data=frame_data,
+                record_indices=np.array(record_indices),
+                decoded=decoded
+            )
+            
+            if token is not None:
+                profiler.add_frame(frame, len(record_indices), token)
+        
+        if len(decoded) == 0:
+            return
+        
+        # Restore the record order. Within a record, signals are collected in the same order as when decoding the
+        # record on its own, which a stable sort preserves.
+        signal_record_indices = np.concatenate([entry[0] for entry in decoded])
+        order = np.argsort(signal_record_indices, kind="stable")
+        signal_record_indices = signal_record_indices.tolist()
+        
+        raw_values = []
+        physical_values = []
+        signals = []
+        
+        for indices, raw, physical, signal in decoded:
+            raw_values.extend(raw.tolist())
+            physical_values.extend(physical.tolist())
+            signals.extend([signal] * len(indices))
+        
+        previous_record_index = None
+        queued = len(self._signal_fifo)
+        
+        for position in order.tolist():
+            record_index = signal_record_indices[position]
+            
+            if record_index != previous_record_index:
+                if self._frame_output:
+                    self._end_record()
+                
+                if origins is not None and previous_record_index is not None:
+                    origins.extend([previous_record_index] * (len(self._signal_fifo) - queued))
+                    queued = len(self._signal_fifo)
+                
+                self._record_time_stamp = records[record_index].TimeStamp
+                previous_record_index = record_index
+            
+            self._add_data(
+                index=time_stamps[record_index],
+                can_id=can_ids[record_index],
+                data_raw=raw_values[position],
+                data_physical=physical_values[position],
+                signal=signals[position]
+            )
+        
+        if self._frame_output:
+            self._end_record()
+        
+        if origins is not None and previous_record_index is not None:
+            origins.extend([previous_record_index] * (len(self._signal_fifo) - queued))
+        
+        return
+    
+    def _decode_batch_signals(
+            self,
+            signals: List[Signal],
+            frame_data: np.ndarray,
+            record_indices: np.ndarray,
+            decoded: List
+    ) -> None:
+        """Decode a list of signals for a batch of records. Will recurse on itself for multiplexed signals.
+        
+        :param signals:         Signals to decode.
+        :param frame_data:      Frame data as a 2D array of uint8 bytes, one row per record.
+        :param record_indices:  Index in the batch of each row in the frame data.
+        :param decoded:         List to append the decoded signals to.
+        """
+        for signal in signals:
+            if signal.is_multiplexer:
+                # Split the rows on the multiplexer values, in a single pass.
+                for multiplexed_signals, indices in self._demultiplex(signal, frame_data):
+                    self._decode_batch_signals(
+                        signals=multiplexed_signals,
+                        frame_data=frame_data[indices, :],
+                        record_indices=record_indices[indices],
+                        decoded=decoded
+                    )
+                
+                continue
+            
+            token = None if self._profiler is None else self._profiler.start()
+            
+            signal_data_raw = self._decode_signal_raw(signal, frame_data, self._statistics, self._diagnostics)
+            
+            if signal_data_raw.size == 0:
+                if token is not None:
+                    self._profiler.add_signal(signal, len(record_indices), token)
+                continue
+            
+            signal_indices = record_indices
+            valid_indices = self._get_valid_indices(signal, signal_data_raw)
+            
+            if valid_indices is not None:
+                invalid_count = len(signal_data_raw) - len(valid_indices)
+                
+                if self._statistics is not None and invalid_count > 0:
+                    self._statistics.invalid_values[signal.name] += invalid_count
+                
+                signal_data_raw = signal_data_raw[valid_indices]
+                signal_indices = signal_indices[valid_indices]
+            
+            # NOTE: Signed raw values are sign extended in place, so only slice the raw data after the conversion.
+            signal_data = self._decode_signal_raw_to_phys(signal, signal_data_raw)
+            
+            decoded.append((signal_indices, signal_data_raw[:, 0], signal_data[:, 0], signal))
+            
+            if token is not None:
+                self._profiler.add_signal(signal, len(record_indices), token)
+        
+        return
     
     pass
-
-
-
-
-
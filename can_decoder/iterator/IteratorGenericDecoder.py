@@ -1,8 +1,9 @@
-from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 
+from can_decoder.Frame import Frame
 from can_decoder.iterator.IteratorDecoder import IteratorDecoder
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
@@ -10,7 +11,7 @@ from can_decoder.SignalDB import SignalDB
 
 class IteratorGenericDecoder(IteratorDecoder):
     def __init__(self, wrapped: Iterable, conversion_rules: SignalDB, *args, **kwargs):
-        super(IteratorGenericDecoder, self).__init__(wrapped=wrapped, conversion_rules=conversion_rules)
+        super(IteratorGenericDecoder, self).__init__(wrapped, conversion_rules, *args, **kwargs)
         return
     
     @classmethod
@@ -18,17 +19,8 @@ class IteratorGenericDecoder(IteratorDecoder):
         return [None]
 
     def _decode_multiplexed(self, can_id: int, frame_data: np.ndarray, index: datetime, multiplexer: Signal):
-        # Find corresponding muxer values.
-        demultiplexed_ids = self._decode_signal_raw(multiplexer, frame_data)
-    
-        # Bundle these into unique IDs.
-        unique_multiplexed_ids = np.unique(demultiplexed_ids)
-    
-        # Find signals for each id.
-        for unique_id in unique_multiplexed_ids:
-            indices = np.where(demultiplexed_ids == unique_id)[0]
-            signals = multiplexer.signals.get(unique_id, [])
-        
+        # Split the rows on the multiplexer values, in a single pass.
+        for signals, indices in self._demultiplex(multiplexer, frame_data):
             signal_data = frame_data[indices, :]
 
             for signal in signals:
@@ -53,9 +45,13 @@ class IteratorGenericDecoder(IteratorDecoder):
         return
 
     def _decode(self, signal, signal_data, time_stamp, signal_id):
-        signal_data_raw = self._decode_signal_raw(signal, signal_data)
+        token = None if self._profiler is None else self._profiler.start()
+        
+        signal_data_raw = self._decode_signal_raw(signal, signal_data, self._statistics, self._diagnostics)
         
         if signal_data_raw.size == 0:
+            if token is not None:
+                self._profiler.add_signal(signal, 1, token)
             return
         
         signal_data = self._decode_signal_raw_to_phys(signal, signal_data_raw)
@@ -67,17 +63,23 @@ class IteratorGenericDecoder(IteratorDecoder):
             data_physical=signal_data[0, 0],
             signal=signal
         )
+        
+        if token is not None:
+            self._profiler.add_signal(signal, 1, token)
     
         return
         
-    def _get_data(self, data):
-        raw_id = np.uint32(data.ID)
+    def _locate_frame(self, data) -> Tuple[Optional[Frame], Optional[int]]:
+        raw_id = data.ID
         
         if data.IDE:
-            raw_id |= np.uint32(0x80000000)
+            raw_id |= 0x80000000
         
+        return self._db.frames.get(raw_id), raw_id
+    
+    def _get_data(self, data):
         # Locate supported frame.
-        frame = self._db.frames.get(raw_id)
+        frame, raw_id = self._locate_frame(data)
         
         if frame is None:
             # Frame not supported, skip.
@@ -85,7 +87,7 @@ class IteratorGenericDecoder(IteratorDecoder):
         
         # Extract the raw data and the timestamp.
         frame_data = np.array([list(data.DataBytes)], dtype=np.uint8)
-        time_stamp = datetime.utcfromtimestamp(data.TimeStamp * 1E-9).replace(tzinfo=timezone.utc)
+        time_stamp = self._convert_time_stamp(data.TimeStamp)
 
         for signal in frame.signals:
             if signal.is_multiplexer:
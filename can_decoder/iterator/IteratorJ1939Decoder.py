@@ -1,17 +1,18 @@
-from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
 
 import numpy as np
 
+from can_decoder.Frame import Frame
 from can_decoder.iterator.IteratorDecoder import IteratorDecoder
 from can_decoder.Signal import Signal
 from can_decoder.SignalDB import SignalDB
-from can_decoder.support import is_valid_j1939_signal
+from can_decoder.support import get_j1939_limit, is_valid_j1939_signal
 
 
 class IteratorJ1939Decoder(IteratorDecoder):
     def __init__(self, wrapped: Iterable, conversion_rules: SignalDB, *args, **kwargs):
-        super(IteratorJ1939Decoder, self).__init__(wrapped=wrapped, conversion_rules=conversion_rules)
+        super(IteratorJ1939Decoder, self).__init__(wrapped, conversion_rules, *args, **kwargs)
 
         # Map the DBC file for quicker lookups on PGNs.
         self._frames = {}
@@ -27,17 +28,8 @@ class IteratorJ1939Decoder(IteratorDecoder):
         return ["J1939"]
 
     def _decode_multiplexed(self, can_id: int, frame_data: np.ndarray, index: datetime, multiplexer: Signal):
-        # Find corresponding muxer values.
-        demultiplexed_ids = self._decode_signal_raw(multiplexer, frame_data)
-    
-        # Bundle these into unique IDs.
-        unique_multiplexed_ids = np.unique(demultiplexed_ids)
-    
-        # Find signals for each id.
-        for unique_id in unique_multiplexed_ids:
-            indices = np.where(demultiplexed_ids == unique_id)[0]
-            signals = multiplexer.signals.get(unique_id, [])
-        
+        # Split the rows on the multiplexer values, in a single pass.
+        for signals, indices in self._demultiplex(multiplexer, frame_data):
             signal_data = frame_data[indices, :]
         
             for signal in signals:
@@ -62,10 +54,20 @@ class IteratorJ1939Decoder(IteratorDecoder):
         return
 
     def _decode(self, signal, signal_data, time_stamp, signal_id):
-        signal_data_raw = self._decode_signal_raw(signal, signal_data)
+        token = None if self._profiler is None else self._profiler.start()
+        
+        signal_data_raw = self._decode_signal_raw(signal, signal_data, self._statistics, self._diagnostics)
     
         # Ensure the signal is valid.
-        if signal_data_raw.size == 0 or not is_valid_j1939_signal(signal_data_raw[0], signal):
+        if signal_data_raw.size == 0:
+            if token is not None:
+                self._profiler.add_signal(signal, 1, token)
+            return
+        elif not is_valid_j1939_signal(signal_data_raw[0], signal):
+            if self._statistics is not None:
+                self._statistics.invalid_values[signal.name] += 1
+            if token is not None:
+                self._profiler.add_signal(signal, 1, token)
             return
     
         signal_data = self._decode_signal_raw_to_phys(signal, signal_data_raw)
@@ -78,14 +80,17 @@ class IteratorJ1939Decoder(IteratorDecoder):
             signal=signal
         )
         
+        if token is not None:
+            self._profiler.add_signal(signal, 1, token)
+        
         return
     
-    def _get_data(self, data) -> None:
+    def _locate_frame(self, data) -> Tuple[Optional[Frame], Optional[int]]:
         # If this is not an extended frame, skip.
         if not data.IDE:
-            return
+            return None, None
         
-        raw_id = np.uint32(data.ID) | np.uint32(0x80000000)
+        raw_id = data.ID | 0x80000000
         
         # Create PGN.
         pgn = (raw_id & 0x03FFFF00) >> 8
@@ -96,8 +101,25 @@ class IteratorJ1939Decoder(IteratorDecoder):
         if pgn_f < 240:
             pgn &= 0xFFFFFF00
         
+        return self._frames.get(pgn, None), raw_id
+    
+    def _get_valid_indices(self, signal: Signal, signal_data_raw: np.ndarray) -> Optional[np.ndarray]:
+        if signal.is_signed:
+            return None
+        
+        limit = get_j1939_limit(signal.size)
+        
+        return np.where(signal_data_raw[:, 0] < limit)[0]
+    
+    def _get_scalar_limit(self, signal: Signal) -> Optional[int]:
+        if signal.is_signed:
+            return None
+        
+        return get_j1939_limit(signal.size)
+    
+    def _get_data(self, data) -> None:
         # Locate supported frame.
-        frame = self._frames.get(pgn, None)
+        frame, raw_id = self._locate_frame(data)
     
         if frame is None:
             # Frame not supported, skip.
@@ -105,7 +127,7 @@ class IteratorJ1939Decoder(IteratorDecoder):
         
         # Extract the raw data and the timestamp.
         frame_data = np.array([list(data.DataBytes)], dtype=np.uint8)
-        time_stamp = datetime.utcfromtimestamp(data.TimeStamp * 1E-9).replace(tzinfo=timezone.utc)
+        time_stamp = self._convert_time_stamp(data.TimeStamp)
 
         for signal in frame.signals:
             if signal.is_multiplexer:
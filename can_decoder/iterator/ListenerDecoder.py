@@ -0,0 +1,152 @@
+import threading
+
+from typing import Iterable, List, Optional
+
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.DecodeProfiler import DecodeProfiler
+from can_decoder.SignalDB import SignalDB
+from can_decoder.iterator.can_record import can_record
+from can_decoder.iterator.IteratorDecoder import IteratorDecoder
+from can_decoder.iterator.Subscription import Subscription
+
+
+class ListenerDecoder(object):
+    """Push based counterpart to :py:class:`can_decoder.iterator.IteratorDecoder.IteratorDecoder`. Records are passed in
+    one at a time using :py:meth:`on_message`, decoded immediately and delivered to all matching subscriptions.
+
+    The decoder is shaped like a python-can Listener, and can be added to a python-can Notifier directly. Each
+    subscription has a bounded queue with a drop policy, so a slow consumer never stalls the decoding.
+    """
+    def __init__(self, conversion_rules: SignalDB, scalar: bool = True, *args, **kwargs):
+        """Create a new listener decoder using the supplied rules.
+
+        :param conversion_rules:    Rules to utilize when doing conversions.
+        :param scalar:              Decode using plain Python integers instead of numpy. Defaults to True, as records
+                                    are always decoded one at a time.
+        """
+        # Let the iterator decoder handle the protocol selection and the actual decoding.
+        self._decoder = IteratorDecoder((), conversion_rules, scalar=scalar, *args, **kwargs)
+
+        # Decoding may happen from several threads (e.g. a notifier thread per bus). Subscriptions are replaced as a
+        # whole when changed, such that delivery can iterate over them without locking.
+        self._lock = threading.Lock()
+        self._subscriptions = ()
+        self._stopped = False
+        return
+
+    def subscribe(
+            self,
+            signals: Optional[Iterable[str]] = None,
+            frames: Optional[Iterable[int]] = None,
+            maxsize: int = 1024,
+            drop_policy: str = "oldest"
+    ) -> Subscription:
+        """Create a new subscription. See :py:class:`can_decoder.iterator.Subscription.Subscription` for the
+        parameters.
+
+        :return:    The subscription, to read the decoded signals from.
+        """
+        subscription = Subscription(signals=signals, frames=frames, maxsize=maxsize, drop_policy=drop_policy)
+
+        with self._lock:
+            self._subscriptions = self._subscriptions + (subscription, )
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering data to a subscription.
+
+        :param subscription:    Subscription returned by :py:meth:`subscribe`.
+        """
+        with self._lock:
+            self._subscriptions = tuple(entry for entry in self._subscriptions if entry is not subscription)
+
+        return
+
+    @property
+    def diagnostics(self) -> DecodeDiagnostics:
+        """Data errors collected while decoding, as no warnings are issued for live decoding. See
+        :py:attr:`can_decoder.DecoderBase.DecoderBase.diagnostics`.
+        """
+        return self._decoder.diagnostics
+    
+    def profile(self, profiler: Optional[DecodeProfiler] = None):
+        """Profile the decoding of all records received within the context. See
+        :py:meth:`can_decoder.DecoderBase.DecoderBase.profile`.
+        """
+        return self._decoder.profile(profiler)
+    
+    def on_message(self, time_stamp, can_id: int, ide: bool, data: bytes) -> List:
+        """Decode a single record and deliver the result to the matching subscriptions.
+
+        :param time_stamp:  Timestamp of the record, in nanoseconds since epoch.
+        :param can_id:      11 or 29 bit CAN ID.
+        :param ide:         True if the record uses an extended 29 bit ID.
+        :param data:        Data bytes of the record.
+        :return:            List of all signals decoded from the record.
+        """
+        if self._stopped:
+            return []
+
+        record = can_record(TimeStamp=time_stamp, ID=can_id, IDE=ide, DataBytes=data)
+
+        with self._lock:
+            # Decode unconditionally, such that unsupported frames are counted in the statistics.
+            frame = self._decoder._decode_record(record, locate=True)
+            decoded = self._decoder._drain()
+
+        if frame is None:
+            # Frame not supported, skip.
+            return []
+
+        for subscription in self._subscriptions:
+            if subscription.matches_frame(frame.id):
+                for entry in decoded:
+                    subscription.put(entry)
+            elif subscription.signals is not None:
+                for entry in decoded:
+                    if self._matches_signals(subscription, entry):
+                        subscription.put(entry)
+
+        return decoded
+
+    @staticmethod
+    def _matches_signals(subscription: Subscription, entry) -> bool:
+        signal = getattr(entry, "Signal", None)
+
+        if signal is not None:
+            return subscription.matches_signal(signal)
+
+        # Per-frame output, deliver the frame if any of the signals are requested.
+        return any(subscription.matches_signal(name) for name in entry.Signals)
+
+    def on_message_received(self, msg) -> None:
+        """Decode a python-can Message.
+
+        :param msg: Message to decode. Error and remote frames are ignored.
+        """
+        record = self._decoder.record_adapter(msg)
+
+        if record is not None:
+            self.on_message(*record)
+
+        return
+
+    def __call__(self, msg) -> None:
+        return self.on_message_received(msg)
+
+    def on_error(self, exc: Exception) -> None:
+        """Called by a python-can Notifier if the bus fails. Stops the decoder.
+
+        :param exc: The exception raised by the bus.
+        """
+        self.stop()
+        return
+
+    def stop(self) -> None:
+        """Stop decoding. Any further records are ignored.
+        """
+        self._stopped = True
+        return
+
+    pass
@@ -0,0 +1,129 @@
+from operator import attrgetter, itemgetter
+from typing import Callable, Dict, Optional
+
+from can_decoder.iterator.can_record import can_record
+
+
+_new_tuple = tuple.__new__
+
+# Attributes of a python-can Message, in can_record field order, followed by the frame type flags.
+_python_can_fields = ("timestamp", "arbitration_id", "is_extended_id", "data", "is_error_frame", "is_remote_frame")
+
+
+def _as_is(data):
+    return data
+
+
+def _seconds_to_ns(time_stamp) -> int:
+    """Convert a timestamp in seconds to integer nanoseconds. The whole and fractional seconds are converted separately,
+    as scaling a float timestamp since epoch by 1E9 is off by up to a few hundred nanoseconds. This matches the
+    conversion by pandas (e.g. :code:`pd.to_datetime(time_stamps, unit="s")`), such that python-can timestamps give the
+    same result in the iterator and DataFrame decoders.
+    """
+    whole = int(time_stamp)
+    
+    return whole * 1000000000 + int(round(time_stamp - whole, 9) * 1E9)
+
+
+class RecordAdapter(object):
+    """Converts raw records to structures with the fields of :py:class:`can_decoder.iterator.can_record.can_record`.
+
+    Supported records are dictionaries, plain tuples in can_record field order, python-can Message objects and other
+    objects with the can_record fields as attributes (e.g. records from mdf_iter), which are passed on as is. The
+    conversion is compiled once per record type, using :py:func:`operator.itemgetter` and
+    :py:func:`operator.attrgetter`.
+
+    Records which can not be converted are counted in :code:`malformed_records`. Error and remote frames from python-can
+    are counted in :code:`skipped_records`.
+    """
+    def __init__(self, fields: Optional[Dict[str, str]] = None):
+        """Create a new adapter.
+
+        :param fields:  Map from can_record field name to the key or attribute name used in the raw records, for records
+                        which do not use the can_record field names. Unmapped fields use the can_record field names.
+        """
+        names = dict(zip(can_record._fields, can_record._fields))
+
+        for field, name in (fields or {}).items():
+            if field not in names:
+                raise ValueError("Unknown record field: \"{}\"".format(field))
+
+            names[field] = name
+
+        self._names = tuple(names[field] for field in can_record._fields)
+        self._converters = {}  # type: Dict[type, Callable]
+
+        self.malformed_records = 0
+        self.skipped_records = 0
+        return
+
+    def __call__(self, data) -> Optional[can_record]:
+        """Convert a raw record.
+
+        :param data:    Raw record.
+        :return:        The converted record, or None if the record is malformed or skipped.
+        """
+        converter = self._converters.get(type(data), None)
+
+        if converter is None:
+            converter = self._compile(data)
+            self._converters[type(data)] = converter
+
+        try:
+            return converter(data)
+        except (KeyError, AttributeError, IndexError, TypeError, ValueError):
+            self.malformed_records += 1
+            return None
+
+    def _compile(self, data) -> Callable:
+        """Create a converter for all records with the same type as the supplied record.
+
+        :param data:    Raw record.
+        :return:        Callable converting a raw record of this type.
+        """
+        if isinstance(data, can_record):
+            return _as_is
+        elif isinstance(data, dict):
+            getter = itemgetter(*self._names)
+
+            def convert(record):
+                return _new_tuple(can_record, getter(record))
+
+            return convert
+        elif isinstance(data, tuple) and not hasattr(data, "_fields"):
+            def convert(record):
+                if len(record) != len(can_record._fields):
+                    raise ValueError("Unexpected number of fields in record")
+
+                return _new_tuple(can_record, record)
+
+            return convert
+        elif hasattr(data, "arbitration_id"):
+            return self._compile_python_can()
+        elif self._names == can_record._fields and all(hasattr(data, name) for name in self._names):
+            # Already has the expected structure. Skip the conversion.
+            return _as_is
+
+        getter = attrgetter(*self._names)
+
+        def convert(record):
+            return _new_tuple(can_record, getter(record))
+
+        return convert
+
+    def _compile_python_can(self) -> Callable:
+        getter = attrgetter(*_python_can_fields)
+
+        def convert(record):
+            time_stamp, can_id, ide, data_bytes, is_error_frame, is_remote_frame = getter(record)
+
+            if is_error_frame or is_remote_frame:
+                self.skipped_records += 1
+                return None
+
+            # Timestamps are in seconds, convert to nanoseconds like the other records.
+            return _new_tuple(can_record, (_seconds_to_ns(time_stamp), can_id, ide, data_bytes))
+
+        return convert
+
+    pass
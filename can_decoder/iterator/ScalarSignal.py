@@ -0,0 +1,173 @@
+import struct
+import warnings
+
+from typing import Optional, Tuple
+
+from can_decoder.DecodeDiagnostics import DecodeDiagnostics
+from can_decoder.DecodeStatistics import DecodeStatistics
+from can_decoder.MuxDispatch import MuxDispatch
+from can_decoder.Signal import Signal
+from can_decoder.warnings.MissingDataWarning import MissingDataWarning
+from can_decoder.warnings.DataSizeMismatchWarning import DataSizeMismatchWarning
+
+
+class ScalarSignal(object):
+    """Signal description compiled for decoding a single record at a time using plain Python integers.
+
+    The payload of a record is interpreted as one integer in little endian and one in big endian byte order, from which
+    each signal is extracted with a precomputed shift and mask. Produces the same values as the numpy based decoding
+    in :py:class:`can_decoder.DecoderBase.DecoderBase`.
+    """
+    __slots__ = (
+        "signal",
+        "signals",
+        "_start_bit",
+        "_end_bit",
+        "_required_bits",
+        "_is_little_endian",
+        "_mask",
+        "_sign_bit",
+        "_sign_extension",
+        "_sign_offset",
+        "_float_format",
+        "_factor",
+        "_offset",
+        "_limit",
+    )
+
+    def __init__(self, signal: Signal, limit: Optional[int] = None):
+        """Compile a signal for scalar decoding.
+
+        :param signal:  Signal to compile.
+        :param limit:   Raw values at or above this limit are treated as invalid. None accepts all values.
+        """
+        self.signal = signal
+        self.signals = None  # type: Optional[MuxDispatch]
+
+        self._start_bit = signal.start_bit
+        self._end_bit = signal.start_bit + signal.size
+        self._is_little_endian = signal.is_little_endian
+        self._mask = (1 << signal.size) - 1
+        self._factor = signal.factor
+        self._offset = signal.offset
+        self._limit = limit
+
+        # Only complete bytes are decoded, like the numpy implementation.
+        self._required_bits = 8 * ((self._end_bit + 7) // 8)
+
+        # Raw values are reported in the same unsigned container as the numpy implementation uses, which has a width of
+        # 1, 2, 4 or 8 bytes. Signed values are sign extended to the full container width.
+        size_in_bytes = (signal.size + 7) // 8
+        container_bytes = {3: 4, 5: 8, 6: 8, 7: 8}.get(size_in_bytes, size_in_bytes)
+
+        if signal.is_signed and not signal.is_float:
+            self._sign_bit = 1 << (signal.size - 1)
+            self._sign_extension = ((1 << (8 * container_bytes)) - 1) & ~self._mask
+            self._sign_offset = 1 << signal.size
+        else:
+            self._sign_bit = 0
+            self._sign_extension = 0
+            self._sign_offset = 0
+
+        if not signal.is_float:
+            self._float_format = None
+        elif signal.size == 32:
+            self._float_format = struct.Struct("<f")
+        elif signal.size == 64:
+            self._float_format = struct.Struct("<d")
+        else:
+            raise RuntimeError("Signal should be decoded as float, but is not 32 or 64 bits wide")
+
+        return
+
+    def extract(
+            self,
+            little: int,
+            big: int,
+            bit_length: int,
+            statistics: Optional[DecodeStatistics] = None,
+            diagnostics: Optional[DecodeDiagnostics] = None
+    ) -> Optional[int]:
+        """Extract the unsigned raw value of the signal from a record payload.
+
+        :param little:      Payload interpreted as a little endian integer.
+        :param big:         Payload interpreted as a big endian integer.
+        :param bit_length:  Length of the payload in bits.
+        :param statistics:  Statistics to count missing data in.
+        :param diagnostics: Diagnostics to collect missing data in. If None, a warning is issued instead, unless
+                            statistics are supplied.
+        :return:            The raw value, or None if the payload does not contain the signal.
+        """
+        if bit_length < self._required_bits:
+            missing = bit_length <= self._start_bit - self._start_bit % 8
+            
+            if statistics is not None:
+                statistics.size_mismatches[self.signal.name] += 1
+            
+            if diagnostics is not None:
+                if missing:
+                    diagnostics.missing_data[self.signal.name] += 1
+                else:
+                    diagnostics.size_mismatches[self.signal.name] += 1
+            elif statistics is None:
+                if missing:
+                    warnings.warn("No data found for signal {}".format(self.signal), MissingDataWarning)
+                else:
+                    warnings.warn("Could not shape data for {}".format(self.signal), DataSizeMismatchWarning)
+            return None
+
+        if self._is_little_endian:
+            return (little >> self._start_bit) & self._mask
+        else:
+            return (big >> (bit_length - self._end_bit)) & self._mask
+
+    def decode(
+            self,
+            little: int,
+            big: int,
+            bit_length: int,
+            statistics: Optional[DecodeStatistics] = None,
+            diagnostics: Optional[DecodeDiagnostics] = None
+    ) -> Optional[Tuple[int, float]]:
+        """Extract the signal from a record payload and convert it to the physical value.
+
+        :param little:      Payload interpreted as a little endian integer.
+        :param big:         Payload interpreted as a big endian integer.
+        :param bit_length:  Length of the payload in bits.
+        :param statistics:  Statistics to count missing data and invalid values in.
+        :param diagnostics: Diagnostics to collect missing data in.
+        :return:            Tuple of the raw and physical value, or None if no valid value could be extracted.
+        """
+        if bit_length < self._required_bits:
+            # Let the extraction handle the warnings.
+            return self.extract(little, big, bit_length, statistics, diagnostics)
+
+        if self._is_little_endian:
+            raw = (little >> self._start_bit) & self._mask
+        else:
+            raw = (big >> (bit_length - self._end_bit)) & self._mask
+
+        if self._limit is not None and raw >= self._limit:
+            if statistics is not None:
+                statistics.invalid_values[self.signal.name] += 1
+            return None
+
+        if self._float_format is not None:
+            value = self._float_format.unpack(raw.to_bytes(self._float_format.size, "little"))[0]
+        elif raw & self._sign_bit:
+            value = raw - self._sign_offset
+            raw |= self._sign_extension
+        else:
+            value = raw
+
+        # Handle scaling to physical values if necessary.
+        if self._factor != 1:
+            value = value * self._factor
+
+        # Correct for any offsets if necessary.
+        if self._offset != 0:
+            value = value + self._offset
+
+        return raw, float(value)
+
+    pass
@@ -0,0 +1,129 @@
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from can_decoder.Signal import Signal
+from can_decoder.SignalDB import SignalDB
+
+
+SignalState = namedtuple(
+    "SignalState", [
+        "TimeStamp",
+        "SignalValueRaw",
+        "SignalValuePhysical",
+        "Valid",
+    ]
+)
+
+
+class SignalStateCache(object):
+    """Latest value of every signal in a database, stored in preallocated numpy arrays indexed by signal code.
+
+    Signal codes are assigned on construction, frame by frame in database order and within each frame in the order of
+    Frame.leaf_signals. Signals shared by several CAN IDs (e.g. J1939 frames from different source addresses) share a
+    single entry.
+    """
+
+    def __init__(self, conversion_rules: SignalDB):
+        """Create a new state cache for all signals in the supplied rules.
+
+        :param conversion_rules:    Rules containing the signals to track.
+        """
+        self._codes = {}  # type: Dict[int, int]
+        self._frame_ids = []  # type: List[int]
+        self._names = []  # type: List[str]
+
+        for frame in conversion_rules.frames.values():
+            for signal in frame.leaf_signals():
+                self._codes[id(signal)] = len(self._names)
+                self._frame_ids.append(frame.id)
+                self._names.append(signal.name)
+
+        count = len(self._names)
+
+        self._time_stamps = np.zeros(count, dtype=np.int64)
+        self._raw = np.zeros(count, dtype=np.uint64)
+        self._physical = np.full(count, np.nan, dtype=np.float64)
+        self._valid = np.zeros(count, dtype=bool)
+        return
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def signal_names(self) -> Tuple[str, ...]:
+        """Names of the tracked signals, indexed by signal code.
+        """
+        return tuple(self._names)
+
+    @property
+    def frame_ids(self) -> Tuple[int, ...]:
+        """Frame ID of the tracked signals, indexed by signal code.
+        """
+        return tuple(self._frame_ids)
+
+    def get_signal_code(self, signal) -> Optional[int]:
+        """Look up the code of a signal.
+
+        :param signal:  Either a Signal from the database the cache was created from, or a signal name. In case several
+                        signals share the name, the first one is returned.
+        :return:        The signal code, or None if the signal is not tracked.
+        """
+        if isinstance(signal, Signal):
+            return self._codes.get(id(signal), None)
+
+        try:
+            return self._names.index(signal)
+        except ValueError:
+            return None
+
+    def update(self, signal: Signal, time_stamp: int, data_raw: int, data_physical: float) -> None:
+        """Store a new value for a signal. Values for signals not in the cache are ignored.
+
+        :param signal:          Signal the value belongs to.
+        :param time_stamp:      Timestamp of the value in nanoseconds since epoch.
+        :param data_raw:        Raw value.
+        :param data_physical:   Physical value.
+        """
+        code = self._codes.get(id(signal), None)
+
+        if code is not None:
+            self._time_stamps[code] = time_stamp
+            self._raw[code] = data_raw
+            self._physical[code] = data_physical
+            self._valid[code] = True
+
+        return
+
+    def snapshot(self) -> SignalState:
+        """Get the current state of all signals, indexed by signal code.
+
+        The arrays are read-only views of the internal storage, so no data is copied, but the values change as the cache
+        is updated. Copy the arrays to keep a consistent state. Timestamps are numpy datetime64 with nanosecond
+        resolution. Signals without any value yet are marked as not valid.
+
+        :return:    Tuple of arrays.
+        """
+        result = SignalState(
+            TimeStamp=self._time_stamps.view("datetime64[ns]"),
+            SignalValueRaw=self._raw.view(),
+            SignalValuePhysical=self._physical.view(),
+            Valid=self._valid.view(),
+        )
+
+        for array in result:
+            array.flags.writeable = False
+
+        return result
+
+    def reset(self) -> None:
+        """Mark all signals as not having any value.
+        """
+        self._time_stamps[:] = 0
+        self._raw[:] = 0
+        self._physical[:] = np.nan
+        self._valid[:] = False
+        return
+
+    pass
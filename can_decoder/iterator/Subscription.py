@@ -0,0 +1,108 @@
+import queue
+
+from typing import Iterable, Optional
+
+
+class Subscription(object):
+    """Bounded queue of decoded signals for a single consumer of a
+    :py:class:`can_decoder.iterator.ListenerDecoder.ListenerDecoder`, optionally filtered by signal name or frame ID.
+
+    Adding data never blocks. When the queue is full, the drop policy decides which data is discarded: "oldest" drops
+    the oldest queued entry to make room, while "newest" discards the incoming data.
+    """
+
+    def __init__(
+            self,
+            signals: Optional[Iterable[str]] = None,
+            frames: Optional[Iterable[int]] = None,
+            maxsize: int = 1024,
+            drop_policy: str = "oldest"
+    ):
+        """Create a new subscription.
+
+        :param signals:     Names of the signals to receive. None receives all signals, unless frames are supplied.
+        :param frames:      IDs of the frames to receive all signals from, as found in the SignalDB. None receives all
+                            frames, unless signals are supplied.
+        :param maxsize:     Maximum number of queued entries.
+        :param drop_policy: Either "oldest" or "newest".
+        """
+        if maxsize < 1:
+            raise ValueError("Queue size must be at least 1")
+
+        if drop_policy not in ("oldest", "newest"):
+            raise ValueError("Unknown drop policy: \"{}\"".format(drop_policy))
+
+        self.signals = None if signals is None else frozenset(signals)
+        self.frames = None if frames is None else frozenset(frames)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        return
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def matches_frame(self, frame_id: int) -> bool:
+        """Check if all signals of a frame are requested. If not, individual signals may still match.
+
+        :param frame_id:    ID of the frame, as found in the SignalDB.
+        :return:            True if all signals of the frame are requested.
+        """
+        if self.frames is None:
+            return self.signals is None
+
+        return frame_id in self.frames
+
+    def matches_signal(self, name: str) -> bool:
+        """Check if a signal is requested by name.
+
+        :param name:    Signal name.
+        :return:        True if the signal is requested.
+        """
+        return self.signals is not None and name in self.signals
+
+    def put(self, data) -> None:
+        """Queue data for the consumer without blocking, applying the drop policy if the queue is full.
+
+        :param data:    Decoded data to queue.
+        """
+        while True:
+            try:
+                self._queue.put_nowait(data)
+                break
+            except queue.Full:
+                pass
+
+            self.dropped += 1
+
+            if self.drop_policy == "newest":
+                break
+
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                # Emptied by the consumer in the meantime.
+                self.dropped -= 1
+
+        return
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        """Get the next queued entry. See :py:meth:`queue.Queue.get`.
+
+        :param block:   Wait for an entry to become available.
+        :param timeout: Maximum time in seconds to wait. None waits indefinitely.
+        :return:        The next decoded entry.
+        :raises queue.Empty:    If no entry is available.
+        """
+        return self._queue.get(block=block, timeout=timeout)
+
+    def get_nowait(self):
+        """Get the next queued entry without waiting.
+
+        :return:        The next decoded entry.
+        :raises queue.Empty:    If no entry is available.
+        """
+        return self._queue.get_nowait()
+
+    pass
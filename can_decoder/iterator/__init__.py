@@ -1,5 +1,42 @@
+import importlib
+import sys
+
 from can_decoder.iterator.IteratorDecoder import IteratorDecoder
 from can_decoder.iterator.IteratorGenericDecoder import IteratorGenericDecoder
 from can_decoder.iterator.IteratorJ1939Decoder import IteratorJ1939Decoder
+from can_decoder.iterator.IteratorChannelDecoder import IteratorChannelDecoder
 from can_decoder.iterator.can_record import can_record
 from can_decoder.iterator.DecodedSignal import DecodedSignal
+from can_decoder.iterator.DecodedFrame import DecodedFrame
+from can_decoder.iterator.SignalStateCache import SignalStateCache, SignalState
+from can_decoder.iterator.RecordAdapter import RecordAdapter
+
+# Members loaded on first access, such that asyncio and the subscription queues are only imported when used.
+_lazy_members = {
+    "AsyncIteratorDecoder": "can_decoder.iterator.AsyncIteratorDecoder",
+    "ListenerDecoder": "can_decoder.iterator.ListenerDecoder",
+    "Subscription": "can_decoder.iterator.Subscription",
+}
+
+
+def __getattr__(name: str):
+    module_name = _lazy_members.get(name, None)
+    
+    if module_name is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    
+    importlib.import_module(module_name)
+    
+    # Importing a submodule binds it on this package under the name of its member, possibly for other members as well
+    # through the imports of the submodule. Replace each by the member.
+    for member_name, member_module_name in _lazy_members.items():
+        member_module = sys.modules.get(member_module_name, None)
+        
+        if member_module is not None:
+            globals()[member_name] = getattr(member_module, member_name)
+    
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(_lazy_members.keys()))
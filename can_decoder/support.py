@@ -1,3 +1,7 @@
+from typing import Optional
+
+import numpy as np
+
 from can_decoder.Signal import Signal
 
 
@@ -36,6 +40,20 @@ def get_j1939_limit(number_of_bits: int) -> int:
     return limit
 
 
+def get_j1939_pgn(frame_id: int) -> int:
+    """Calculate the J1939 PGN of a CAN ID. For PDU1 format PGNs (PF below 240), the destination address is cleared.
+    
+    :param frame_id:    29 bit CAN ID, optionally with the extended ID flag set in the most significant bit.
+    :return:            The PGN, including the data page bits.
+    """
+    pgn = (frame_id & 0x03FFFF00) >> 8
+    
+    if (pgn & 0xFF00) >> 8 < 240:
+        pgn &= 0xFFFFFF00
+    
+    return pgn
+
+
 def is_valid_j1939_signal(raw_value: int, signal: Signal) -> bool:
     """Given a raw J1939 signal value and the signal length in bits, determine if the signal is valid,
     
@@ -55,3 +73,78 @@ def is_valid_j1939_signal(raw_value: int, signal: Signal) -> bool:
         result = True
     
     return result
+
+
+def get_change_mask(
+        values: np.ndarray,
+        time_stamps: Optional[np.ndarray] = None,
+        deadband: float = 0.0,
+        max_interval: Optional[float] = None
+) -> np.ndarray:
+    """For a series of values from a single signal, determine which values to keep when only reporting changes.
+    
+    The first value is always kept. Any later value is kept if it differs from the last kept value by more than the
+    deadband, or if at least max_interval has passed since the last kept value.
+    
+    The changes between consecutive values are found vectorized. Only the resulting runs of equal values are walked in
+    Python, to track the last kept value for the deadband and to insert the heartbeats.
+    
+    :param values:          1D array of values, in chronological order.
+    :param time_stamps:     1D array of timestamps for the values. Only required with max_interval.
+    :param deadband:        Largest difference to the last kept value which is not considered a change.
+    :param max_interval:    Maximum time between two kept values, in the unit of the timestamps. None disables the
+                            heartbeat.
+    :return:                Boolean array, True for each value to keep.
+    """
+    count = len(values)
+    mask = np.zeros(count, dtype=bool)
+    
+    if count == 0:
+        return mask
+    
+    # Start of each run of equal values.
+    run_starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    
+    if deadband == 0 and max_interval is None:
+        # Every run start differs from the last kept value, which is the previous run.
+        mask[0] = True
+        mask[run_starts] = True
+        return mask
+    
+    run_starts = [0] + run_starts.tolist()
+    run_ends = run_starts[1:] + [count]
+    values = values.tolist()
+    
+    last_value = None
+    last_time_stamp = None
+    
+    for run_start, run_end in zip(run_starts, run_ends):
+        value = values[run_start]
+        
+        if last_value is None or not abs(value - last_value) <= deadband:
+            mask[run_start] = True
+            last_value = value
+            
+            if max_interval is not None:
+                last_time_stamp = time_stamps[run_start]
+        
+        if max_interval is None:
+            continue
+        
+        # Insert heartbeats within the run.
+        search_start = run_start + 1 if mask[run_start] else run_start
+        
+        while search_start < run_end:
+            position = search_start + int(
+                np.searchsorted(time_stamps[search_start:run_end], last_time_stamp + max_interval)
+            )
+            
+            if position >= run_end:
+                break
+            
+            mask[position] = True
+            last_value = value
+            last_time_stamp = time_stamps[position]
+            search_start = position + 1
+    
+    return mask
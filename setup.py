@@ -29,7 +29,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     name="can_decoder",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "benchmarks.*"]),
     python_requires='>=3.5',
     url="https://github.com/CSS-Electronics/can_decoder",
     version=versioneer.get_version(),
@@ -0,0 +1,206 @@
+from random import Random
+
+import numpy as np
+import pandas as pd
+import pytest
+import can_decoder
+
+from can_decoder.support import get_change_mask
+
+
+def reference_mask(values, time_stamps, deadband, max_interval):
+    # Straightforward record by record implementation of the change only rules.
+    result = []
+    last_value = None
+    last_time_stamp = None
+
+    for i, value in enumerate(values):
+        keep = last_value is None or not abs(value - last_value) <= deadband
+
+        if not keep and max_interval is not None:
+            keep = time_stamps[i] - last_time_stamp >= max_interval
+
+        if keep:
+            last_value = value
+            last_time_stamp = None if time_stamps is None else time_stamps[i]
+
+        result.append(keep)
+
+    return np.array(result, dtype=bool)
+
+
+class TestChangeOnly(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def db(self, protocol):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        frame.add_signal(signal_torque)
+        frame.add_signal(signal_engine_speed)
+
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        rng = Random(7)
+        records = []
+        torque = 130
+        speed = 8000
+
+        for i in range(1000):
+            # Slowly changing values, from two source addresses.
+            if rng.random() < 0.1:
+                torque = min(255, max(0, torque + rng.randint(-3, 3)))
+            if rng.random() < 0.2:
+                speed = min(0xFAFF, max(0, speed + rng.randint(-20, 20)))
+
+            records.append({
+                "TimeStamp": 1577836800000000000 + i * 10000000,
+                "ID": rng.choice([0x0CF004FE, 0x0CF00400]),
+                "IDE": True,
+                "DataBytes": [0x00, torque, 0x00, speed & 0xFF, speed >> 8, 0x00, 0x00, 0x00],
+            })
+
+        return records
+
+    @pytest.mark.parametrize(("deadband", "max_interval"), [(0, None), (0, 0.05), (2.5, None), (2.5, 0.05), (1, 0)])
+    def test_mask(self, deadband, max_interval):
+        rng = Random(11)
+        values = np.cumsum([rng.choice([0, 0, 0, 1, -1]) for _ in range(500)]).astype(np.float64)
+        time_stamps = np.cumsum([rng.uniform(0.001, 0.02) for _ in range(500)])
+
+        result = get_change_mask(values, time_stamps, deadband, max_interval)
+        expected = reference_mask(values.tolist(), time_stamps.tolist(), deadband, max_interval)
+
+        assert np.array_equal(result, expected)
+
+        return
+
+    def test_mask_empty(self):
+        assert len(get_change_mask(np.array([]))) == 0
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("deadband", "max_interval"), [(0, None), (2, None), (0.5, 0.25)])
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 64},)])
+    def test_iterator(self, db, records, deadband, max_interval, kwargs: dict):
+        decoded = list(can_decoder.IteratorDecoder(records, db, timestamp_format="ns", **kwargs))
+        result = list(can_decoder.IteratorDecoder(
+            records, db, timestamp_format="ns", change_only=True, deadband=deadband, max_interval=max_interval,
+            **kwargs
+        ))
+
+        assert 0 < len(result) < len(decoded) / 2
+
+        # Apply the reference rules to each series.
+        expected = np.zeros(len(decoded), dtype=bool)
+
+        for key in set((entry.Signal, entry.CanID) for entry in decoded):
+            indices = [i for i, entry in enumerate(decoded) if (entry.Signal, entry.CanID) == key]
+            values = [decoded[i].SignalValuePhysical for i in indices]
+            time_stamps = [decoded[i].TimeStamp for i in indices]
+
+            expected[indices] = reference_mask(
+                values, time_stamps, deadband, None if max_interval is None else max_interval * 1E9
+            )
+
+        assert result == [entry for entry, keep in zip(decoded, expected) if keep]
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("deadband", "max_interval"), [(0, None), (2, None), (0.5, 0.25)])
+    def test_dataframe_matches_iterator(self, db, records, deadband, max_interval):
+        if db.protocol is None:
+            # The generic decoder only matches a single CAN ID.
+            records = [record for record in records if record["ID"] == 0x0CF004FE]
+
+        expected = list(can_decoder.IteratorDecoder(
+            records, db, timestamp_format="ns", change_only=True, deadband=deadband, max_interval=max_interval
+        ))
+
+        df = pd.DataFrame(records)
+        df["TimeStamp"] = pd.to_datetime(df["TimeStamp"], utc=True)
+        df = df.set_index("TimeStamp")
+
+        result = can_decoder.DataFrameDecoder(db).decode_frame(
+            df, change_only=True, deadband=deadband, max_interval=max_interval
+        )
+
+        assert len(result) == len(expected)
+
+        for signal_name in ["Torque", "EngineSpeed"]:
+            expected_values = [entry.SignalValuePhysical for entry in expected if entry.Signal == signal_name]
+            expected_time_stamps = [entry.TimeStamp for entry in expected if entry.Signal == signal_name]
+
+            signal_result = result[result["Signal"] == signal_name]
+
+            assert sorted(zip(signal_result.index.asi8.tolist(), signal_result["Physical Value"].tolist())) == \
+                sorted(zip(expected_time_stamps, expected_values))
+
+        return
+
+    def test_dataframe_many_ids(self, db):
+        # Interleaved series of many CAN IDs are filtered separately.
+        rng = Random(11)
+        can_ids = [rng.randrange(50) for _ in range(2000)]
+        values = [float(rng.randint(0, 3)) for _ in range(2000)]
+        time_stamps = [i * 10000000 for i in range(2000)]
+
+        df = pd.DataFrame(
+            {"CAN ID": can_ids, "Physical Value": values},
+            index=pd.to_datetime(time_stamps, unit="ns")
+        )
+
+        uut = can_decoder.DataFrameDecoder(db)
+        uut._deadband = 1
+        uut._max_interval = 0.5
+
+        expected = np.zeros(len(df), dtype=bool)
+
+        for can_id in set(can_ids):
+            indices = [i for i, value in enumerate(can_ids) if value == can_id]
+            expected[indices] = reference_mask(
+                [values[i] for i in indices], [time_stamps[i] for i in indices], 1, 0.5E9
+            )
+
+        assert uut._filter_changes(df).equals(df[expected])
+
+        return
+
+    def test_dataframe_max_interval_requires_datetime_index(self, db, records):
+        df = pd.DataFrame(records[:10]).set_index("TimeStamp")
+
+        with pytest.raises(ValueError):
+            can_decoder.DataFrameDecoder(db).decode_frame(df, change_only=True, max_interval=1)
+
+        return
+
+    pass
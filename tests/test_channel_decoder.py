@@ -0,0 +1,331 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pytest
+import can_decoder
+
+from can_decoder.iterator.IteratorDecoder import _time_stamp_to_ns
+
+
+def build_frame_db(protocol=None, frame_id: int = 0x123) -> can_decoder.SignalDB:
+    # Rules with a single frame, for checking how databases are combined.
+    db = can_decoder.SignalDB(protocol=protocol)
+
+    frame = can_decoder.Frame(
+        frame_id=frame_id,
+        frame_size=8
+    )
+
+    signal_counter = can_decoder.Signal(
+        signal_name="Counter",
+        signal_start_bit=0,
+        signal_size=8,
+    )
+
+    frame.add_signal(signal_counter)
+    db.add_frame(frame)
+
+    return db
+
+
+@pytest.fixture()
+def rules() -> can_decoder.ChannelSignalDB:
+    # J1939 rules on the first channel.
+    db_j1939 = can_decoder.SignalDB(protocol="J1939")
+
+    frame_eec1 = can_decoder.Frame(
+        frame_id=0x8CF004FE,
+        frame_size=8,
+        frame_name="EEC1"
+    )
+
+    signal_torque = can_decoder.Signal(
+        signal_name="Torque",
+        signal_start_bit=8,
+        signal_size=8,
+        signal_offset=-125.0,
+    )
+
+    signal_engine_speed = can_decoder.Signal(
+        signal_name="EngineSpeed",
+        signal_start_bit=24,
+        signal_size=16,
+        signal_factor=0.125,
+    )
+
+    frame_eec1.add_signal(signal_torque)
+    frame_eec1.add_signal(signal_engine_speed)
+    db_j1939.add_frame(frame_eec1)
+
+    # Generic rules on the second channel.
+    db_generic = can_decoder.SignalDB()
+
+    frame_generic = can_decoder.Frame(
+        frame_id=0x123,
+        frame_size=8,
+        frame_name="Generic"
+    )
+
+    signal_counter = can_decoder.Signal(
+        signal_name="Counter",
+        signal_start_bit=0,
+        signal_size=8,
+    )
+
+    frame_generic.add_signal(signal_counter)
+    db_generic.add_frame(frame_generic)
+
+    return can_decoder.ChannelSignalDB({1: db_j1939, 2: db_generic})
+
+
+@pytest.fixture()
+def records() -> list:
+    entries = [
+        (1, 0x0CF004FE, True, [0x00, 0x82, 0x00, 0x10, 0x20, 0x00, 0x00, 0x00]),
+        (2, 0x123, False, [0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
+        # Known ID, but on the channel of the other database.
+        (2, 0x0CF004FE, True, [0x00, 0x82, 0x00, 0x10, 0x20, 0x00, 0x00, 0x00]),
+        (1, 0x123, False, [0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
+        # Unknown channel.
+        (3, 0x123, False, [0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
+        (1, 0x0CF004FE, True, [0x00, 0x83, 0x00, 0x20, 0x20, 0x00, 0x00, 0x00]),
+        (2, 0x123, False, [0x07, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
+    ]
+
+    return [
+        {
+            "TimeStamp": 1577836800000000000 + i * 1000000,
+            "BusChannel": channel,
+            "ID": frame_id,
+            "IDE": ide,
+            "DataBytes": data,
+        }
+        for i, (channel, frame_id, ide, data) in enumerate(entries)
+    ]
+
+
+def decode_per_channel(rules: can_decoder.ChannelSignalDB, records: list) -> list:
+    result = []
+
+    for record in records:
+        db = rules.channels.get(record["BusChannel"], None)
+
+        if db is not None:
+            result.extend(can_decoder.IteratorDecoder([record], db))
+
+    return result
+
+
+class TestChannelSignalDB(object):
+
+    def test_merge(self):
+        rules = can_decoder.ChannelSignalDB()
+        db = rules.add_channel("can0", [build_frame_db(frame_id=0x123), build_frame_db(frame_id=0x124)])
+
+        assert rules.channels == {"can0": db}
+        assert sorted(db.frames.keys()) == [0x123, 0x124]
+        assert "can0" in str(rules)
+
+        return
+
+    def test_single_database_is_used_directly(self):
+        db = build_frame_db("J1939")
+        rules = can_decoder.ChannelSignalDB({0: db})
+
+        assert rules.channels[0] is db
+
+        return
+
+    @pytest.mark.parametrize(("frames",), [
+        # Same ID.
+        ([(None, 0x123), (None, 0x123)],),
+        # Same PGN and priority, different source addresses.
+        ([("J1939", 0x8CF004FE), ("J1939", 0x8CF00400)],),
+        # Same PGN, different priorities.
+        ([("J1939", 0x8CF004FE), ("J1939", 0x98F004FE)],),
+        # Mixed protocols.
+        ([(None, 0x123), ("J1939", 0x8CF004FE)],),
+        # Nothing to add.
+        ([],),
+    ])
+    def test_invalid_channel(self, frames: list):
+        databases = [build_frame_db(protocol, frame_id) for protocol, frame_id in frames]
+        rules = can_decoder.ChannelSignalDB()
+
+        with pytest.raises(ValueError):
+            rules.add_channel(0, databases)
+
+        assert rules.channels == {}
+
+        return
+
+    def test_duplicate_channel(self, rules):
+        with pytest.raises(ValueError):
+            rules.add_channel(1, build_frame_db(frame_id=0x321))
+
+        return
+
+    def test_j1939_pdu1_destination(self):
+        # PDU1 frames to different destinations share the PGN, and thus conflict.
+        rules = can_decoder.ChannelSignalDB()
+
+        with pytest.raises(ValueError):
+            rules.add_channel(0, [build_frame_db("J1939", 0x98EA00FE), build_frame_db("J1939", 0x98EAFFFE)])
+
+        # Different PDU2 group extensions are different PGNs.
+        db = rules.add_channel(1, [build_frame_db("J1939", 0x98FE00FE), build_frame_db("J1939", 0x98FEFFFE)])
+        assert len(db.frames) == 2
+
+        return
+
+    pass
+
+
+class TestIteratorChannelDecoder(object):
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"batch_size": 3},), ({"batch_size": 64},)])
+    def test_matches_per_channel(self, rules, records, kwargs: dict):
+        expected = decode_per_channel(rules, records)
+        result = list(can_decoder.IteratorDecoder(records, rules, **kwargs))
+
+        assert isinstance(can_decoder.IteratorDecoder((), rules), can_decoder.iterator.IteratorChannelDecoder)
+        assert len(result) == 6
+        assert result == expected
+
+        return
+
+    def test_channel_decoders(self, rules):
+        # The settings, given by position or keyword, are passed on to a decoder for the protocol of each channel.
+        adapter = can_decoder.iterator.RecordAdapter()
+        uut = can_decoder.IteratorDecoder((), rules, 8, None, False, "ns", record_adapter=adapter)
+
+        assert not isinstance(uut, can_decoder.IteratorDecoder)
+        assert uut.record_adapter is adapter
+
+        for decoder in uut._decoders.values():
+            assert isinstance(decoder, can_decoder.IteratorDecoder)
+            assert decoder.record_adapter is adapter
+            assert decoder.diagnostics is uut.diagnostics
+            assert decoder._batch_size == 8
+            assert decoder._convert_time_stamp is _time_stamp_to_ns
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"output": "frame"},)])
+    def test_batch_order(self, rules, records, kwargs: dict):
+        # The clock of the second bus lags behind, such that the timestamps are out of order between the channels.
+        for record in records:
+            if record["BusChannel"] == 2:
+                record["TimeStamp"] -= 10000000
+
+        expected = list(can_decoder.IteratorDecoder(records, rules, **kwargs))
+        result = list(can_decoder.IteratorDecoder(records, rules, batch_size=64, **kwargs))
+
+        assert len(result) != 0
+        assert result == expected
+
+        return
+
+    def test_scalar(self, rules, records):
+        result = list(can_decoder.IteratorDecoder(records, rules, scalar=True))
+
+        assert [(signal.Signal, signal.SignalValuePhysical) for signal in result] == [
+            ("Torque", 5.0), ("EngineSpeed", 1026.0), ("Counter", 5), ("Torque", 6.0), ("EngineSpeed", 1028.0),
+            ("Counter", 7),
+        ]
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"batch_size": 16},)])
+    def test_statistics(self, rules, records, kwargs: dict):
+        statistics = can_decoder.DecodeStatistics()
+        list(can_decoder.IteratorDecoder(records, rules, statistics=statistics, **kwargs))
+
+        assert statistics.frames_seen == 7
+        assert statistics.frames_decoded == 4
+        assert statistics.unknown_channels == {3: 1}
+        assert statistics.unknown_ids == {0x8CF004FE: 1, 0x123: 1}
+
+        return
+
+    def test_channel_attribute(self, rules, records):
+        # Similar to python-can messages.
+        Message = namedtuple("Message", [
+            "timestamp", "arbitration_id", "is_extended_id", "data", "is_error_frame", "is_remote_frame", "channel"
+        ])
+        messages = [
+            Message(record["TimeStamp"] / 1E9, record["ID"], record["IDE"], bytes(record["DataBytes"]), False, False,
+                    record["BusChannel"])
+            for record in records
+        ]
+
+        result = list(can_decoder.IteratorDecoder(messages, rules, channel_field="channel"))
+
+        assert [signal.SignalValuePhysical for signal in result] == [
+            signal.SignalValuePhysical for signal in decode_per_channel(rules, records)
+        ]
+
+        return
+
+    def test_missing_channel(self, rules, records):
+        del records[0]["BusChannel"]
+
+        decoder = can_decoder.IteratorDecoder(records, rules)
+        result = list(decoder)
+
+        assert len(result) == 4
+        assert decoder._record_adapter.malformed_records == 1
+
+        return
+
+    pass
+
+
+class TestDataFrameChannelDecoder(object):
+
+    def test_matches_per_channel(self, rules, records):
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        statistics = can_decoder.DecodeStatistics()
+
+        decoder = can_decoder.DataFrameDecoder(rules)
+        result = decoder.decode_frame(df, statistics=statistics)
+
+        assert isinstance(decoder, can_decoder.dataframe.DataFrameChannelDecoder)
+        assert result.index.is_monotonic_increasing
+        assert list(result["BusChannel"]) == [1, 1, 2, 1, 1, 2]
+        assert list(result["Signal"]) == ["Torque", "EngineSpeed", "Counter", "Torque", "EngineSpeed", "Counter"]
+        assert np.allclose(result["Physical Value"], [5.0, 1026.0, 5, 6.0, 1028.0, 7])
+
+        assert statistics.frames_seen == 7
+        assert statistics.unknown_channels == {3: 1}
+
+        return
+
+    def test_channel_column(self, rules, records):
+        df = pd.DataFrame(records).set_index("TimeStamp").rename(columns={"BusChannel": "Bus"})
+        decoder = can_decoder.DataFrameDecoder(rules)
+
+        result = decoder.decode_frame(df, channel_column="Bus", columns_to_drop=["Bus"])
+        assert "Bus" not in result.columns
+        assert len(result) == 6
+
+        with pytest.raises(ValueError):
+            decoder.decode_frame(df)
+
+        return
+
+    def test_missing_channel(self, rules, records):
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        df["BusChannel"] = df["BusChannel"].astype(float)
+        df.iloc[0, df.columns.get_loc("BusChannel")] = np.nan
+        statistics = can_decoder.DecodeStatistics()
+
+        result = can_decoder.DataFrameDecoder(rules).decode_frame(df, statistics=statistics)
+
+        assert list(result["Signal"]) == ["Counter", "Torque", "EngineSpeed", "Counter"]
+        assert statistics.unknown_channels == {None: 1, 3: 1}
+
+        return
+
+    pass
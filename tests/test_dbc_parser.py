@@ -0,0 +1,291 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+import can_decoder
+
+from can_decoder.DBCParser import DBCParser
+
+
+DBC_J1939 = b"""VERSION ""
+
+NS_ :
+    CM_
+    BA_DEF_
+
+BS_:
+
+BU_: Vector__XXX
+
+BO_ 2364540158 EEC1: 8 Vector__XXX
+ SG_ EngineSpeed : 24|16@1+ (0.125,0) [0|8031.875] "rpm" Vector__XXX
+ SG_ EngineTorqueMode : 0|4@1+ (1,0) [0|15] "" Vector__XXX
+ SG_ ActualEngineTorque : 16|8@1- (1,-125) [-125|125] "%" Vector__XXX
+
+BO_ 2566844926 CCVS1: 8 Vector__XXX
+ SG_ WheelBasedVehicleSpeed : 8|16@1+ (0.00390625,0) [0|250.996] "km/h" Vector__XXX
+ SG_ CruiseControlSetSpeed : 40|32@1+ (1,0) [0|1] "" Vector__XXX
+
+BO_ 3221225472 VECTOR__INDEPENDENT_SIG_MSG: 0 Vector__XXX
+ SG_ Unused : 0|8@1+ (1,0) [0|0] "" Vector__XXX
+
+CM_ SG_ 2364540158 EngineSpeed "Actual engine speed.
+BO_ 1 Fake: 8 Vector__XXX
+ SG_ Fake : 0|8@1+ (1,0) [0|0] "" Vector__XXX";
+BA_DEF_ SG_  "SPN" INT 0 524287;
+BA_DEF_  "ProtocolType" STRING ;
+BA_DEF_ BO_  "VFrameFormat" ENUM  "StandardCAN","ExtendedCAN","reserved","J1939PG";
+BA_DEF_DEF_  "SPN" 0;
+BA_ "ProtocolType" "J1939";
+BA_ "VFrameFormat" BO_ 2364540158 3;
+BA_ "SPN" SG_ 2364540158 EngineSpeed 190;
+BA_ "SPN" SG_ 2566844926 WheelBasedVehicleSpeed 84;
+VAL_ 2364540158 EngineTorqueMode 0 "Low idle governor" 1 "Accelerator pedal" 15 "Not available" ;
+SIG_VALTYPE_ 2566844926 CruiseControlSetSpeed : 1;
+"""
+
+DBC_OBD2 = b"""VERSION ""
+
+BO_ 2024 OBD2: 8 Vector__XXX
+ SG_ S1_PID_0D_VehicleSpeed m13 : 31|8@0+ (1,0) [0|255] "km/h" Vector__XXX
+ SG_ S1_PID_0C_EngineRPM m12 : 31|16@0+ (0.25,0) [0|16383.75] "rpm" Vector__XXX
+ SG_ ParameterID_Service01 m1M : 23|8@0+ (1,0) [0|255] "" Vector__XXX
+ SG_ service M : 11|4@0+ (1,0) [0|15] "" Vector__XXX
+ SG_ response : 15|4@0+ (1,0) [0|15] "" Vector__XXX
+ SG_ length : 7|8@0+ (1,0) [0|8] "" Vector__XXX
+
+BA_DEF_  "ProtocolType" STRING ;
+BA_ "ProtocolType" "OBD2";
+SG_MUL_VAL_ 2024 S1_PID_0D_VehicleSpeed ParameterID_Service01 13-13;
+SG_MUL_VAL_ 2024 S1_PID_0C_EngineRPM ParameterID_Service01 12-12, 16-17;
+SG_MUL_VAL_ 2024 ParameterID_Service01 service 1-1;
+"""
+
+
+def build_nested_dbc(values: int) -> bytes:
+    """Create a DBC file with a frame using two levels of extended multiplexing, with values * values leaf signals.
+    """
+    lines = [
+        "VERSION \"\"",
+        "",
+        "BO_ 2024 Nested: 8 Vector__XXX",
+        " SG_ Outer M : 0|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+    ]
+    mux_values = []
+
+    for outer in range(values):
+        lines.append(" SG_ Inner{0} m{0}M : 8|8@1+ (1,0) [0|255] \"\" Vector__XXX".format(outer))
+        mux_values.append("SG_MUL_VAL_ 2024 Inner{0} Outer {0}-{0};".format(outer))
+
+        for inner in range(values):
+            lines.append(" SG_ Value{0}_{1} m{1} : 16|16@1+ (0.5,0) [0|0] \"\" Vector__XXX".format(outer, inner))
+            mux_values.append("SG_MUL_VAL_ 2024 Value{0}_{1} Inner{0} {1}-{1};".format(outer, inner))
+
+    return "\n".join(lines + [""] + mux_values + [""]).encode("utf-8")
+
+
+def mux_key_order(key) -> tuple:
+    # Simple multiplexing files the plain signals of the frame under the value None. Extended multiplexing can use
+    # ranges of values.
+    if key is None:
+        return False, 0, 0
+    elif isinstance(key, range):
+        return True, key.start, key.stop
+
+    return True, key, key + 1
+
+
+def signal_tree(signal: can_decoder.Signal) -> tuple:
+    groups = sorted(signal.signals.items(), key=lambda item: mux_key_order(item[0]))
+
+    return signal._get_tuple() + (
+        tuple((key, tuple(signal_tree(entry) for entry in group)) for key, group in groups),
+    )
+
+
+def db_tree(db: can_decoder.SignalDB) -> tuple:
+    return db.protocol, tuple(
+        (frame_id, frame.size, frame.name, tuple(signal_tree(signal) for signal in frame.signals))
+        for frame_id, frame in sorted(db.frames.items())
+        if frame.name != "VECTOR__INDEPENDENT_SIG_MSG"
+    )
+
+
+class TestDBCParser(object):
+
+    def test_parse_j1939(self):
+        uut = DBCParser().parse(BytesIO(DBC_J1939))
+
+        assert uut.attributes == {"ProtocolType": "J1939"}
+
+        # The independent signals and the lines within the comment are ignored.
+        assert sorted(uut.frames.keys()) == [0x8CF004FE, 0x98FEF1FE]
+
+        frame = uut.frames[0x8CF004FE]
+        assert frame.name == "EEC1"
+        assert frame.attributes == {"VFrameFormat": "J1939PG"}
+
+        engine_speed = frame.signal_by_name("EngineSpeed")
+        assert (engine_speed.start_bit, engine_speed.size, engine_speed.factor) == (24, 16, 0.125)
+        assert engine_speed.attributes == {"SPN": "190"}
+
+        torque = frame.signal_by_name("ActualEngineTorque")
+        assert torque.is_signed is True
+        assert torque.offset == -125.0
+
+        torque_mode = frame.signal_by_name("EngineTorqueMode")
+        assert torque_mode.values == {0: "Low idle governor", 1: "Accelerator pedal", 15: "Not available"}
+
+        assert uut.frames[0x98FEF1FE].signal_by_name("CruiseControlSetSpeed").is_float is True
+
+        return
+
+    def test_load_j1939(self):
+        db = can_decoder.load_dbc(BytesIO(DBC_J1939), use_custom_attribute="SPN")
+
+        assert db.protocol == "J1939"
+
+        frame = db.frames[0x8CF004FE]
+        assert [signal.name for signal in frame.signals] == ["190", "EngineTorqueMode", "ActualEngineTorque"]
+        assert isinstance(frame.signals[0].factor, float)
+
+        return
+
+    def test_load_obd2(self):
+        db = can_decoder.load_dbc(BytesIO(DBC_OBD2))
+
+        assert db.protocol == "OBD2"
+
+        frame = db.frames[0x7E8]
+        assert [signal.name for signal in frame.signals] == ["service", "response", "length"]
+
+        service = frame.signals[0]
+        assert service.start_bit == 12
+        assert service.size == 4
+        assert list(service.signals.keys()) == [1]
+
+        pid = service.signals[1][0]
+        assert pid.name == "ParameterID_Service01"
+        assert pid.start_bit == 16
+        assert list(pid.signals.keys()) == [13, 12, range(16, 18)]
+        assert pid.signals[12][0] is pid.signals[range(16, 18)][0]
+
+        engine_speed = pid.signals[12][0]
+        assert engine_speed.start_bit == 24
+        assert engine_speed.is_little_endian is False
+
+        # Decode an engine speed response.
+        records = [{"TimeStamp": 0, "ID": 0x7E8, "IDE": False, "DataBytes": [0x04, 0x41, 0x0C, 0x32, 0x32, 0, 0, 0]}]
+        result = list(can_decoder.IteratorDecoder(records, db))
+
+        assert [(decoded.Signal, decoded.SignalValuePhysical) for decoded in result] == [
+            ("S1_PID_0C_EngineRPM", 3212.5),
+            ("response", 4.0),
+            ("length", 4.0),
+        ]
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 8},), (None,)])
+    def test_load_simple_multiplexing(self, kwargs: dict):
+        dbc = "\n".join([
+            "VERSION \"\"",
+            "",
+            "BO_ 2024 Simple: 8 Vector__XXX",
+            " SG_ M M : 0|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+            " SG_ A m1 : 8|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+            " SG_ P : 16|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+            "",
+        ]).encode("utf-8")
+        db = can_decoder.load_dbc(BytesIO(dbc))
+
+        records = [
+            {"TimeStamp": 0, "ID": 2024, "IDE": False, "DataBytes": [0x01, 0x02, 0x03, 0x00, 0x00, 0x00, 0x00, 0x00]},
+            {"TimeStamp": 1, "ID": 2024, "IDE": False, "DataBytes": [0x02, 0x04, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00]},
+        ]
+
+        if kwargs is None:
+            df = can_decoder.DataFrameDecoder(db).decode_frame(pd.DataFrame(records).set_index("TimeStamp"))
+            result = list(zip(df["Signal"], df["Raw Value"]))
+        else:
+            result = [
+                (decoded.Signal, decoded.SignalValueRaw)
+                for decoded in can_decoder.IteratorDecoder(records, db, **kwargs)
+            ]
+
+        # The plain signal is decoded once, as part of the frame, and the second record has no group for its value.
+        assert [(name, int(value)) for name, value in result] == [("A", 2), ("P", 3), ("P", 5)]
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 8},)])
+    def test_load_mux_value_range(self, kwargs: dict):
+        dbc = "\n".join([
+            "VERSION \"\"",
+            "",
+            "BO_ 2024 Ranges: 8 Vector__XXX",
+            " SG_ Selector M : 0|16@1+ (1,0) [0|65535] \"\" Vector__XXX",
+            " SG_ Any m0 : 16|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+            " SG_ Five m5 : 24|8@1+ (1,0) [0|255] \"\" Vector__XXX",
+            "",
+            "SG_MUL_VAL_ 2024 Any Selector 0-65535;",
+            "SG_MUL_VAL_ 2024 Five Selector 5-5;",
+            "",
+        ]).encode("utf-8")
+        db = can_decoder.load_dbc(BytesIO(dbc))
+
+        # The range is kept as a single group instead of a group per value.
+        selector = db.frames[2024].signals[0]
+        assert list(selector.signals.keys()) == [range(0, 0x10000), 5]
+
+        payloads = [[0x05, 0x00, 0x10, 0x20], [0xFF, 0xFF, 0x11, 0x21], [0xE8, 0x03, 0x12, 0x22]]
+        records = [
+            {"TimeStamp": i, "ID": 2024, "IDE": False, "DataBytes": payload + [0x00] * 4}
+            for i, payload in enumerate(payloads)
+        ]
+        result = [
+            (decoded.Signal, decoded.SignalValueRaw)
+            for decoded in can_decoder.IteratorDecoder(records, db, **kwargs)
+            if decoded.Signal != "Selector"
+        ]
+
+        assert result == [("Any", 0x10), ("Five", 0x20), ("Any", 0x11), ("Any", 0x12)]
+
+        return
+
+    def test_load_nested_extended_multiplexing(self):
+        db = can_decoder.load_dbc(BytesIO(build_nested_dbc(24)))
+
+        outer = db.frames[2024].signals[0]
+        assert outer.name == "Outer"
+        assert list(outer.signals.keys()) == list(range(24))
+
+        for outer_value, group in outer.signals.items():
+            assert [signal.name for signal in group] == ["Inner{}".format(outer_value)]
+            assert [
+                [signal.name for signal in inner_group] for inner_group in group[0].signals.values()
+            ] == [["Value{}_{}".format(outer_value, inner_value)] for inner_value in range(24)]
+
+        assert len(db.signals()) == 1 + 24 + 24 * 24
+
+        return
+
+    def test_unknown_parser(self):
+        with pytest.raises(ValueError):
+            can_decoder.load_dbc(BytesIO(DBC_OBD2), parser="unknown")
+
+        return
+
+    @pytest.mark.env("canmatrix")
+    @pytest.mark.parametrize(("dbc",), [(DBC_J1939,), (DBC_OBD2,), (build_nested_dbc(4),)])
+    def test_same_as_canmatrix(self, dbc: bytes):
+        pytest.importorskip("canmatrix")
+
+        native = can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN")
+        reference = can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN", parser="canmatrix")
+
+        assert db_tree(native) == db_tree(reference)
+
+        return
+
+    pass
@@ -0,0 +1,155 @@
+import warnings
+
+import pandas as pd
+import pytest
+import can_decoder
+
+
+class TestDecodeDiagnostics(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def db(self, protocol):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        signal_load = can_decoder.Signal(
+            signal_name="Load",
+            signal_start_bit=48,
+            signal_size=8,
+        )
+
+        frame.add_signal(signal_torque)
+        frame.add_signal(signal_engine_speed)
+        frame.add_signal(signal_load)
+
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        # Too short for the engine speed (mismatched) and the load (missing).
+        return [
+            {
+                "TimeStamp": 1577836800000000000 + i * 1000000,
+                "ID": 0x0CF004FE,
+                "IDE": True,
+                "DataBytes": [0x00, 0x82, 0x00, 0x10],
+            }
+            for i in range(10)
+        ]
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 4},)])
+    def test_iterator(self, db, records, kwargs: dict):
+        uut = can_decoder.IteratorDecoder(records, db, **kwargs)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = list(uut)
+
+        assert [decoded.Signal for decoded in result] == ["Torque"] * 10
+
+        # A single summary warning for all records.
+        assert len(caught) == 1
+        assert issubclass(caught[0].category, can_decoder.DataSizeMismatchWarning)
+        assert "EngineSpeed (10)" in str(caught[0].message)
+        assert "Load (10)" in str(caught[0].message)
+
+        assert uut.diagnostics.as_dict() == {
+            "missing_data": {"Load": 10},
+            "size_mismatches": {"EngineSpeed": 10},
+        }
+
+        # A new iteration starts a new report.
+        uut._wrapped = []
+
+        assert list(uut) == []
+        assert not uut.diagnostics
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_dataframe(self, db, records):
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        uut = can_decoder.DataFrameDecoder(db)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            result = uut.decode_frame(df)
+
+        assert len(caught) == 1
+        assert issubclass(caught[0].category, can_decoder.CANDecoderWarning)
+
+        diagnostics = result.attrs["diagnostics"]
+        assert diagnostics is uut.diagnostics
+        assert sum(diagnostics.missing_data.values()) + sum(diagnostics.size_mismatches.values()) == 20
+
+        return
+
+    def test_without_errors(self, db, records):
+        for record in records:
+            record["DataBytes"] = [0x00] * 8
+
+        uut = can_decoder.IteratorDecoder(records, db)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = list(uut)
+
+        assert len(result) == 30
+        assert not uut.diagnostics
+
+        return
+
+    def test_with_statistics(self, db, records):
+        statistics = can_decoder.DecodeStatistics()
+        uut = can_decoder.IteratorDecoder(records, db, statistics=statistics)
+
+        # Counted in the statistics instead.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            list(uut)
+
+        assert statistics.size_mismatches == {"EngineSpeed": 10, "Load": 10}
+        assert uut.diagnostics.missing_data == {"Load": 10}
+
+        return
+
+    def test_missing_only(self):
+        diagnostics = can_decoder.DecodeDiagnostics()
+        diagnostics.missing_data["Load"] += 2
+
+        with pytest.warns(can_decoder.MissingDataWarning, match="no data found for Load \\(2\\)"):
+            diagnostics.warn()
+
+        diagnostics.reset()
+
+        assert not diagnostics
+
+        return
+
+    pass
@@ -0,0 +1,163 @@
+import pandas as pd
+import pytest
+import can_decoder
+
+
+def get_entries(profiler: can_decoder.DecodeProfiler, kind: str) -> dict:
+    return {entry["Name"]: entry for entry in profiler.as_dict()[kind]}
+
+
+class TestDecodeProfiler(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def db(self, protocol):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame_eec1 = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8,
+            frame_name="EEC1"
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        frame_eec1.add_signal(signal_torque)
+        frame_eec1.add_signal(signal_engine_speed)
+
+        frame_eec2 = can_decoder.Frame(
+            frame_id=0x8CF00300,
+            frame_size=8,
+            frame_name="EEC2"
+        )
+
+        signal_load = can_decoder.Signal(
+            signal_name="Load",
+            signal_start_bit=16,
+            signal_size=8,
+        )
+
+        frame_eec2.add_signal(signal_load)
+
+        db.add_frame(frame_eec1)
+        db.add_frame(frame_eec2)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        entries = [
+            (0x0CF004FE, [0x00, 0x82, 0x00, 0x10, 0x20, 0x00, 0x00, 0x00]),
+            (0x0CF00300, [0x00, 0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00]),
+            (0x0CF004FE, [0x00, 0x82, 0x00, 0x10, 0x21, 0x00, 0x00, 0x00]),
+            (0x0CF00500, [0x00] * 8),
+        ]
+
+        return [
+            {"TimeStamp": 1577836800000000000 + i * 1000000, "ID": frame_id, "IDE": True, "DataBytes": data}
+            for i, (frame_id, data) in enumerate(entries)
+        ]
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 16},)])
+    def test_iterator(self, db, records, kwargs: dict):
+        uut = can_decoder.IteratorDecoder(records, db, **kwargs)
+
+        with uut.profile() as profiler:
+            result = list(uut)
+
+        assert len(result) == 5
+
+        frames = get_entries(profiler, "frames")
+        assert set(frames.keys()) == {"EEC1", "EEC2"}
+        assert frames["EEC1"]["Frame ID"] == 0x8CF004FE
+        assert frames["EEC1"]["Rows"] == 2
+        assert frames["EEC2"]["Rows"] == 1
+        assert frames["EEC1"]["Time"] > 0
+        assert frames["EEC1"]["Bytes"] is None
+
+        signals = get_entries(profiler, "signals")
+        assert set(signals.keys()) == {"Torque", "EngineSpeed", "Load"}
+        assert signals["EngineSpeed"]["Frame ID"] == 0x8CF004FE
+        assert signals["EngineSpeed"]["Rows"] == 2
+        assert signals["Load"]["Rows"] == 1
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_dataframe(self, db, records):
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        uut = can_decoder.DataFrameDecoder(db)
+
+        profiler = can_decoder.DecodeProfiler(trace_memory=True)
+
+        with uut.profile(profiler):
+            uut.decode_frame(df)
+            uut.decode_frame(df)
+
+        # Nothing is recorded outside the context.
+        uut.decode_frame(df)
+
+        frames = get_entries(profiler, "frames")
+        assert frames["EEC1"]["Calls"] == 2
+        assert frames["EEC1"]["Rows"] == 4
+        assert frames["EEC1"]["Bytes"] is not None
+
+        signals = get_entries(profiler, "signals")
+        assert signals["Torque"]["Calls"] == 2
+        assert signals["Torque"]["Rows"] == 4
+
+        return
+
+    def test_to_data_frame(self, db, records):
+        uut = can_decoder.IteratorDecoder(records, db)
+
+        with uut.profile() as profiler:
+            list(uut)
+
+        result = profiler.to_data_frame()
+
+        assert list(result.columns) == ["Frame ID", "Name", "Calls", "Rows", "Time", "Bytes"]
+        assert set(result["Name"]) == {"EEC1", "EEC2"}
+        assert result["Time"].is_monotonic_decreasing
+
+        assert len(profiler.to_data_frame("signals")) == 3
+
+        with pytest.raises(ValueError):
+            profiler.to_data_frame("records")
+
+        profiler.reset()
+
+        assert profiler.as_dict() == {"frames": [], "signals": []}
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [("J1939",)])
+    def test_listener(self, db, records):
+        uut = can_decoder.ListenerDecoder(db)
+
+        with uut.profile() as profiler:
+            for record in records:
+                uut.on_message(record["TimeStamp"], record["ID"], record["IDE"], record["DataBytes"])
+
+        assert get_entries(profiler, "frames")["EEC1"]["Rows"] == 2
+
+        return
+
+    pass
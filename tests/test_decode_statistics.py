@@ -0,0 +1,139 @@
+import warnings
+
+import pandas as pd
+import pytest
+import can_decoder
+
+
+class TestDecodeStatistics(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def db(self, protocol):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        frame.add_signal(signal_torque)
+        frame.add_signal(signal_engine_speed)
+
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        entries = [
+            # Valid frame.
+            (0x0CF004FE, True, [0x00, 0x82, 0x00, 0x10, 0x20, 0x00, 0x00, 0x00]),
+            # Invalid (not available) engine speed.
+            (0x0CF004FE, True, [0x00, 0x82, 0x00, 0xFF, 0xFF, 0x00, 0x00, 0x00]),
+            # Too short for the engine speed.
+            (0x0CF004FE, True, [0x00, 0x82, 0x00, 0x10]),
+            # Unknown IDs.
+            (0x0CF00500, True, [0x00] * 8),
+            (0x0CF00500, True, [0x00] * 8),
+            (0x123, False, [0x00] * 8),
+        ]
+
+        return [
+            {"TimeStamp": 1577836800000000000 + i * 1000000, "ID": frame_id, "IDE": ide, "DataBytes": data}
+            for i, (frame_id, ide, data) in enumerate(entries)
+        ]
+
+    @pytest.mark.parametrize(("protocol",), [("J1939",)])
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 16},)])
+    def test_iterator(self, db, records, kwargs: dict):
+        statistics = can_decoder.DecodeStatistics()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = list(can_decoder.IteratorDecoder(
+                records, db, statistics=statistics, **kwargs
+            ))
+
+        assert len(result) == 4
+        assert statistics.frames_seen == 6
+        assert statistics.frames_decoded == 3
+        assert statistics.top_unknown_ids() == [(0x8CF00500, 2), (0x123, 1)]
+        assert statistics.invalid_values == {"EngineSpeed": 1}
+        assert statistics.size_mismatches == {"EngineSpeed": 1}
+        assert statistics.phase_times["decode"] > 0
+
+        return
+
+    def test_iterator_generic(self, db, records):
+        statistics = can_decoder.DecodeStatistics()
+
+        result = list(can_decoder.IteratorDecoder(records, db, statistics=statistics))
+
+        # No values are invalid for generic decoding.
+        assert len(result) == 5
+        assert statistics.frames_decoded == 3
+        assert statistics.unknown_ids == {0x8CF00500: 2, 0x123: 1}
+        assert statistics.invalid_values == {}
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_dataframe(self, db, records):
+        statistics = can_decoder.DecodeStatistics()
+
+        # Decode the frames of each length separately, as the data of a frame is decoded as a single array.
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        lengths = df["DataBytes"].apply(len)
+
+        uut = can_decoder.DataFrameDecoder(db)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            uut.decode_frame(df[lengths == 8], statistics=statistics)
+            uut.decode_frame(df[lengths == 4], statistics=statistics)
+
+        assert statistics.frames_seen == 6
+        assert statistics.frames_decoded == 3
+        assert statistics.unknown_ids == {0x8CF00500: 2, 0x123: 1}
+        assert statistics.size_mismatches == {"EngineSpeed": 1}
+        assert statistics.invalid_values == ({} if db.protocol is None else {"EngineSpeed": 1})
+        assert set(statistics.phase_times.keys()) == {"decode", "output"}
+
+        return
+
+    def test_as_dict_and_reset(self, db, records):
+        statistics = can_decoder.DecodeStatistics()
+        list(can_decoder.IteratorDecoder(records, db, statistics=statistics))
+
+        result = statistics.as_dict()
+
+        assert result["frames_seen"] == 6
+        assert result["unknown_ids"] == {0x8CF00500: 2, 0x123: 1}
+
+        statistics.reset()
+
+        assert statistics.frames_seen == 0
+        assert statistics.as_dict()["unknown_ids"] == {}
+
+        return
+
+    pass
@@ -0,0 +1,182 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+import can_decoder
+
+
+async def async_source(frames, fail_after=None):
+    for i, frame in enumerate(frames):
+        if fail_after is not None and i == fail_after:
+            raise IOError("Connection lost")
+
+        # Hand control back to the loop, like a socket reader would.
+        await asyncio.sleep(0)
+        yield frame
+
+
+async def collect(uut):
+    result = []
+
+    async for decoded in uut:
+        result.append(decoded)
+
+    return result
+
+
+class TestIteratorAsync(object):
+
+    @pytest.fixture()
+    def db_j1939(self):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol="J1939")
+
+        frame = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+            signal_offset=0,
+            signal_is_little_endian=True,
+            signal_is_float=False,
+            signal_is_signed=False,
+        )
+
+        frame.add_signal(signal_engine_speed)
+
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def frames(self):
+        timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        frames = []
+        for i in range(100):
+            frames.append({
+                "TimeStamp": (timestamp.timestamp() + i) * 1E9,
+                "ID": 0x0CF004FE,
+                "IDE": True,
+                "DataBytes": [0x10, 0x7D, 0x82, i, 0x12, 0x00, 0xF4, 0x82]
+            })
+
+        return frames
+
+    @pytest.mark.parametrize(
+        ("batch_size", "executor_threshold"),
+        [(1, 256), (16, 256), (1024, 1), (1024, 1024)]
+    )
+    def test_matches_iterator(self, db_j1939, frames, batch_size: int, executor_threshold: int):
+        expected = list(can_decoder.IteratorDecoder(frames, db_j1939))
+
+        uut = can_decoder.AsyncIteratorDecoder(
+            async_source(frames),
+            db_j1939,
+            batch_size=batch_size,
+            executor_threshold=executor_threshold
+        )
+
+        result = asyncio.run(collect(uut))
+
+        assert len(result) == len(frames)
+        assert result == expected
+
+        return
+
+    def test_custom_executor(self, db_j1939, frames):
+        expected = list(can_decoder.IteratorDecoder(frames, db_j1939))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            uut = can_decoder.AsyncIteratorDecoder(
+                async_source(frames),
+                db_j1939,
+                executor_threshold=1,
+                executor=executor
+            )
+
+            result = asyncio.run(collect(uut))
+
+        assert result == expected
+
+        return
+
+    def test_source_exception(self, db_j1939, frames):
+        uut = can_decoder.AsyncIteratorDecoder(async_source(frames, fail_after=10), db_j1939)
+
+        result = []
+
+        async def run():
+            async for decoded in uut:
+                result.append(decoded)
+
+        with pytest.raises(IOError):
+            asyncio.run(run())
+
+        # All records read before the failure are still decoded.
+        assert len(result) == 10
+
+        return
+
+    def test_close(self, db_j1939, frames):
+        uut = can_decoder.AsyncIteratorDecoder(async_source(frames), db_j1939)
+
+        async def run():
+            first = await uut.__anext__()
+            await uut.aclose()
+
+            with pytest.raises(StopAsyncIteration):
+                await uut.__anext__()
+
+            return first
+
+        first = asyncio.run(run())
+
+        assert first.Signal == "EngineSpeed"
+
+        return
+
+    def test_cancelled(self, db_j1939, frames):
+        async def stalled_source():
+            yield frames[0]
+
+            # No more records arrive, like on an idle connection.
+            await asyncio.Event().wait()
+
+        uut = can_decoder.AsyncIteratorDecoder(stalled_source(), db_j1939)
+
+        async def run():
+            first = await uut.__anext__()
+
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(uut.__anext__(), 0.01)
+
+            # The background task does not keep waiting on the source.
+            await asyncio.sleep(0)
+            assert uut._reader.cancelled()
+
+            with pytest.raises(StopAsyncIteration):
+                await uut.__anext__()
+
+            return first
+
+        first = asyncio.run(run())
+
+        assert first.Signal == "EngineSpeed"
+
+        return
+
+    def test_invalid_batch_size(self, db_j1939):
+        with pytest.raises(ValueError):
+            can_decoder.AsyncIteratorDecoder(async_source([]), db_j1939, batch_size=0)
+
+        return
+
+    pass
@@ -0,0 +1,108 @@
+import time
+
+from datetime import datetime, timezone
+from random import Random
+
+import pytest
+import can_decoder
+
+
+def build_db(protocol=None) -> can_decoder.SignalDB:
+    db = can_decoder.SignalDB(protocol=protocol)
+
+    # Plain frame with signed, big endian and invalid (for J1939) values.
+    frame = can_decoder.Frame(frame_id=0x8CF004FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal("Signed", 0, 12, signal_is_signed=True, signal_factor=0.5))
+    frame.add_signal(can_decoder.Signal("Unsigned", 16, 8, signal_offset=-40.0))
+    frame.add_signal(can_decoder.Signal("BigEndian", 32, 16, signal_is_little_endian=False, signal_factor=0.125))
+    db.add_frame(frame)
+
+    # Nested multiplexed frame, similar to OBD2.
+    frame = can_decoder.Frame(frame_id=0x98DAF100, frame_size=8)
+    service = can_decoder.Signal("Service", 8, 8, signal_is_little_endian=False)
+    pid = can_decoder.Signal("PID", 16, 8, signal_is_little_endian=False)
+    pid.add_multiplexed_signal(0x0C, can_decoder.Signal("EngineRPM", 24, 16, False, signal_factor=0.25))
+    pid.add_multiplexed_signal(0x0D, can_decoder.Signal("VehicleSpeed", 24, 8, False))
+    pid.add_multiplexed_signal(0x0D, can_decoder.Signal("Extra", 32, 8, False))
+    service.add_multiplexed_signal(0x41, pid)
+    frame.add_signal(can_decoder.Signal("Length", 0, 8, False))
+    frame.add_signal(service)
+    db.add_frame(frame)
+
+    return db
+
+
+def build_records(count: int):
+    rng = Random(42)
+    records = []
+
+    for i in range(count):
+        choice = rng.randint(0, 3)
+
+        if choice == 0:
+            record_id = 0x0CF004FE
+            data = [rng.randint(0, 255) for _ in range(8)]
+        elif choice == 1:
+            record_id = 0x18DAF100
+            data = [rng.randint(0, 8), 0x41, rng.choice([0x0C, 0x0D, 0x0E])] + [rng.randint(0, 255) for _ in range(5)]
+        elif choice == 2:
+            # Unknown frame.
+            record_id = 0x123
+            data = [rng.randint(0, 255) for _ in range(8)]
+        else:
+            # Known frame, but with a different payload length.
+            record_id = 0x0CF004FE
+            data = [rng.randint(0, 255) for _ in range(6)]
+
+        records.append({
+            "TimeStamp": (datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp() + i * 1E-3) * 1E9,
+            "ID": record_id,
+            "IDE": record_id > 0x7FF,
+            "DataBytes": data,
+        })
+
+    return records
+
+
+class TestIteratorBatch(object):
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("batch_size",), [(2,), (7,), (64,), (1000,)])
+    def test_matches_record_by_record(self, protocol, batch_size: int):
+        db = build_db(protocol)
+        records = build_records(500)
+
+        expected = list(can_decoder.IteratorDecoder(records, db))
+        result = list(can_decoder.IteratorDecoder(records, db, batch_size=batch_size))
+
+        assert len(expected) > 0
+        assert result == expected
+
+        return
+
+    def test_max_delay(self):
+        db = build_db()
+        records = build_records(20)
+        consumed = []
+
+        def slow_source():
+            for record in records:
+                consumed.append(record)
+                time.sleep(0.01)
+                yield record
+
+        uut = iter(can_decoder.IteratorDecoder(slow_source(), db, batch_size=1000, max_delay=0.025))
+        next(uut)
+
+        # The batch should have been cut short by the delay, well before reading all records.
+        assert len(consumed) < len(records)
+
+        return
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            can_decoder.IteratorDecoder([], build_db(), batch_size=0)
+
+        return
+
+    pass
@@ -0,0 +1,196 @@
+from random import Random
+
+import pytest
+import can_decoder
+
+
+class TestIteratorFrameOutput(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def frame_obd2(self):
+        # OBD2 response frame, with the PID nested in the service.
+        frame = can_decoder.Frame(
+            frame_id=0x000007E8,
+            frame_size=8
+        )
+
+        signal_length = can_decoder.Signal(
+            signal_name="Length",
+            signal_start_bit=0,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_service = can_decoder.Signal(
+            signal_name="Service",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_pid = can_decoder.Signal(
+            signal_name="PID",
+            signal_start_bit=16,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_engine_rpm = can_decoder.Signal(
+            signal_name="EngineRPM",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.25,
+            signal_is_little_endian=False,
+        )
+
+        signal_vehicle_speed = can_decoder.Signal(
+            signal_name="VehicleSpeed",
+            signal_start_bit=24,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_intake_temperature = can_decoder.Signal(
+            signal_name="IntakeTemperature",
+            signal_start_bit=24,
+            signal_size=8,
+            signal_offset=-40.0,
+            signal_is_little_endian=False,
+        )
+
+        signal_pid.add_multiplexed_signal(0x0C, signal_engine_rpm)
+        signal_pid.add_multiplexed_signal(0x0D, signal_vehicle_speed)
+        signal_pid.add_multiplexed_signal(0x0F, signal_intake_temperature)
+        signal_service.add_multiplexed_signal(0x41, signal_pid)
+
+        frame.add_signal(signal_length)
+        frame.add_signal(signal_service)
+
+        return frame
+
+    @pytest.fixture()
+    def db(self, protocol, frame_obd2):
+        # Setup decoding rules, a J1939 frame next to the OBD2 responses.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame_eec1 = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        signal_temperature = can_decoder.Signal(
+            signal_name="Temperature",
+            signal_start_bit=48,
+            signal_size=12,
+            signal_is_signed=True,
+        )
+
+        frame_eec1.add_signal(signal_torque)
+        frame_eec1.add_signal(signal_engine_speed)
+        frame_eec1.add_signal(signal_temperature)
+
+        db.add_frame(frame_eec1)
+        db.add_frame(frame_obd2)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        # Random records, half of them OBD2 responses. The responses include the unsupported PID 0x0E.
+        rng = Random(3)
+        records = []
+
+        for i in range(300):
+            if rng.random() < 0.5:
+                frame_id, ide, data = 0x0CF004FE, True, [rng.randint(0, 255) for _ in range(8)]
+            else:
+                data = [4, 0x41, rng.choice([0x0C, 0x0D, 0x0E, 0x0F])] + [rng.randint(0, 255) for _ in range(5)]
+                frame_id, ide = 0x7E8, False
+
+            records.append({
+                "TimeStamp": 1577836800000000000 + i * 1000000,
+                "ID": frame_id,
+                "IDE": ide,
+                "DataBytes": data,
+            })
+
+        return records
+
+    def test_leaf_signals(self, frame_obd2):
+        names = [signal.name for signal in frame_obd2.leaf_signals()]
+
+        assert names == ["Length", "EngineRPM", "VehicleSpeed", "IntakeTemperature"]
+
+        return
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 32},)])
+    def test_matches_signal_output(self, db, records, kwargs: dict):
+        signals = list(can_decoder.IteratorDecoder(records, db, **kwargs))
+        frames = list(can_decoder.IteratorDecoder(records, db, output="frame", **kwargs))
+
+        assert len(frames) > 0
+        assert len(frames) < len(signals)
+
+        # Expand the frames to signals again, skipping absent values.
+        expanded = []
+        for frame in frames:
+            assert isinstance(frame, can_decoder.DecodedFrame)
+            assert len(frame.Signals) == len(frame.SignalValuesRaw) == len(frame.SignalValuesPhysical)
+
+            for name, raw, physical in zip(frame.Signals, frame.SignalValuesRaw, frame.SignalValuesPhysical):
+                if raw is None:
+                    continue
+
+                expanded.append(can_decoder.DecodedSignal(frame.TimeStamp, frame.CanID, name, raw, physical))
+
+        assert expanded == signals
+
+        return
+
+    def test_multiplexed_layout(self, frame_obd2):
+        db = can_decoder.SignalDB()
+        db.add_frame(frame_obd2)
+
+        records = [{
+            "TimeStamp": 1577836800000000000,
+            "ID": 0x7E8,
+            "IDE": False,
+            "DataBytes": [0x04, 0x41, 0x0D, 0x32, 0xAA, 0xAA, 0xAA, 0xAA],
+        }]
+
+        result = list(can_decoder.IteratorDecoder(records, db, output="frame"))
+
+        assert len(result) == 1
+        assert result[0].CanID == 0x7E8
+        assert result[0].Signals == ("Length", "EngineRPM", "VehicleSpeed", "IntakeTemperature")
+        assert result[0].SignalValuesRaw == (4, None, 0x32, None)
+        assert result[0].SignalValuesPhysical == (4.0, None, 50.0, None)
+
+        return
+
+    def test_unknown_output(self, db):
+        with pytest.raises(ValueError):
+            can_decoder.IteratorDecoder([], db, output="column")
+
+        return
+
+    pass
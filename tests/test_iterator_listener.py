@@ -0,0 +1,179 @@
+import queue
+
+from collections import namedtuple
+
+import pytest
+import can_decoder
+
+
+# Minimal stand-in for a python-can Message.
+Message = namedtuple("Message", ["timestamp", "arbitration_id", "is_extended_id", "is_error_frame", "is_remote_frame", "data"])
+
+
+class TestIteratorListener(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def db(self, protocol):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame_eec1 = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        frame_eec1.add_signal(signal_torque)
+        frame_eec1.add_signal(signal_engine_speed)
+
+        frame_ccvs = can_decoder.Frame(
+            frame_id=0x98FEF1FE,
+            frame_size=8
+        )
+
+        signal_wheel_speed = can_decoder.Signal(
+            signal_name="WheelSpeed",
+            signal_start_bit=8,
+            signal_size=16,
+            signal_factor=1 / 256,
+        )
+
+        frame_ccvs.add_signal(signal_wheel_speed)
+
+        db.add_frame(frame_eec1)
+        db.add_frame(frame_ccvs)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        return [
+            (1577836800000000000, 0x0CF004FE, True, bytes([0x10, 0x7D, 0x82, 0xBD, 0x12, 0x00, 0xF4, 0x82])),
+            (1577836800001000000, 0x18FEF1FE, True, bytes([0xF3, 0x00, 0x28, 0xC0, 0x00, 0x00, 0x00, 0x00])),
+            (1577836800002000000, 0x123, False, bytes([0x00] * 8)),
+            (1577836800003000000, 0x0CF004FE, True, bytes([0x10, 0x7E, 0x82, 0xBE, 0x12, 0x00, 0xF4, 0x82])),
+        ]
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_matches_iterator(self, db, records):
+        uut = can_decoder.ListenerDecoder(db)
+        subscription = uut.subscribe()
+
+        result = []
+        for record in records:
+            result.extend(uut.on_message(*record))
+
+        expected = list(can_decoder.IteratorDecoder(
+            [can_decoder.iterator.can_record(*record) for record in records], db, scalar=True
+        ))
+
+        assert len(result) == 5
+        assert result == expected
+        assert [subscription.get_nowait() for _ in range(len(subscription))] == expected
+
+        return
+
+    def test_filters(self, db, records):
+        uut = can_decoder.ListenerDecoder(db)
+        by_signal = uut.subscribe(signals=["EngineSpeed"])
+        by_frame = uut.subscribe(frames=[0x98FEF1FE])
+        both = uut.subscribe(signals=["Torque"], frames=[0x98FEF1FE])
+
+        for record in records:
+            uut.on_message(*record)
+
+        assert [by_signal.get_nowait().Signal for _ in range(len(by_signal))] == ["EngineSpeed", "EngineSpeed"]
+        assert [by_frame.get_nowait().Signal for _ in range(len(by_frame))] == ["WheelSpeed"]
+        assert [both.get_nowait().Signal for _ in range(len(both))] == ["Torque", "WheelSpeed", "Torque"]
+
+        return
+
+    @pytest.mark.parametrize(("drop_policy", "expected"), [("oldest", [0x12BE]), ("newest", [0x12BD])])
+    def test_drop_policy(self, db, records, drop_policy: str, expected):
+        uut = can_decoder.ListenerDecoder(db)
+        subscription = uut.subscribe(signals=["EngineSpeed"], maxsize=1, drop_policy=drop_policy)
+
+        for record in records:
+            uut.on_message(*record)
+
+        assert len(subscription) == 1
+        assert subscription.dropped == 1
+        assert [subscription.get_nowait().SignalValueRaw] == expected
+
+        with pytest.raises(queue.Empty):
+            subscription.get(timeout=0.01)
+
+        return
+
+    def test_statistics(self, db, records):
+        statistics = can_decoder.DecodeStatistics()
+        uut = can_decoder.ListenerDecoder(db, statistics=statistics)
+        subscription = uut.subscribe(frames=[0x8CF004FE])
+
+        for record in records:
+            uut.on_message(*record)
+
+        # Unknown IDs are counted, and not delivered.
+        assert statistics.frames_seen == 4
+        assert statistics.frames_decoded == 3
+        assert statistics.unknown_ids == {0x123: 1}
+        assert len(subscription) == 4
+
+        return
+
+    def test_unknown_drop_policy(self, db):
+        uut = can_decoder.ListenerDecoder(db)
+
+        with pytest.raises(ValueError):
+            uut.subscribe(drop_policy="block")
+
+        return
+
+    def test_python_can_message(self, db, records):
+        uut = can_decoder.ListenerDecoder(db)
+        subscription = uut.subscribe()
+
+        uut(Message(1577836800.0, 0x0CF004FE, True, False, False, bytearray(records[0][3])))
+        uut(Message(1577836800.0, 0x0CF004FE, True, True, False, bytearray(records[0][3])))
+
+        result = [subscription.get_nowait() for _ in range(len(subscription))]
+
+        assert [decoded.Signal for decoded in result] == ["Torque", "EngineSpeed"]
+        assert result[0].TimeStamp == 1577836800000000000
+
+        uut.stop()
+        uut(Message(1577836800.0, 0x0CF004FE, True, False, False, bytearray(records[0][3])))
+
+        assert len(subscription) == 0
+
+        return
+
+    def test_unsubscribe(self, db, records):
+        uut = can_decoder.ListenerDecoder(db)
+        subscription = uut.subscribe()
+
+        uut.unsubscribe(subscription)
+        uut.on_message(*records[0])
+
+        assert len(subscription) == 0
+
+        return
+
+    pass
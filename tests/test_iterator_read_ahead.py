@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+import can_decoder
+
+
+def build_record(i: int) -> dict:
+    return {
+        "TimeStamp": 1577836800000000000 + i * 1000000,
+        "ID": 0x0CF004FE,
+        "IDE": True,
+        "DataBytes": [0x00, i % 256, 0x00, i % 256, (i // 256) % 256, 0x00, 0x00, 0x00],
+    }
+
+
+class CountingSource(object):
+    """Record source counting the number of records read, optionally failing after a number of records.
+    """
+
+    def __init__(self, count=None, fail_after=None):
+        self.count = count
+        self.fail_after = fail_after
+        self.read = 0
+
+    def __iter__(self):
+        while self.count is None or self.read < self.count:
+            if self.read == self.fail_after:
+                raise IOError("Read failed")
+
+            self.read += 1
+            yield build_record(self.read)
+
+    pass
+
+
+class TestIteratorReadAhead(object):
+
+    @pytest.fixture()
+    def db(self):
+        # Setup decoding rules.
+        db = can_decoder.SignalDB()
+
+        frame = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        frame.add_signal(signal_torque)
+        frame.add_signal(signal_engine_speed)
+
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"batch_size": 16},), ({"scalar": True},)])
+    def test_matches_on_demand(self, db, kwargs: dict):
+        records = [build_record(i) for i in range(500)]
+
+        expected = list(can_decoder.IteratorDecoder(records, db, **kwargs))
+        result = list(can_decoder.IteratorDecoder(records, db, read_ahead=4, **kwargs))
+
+        assert len(result) == 1000
+        assert result == expected
+
+        return
+
+    @pytest.mark.parametrize(("batch_size",), [(1,), (16,)])
+    def test_exception(self, db, batch_size: int):
+        source = CountingSource(fail_after=40)
+        uut = can_decoder.IteratorDecoder(source, db, batch_size=batch_size, read_ahead=2)
+
+        result = []
+
+        with pytest.raises(IOError):
+            for decoded in uut:
+                result.append(decoded)
+
+        # All records read before the failure are decoded.
+        assert len(result) == 80
+
+        # The iteration has ended.
+        with pytest.raises(StopIteration):
+            next(uut)
+
+        return
+
+    def test_backpressure_and_close(self, db):
+        source = CountingSource()
+        uut = iter(can_decoder.IteratorDecoder(source, db, batch_size=8, read_ahead=2))
+
+        next(uut)
+        time.sleep(0.2)
+
+        # One batch being decoded, two queued and one waiting for room in the queue.
+        assert source.read <= 4 * 8
+
+        uut.close()
+        read = source.read
+        time.sleep(0.2)
+
+        assert source.read == read
+        assert not any(thread.name == "IteratorDecoder read-ahead" for thread in threading.enumerate())
+
+        with pytest.raises(StopIteration):
+            next(uut)
+
+        return
+
+    def test_negative(self, db):
+        with pytest.raises(ValueError):
+            can_decoder.IteratorDecoder([], db, read_ahead=-1)
+
+        return
+
+    pass
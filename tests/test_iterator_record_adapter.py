@@ -0,0 +1,135 @@
+from collections import namedtuple
+
+import pytest
+import can_decoder
+
+from can_decoder.iterator import can_record, RecordAdapter
+
+
+# Minimal stand-in for a python-can Message.
+Message = namedtuple("Message", ["timestamp", "arbitration_id", "is_extended_id", "is_error_frame", "is_remote_frame", "data"])
+
+
+class MdfRecord(object):
+    """Object with the can_record fields as attributes, like the records from mdf_iter.
+    """
+    def __init__(self, time_stamp, can_id, ide, data_bytes):
+        self.TimeStamp = time_stamp
+        self.ID = can_id
+        self.IDE = ide
+        self.DataBytes = data_bytes
+
+    pass
+
+
+class TestIteratorRecordAdapter(object):
+
+    @pytest.fixture()
+    def db(self):
+        db = can_decoder.SignalDB()
+
+        frame = can_decoder.Frame(frame_id=0x8CF004FE, frame_size=8)
+        frame.add_signal(can_decoder.Signal("EngineSpeed", 24, 16, signal_factor=0.125))
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def record(self):
+        return can_record(1577836800000000000, 0x0CF004FE, True, [0x10, 0x7D, 0x82, 0xBD, 0x12, 0x00, 0xF4, 0x82])
+
+    def test_formats(self, record):
+        uut = RecordAdapter()
+
+        assert uut(record) is record
+        assert uut(record._asdict()) == record
+        assert uut(tuple(record)) == record
+
+        mdf_record = MdfRecord(*record)
+        assert uut(mdf_record) is mdf_record
+
+        message = Message(record.TimeStamp / 1E9, record.ID, record.IDE, False, False, bytearray(record.DataBytes))
+        assert uut(message) == (1577836800000000000, record.ID, record.IDE, bytearray(record.DataBytes))
+
+        assert uut.malformed_records == 0
+        assert uut.skipped_records == 0
+
+        return
+
+    @pytest.mark.parametrize(("time_stamp", "expected"), [
+        (1577836800.123456789, 1577836800123456717),
+        # The nearest float is 1577836800.0999999046.
+        (1577836800.1, 1577836800099999905),
+        (1.5, 1500000000),
+        (0.000000001, 1),
+        (1577836800, 1577836800000000000),
+    ])
+    def test_python_can_time_stamp(self, time_stamp, expected: int):
+        uut = RecordAdapter()
+
+        assert uut(Message(time_stamp, 0x123, False, False, False, bytearray()))[0] == expected
+
+        return
+
+    @pytest.mark.env("pandas")
+    def test_python_can_time_stamp_matches_pandas(self):
+        import numpy as np
+        import pandas as pd
+
+        time_stamps = [1577836800 + i * 0.001 + i * 1.3E-7 for i in range(10000)]
+        uut = RecordAdapter()
+
+        result = [uut(Message(time_stamp, 0x123, False, False, False, bytearray()))[0] for time_stamp in time_stamps]
+
+        assert result == pd.to_datetime(np.array(time_stamps), unit="s").asi8.tolist()
+
+        return
+
+    def test_field_map(self, record):
+        uut = RecordAdapter(fields={"TimeStamp": "ts", "DataBytes": "data"})
+
+        assert uut({"ts": record.TimeStamp, "ID": record.ID, "IDE": record.IDE, "data": record.DataBytes}) == record
+
+        Custom = namedtuple("Custom", ["ts", "ID", "IDE", "data"])
+        assert uut(Custom(*record)) == record
+
+        with pytest.raises(ValueError):
+            RecordAdapter(fields={"Time": "ts"})
+
+        return
+
+    def test_malformed(self, record):
+        uut = RecordAdapter()
+
+        assert uut({"TimeStamp": 0, "ID": 0}) is None
+        assert uut((0, 0, False)) is None
+        assert uut(Message(0.0, 0x7FF, False, True, False, bytearray())) is None
+        assert uut(Message(0.0, 0x7FF, False, False, True, bytearray())) is None
+
+        assert uut.malformed_records == 2
+        assert uut.skipped_records == 2
+
+        return
+
+    def test_decoder(self, db, record, capsys):
+        records = [
+            record._asdict(),
+            {"TimeStamp": 0, "ID": 0x0CF004FE},
+            tuple(record),
+            Message(record.TimeStamp / 1E9, record.ID, record.IDE, False, False, bytearray(record.DataBytes)),
+            Message(0.0, record.ID, record.IDE, True, False, bytearray()),
+        ]
+
+        uut = can_decoder.IteratorDecoder(records, db)
+        result = list(uut)
+
+        assert [decoded.SignalValueRaw for decoded in result] == [0x12BD] * 3
+        assert uut.record_adapter.malformed_records == 1
+        assert uut.record_adapter.skipped_records == 1
+
+        # Nothing is printed for the malformed record.
+        assert capsys.readouterr().out == ""
+
+        return
+
+    pass
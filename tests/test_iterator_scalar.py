@@ -0,0 +1,138 @@
+import struct
+
+from datetime import datetime, timezone
+from random import Random
+
+import pytest
+import can_decoder
+
+
+def build_db(protocol=None) -> can_decoder.SignalDB:
+    db = can_decoder.SignalDB(protocol=protocol)
+
+    frame = can_decoder.Frame(frame_id=0x8CF004FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal("Signed12", 0, 12, signal_is_signed=True, signal_factor=0.5))
+    frame.add_signal(can_decoder.Signal("Unsigned3", 13, 3, signal_offset=-1.5))
+    frame.add_signal(can_decoder.Signal("Signed24", 16, 24, signal_is_signed=True, signal_factor=2))
+    frame.add_signal(can_decoder.Signal("BigEndian", 40, 16, signal_is_little_endian=False, signal_factor=0.125))
+    frame.add_signal(can_decoder.Signal("BigSigned", 56, 7, signal_is_little_endian=False, signal_is_signed=True))
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x98FEF1FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal("Float", 0, 32, signal_is_float=True))
+    frame.add_signal(can_decoder.Signal("BigFloat", 32, 32, signal_is_little_endian=False, signal_is_float=True))
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x98FEF2FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal("Double", 0, 64, signal_is_float=True, signal_offset=1))
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x98FEF3FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal("Wide", 4, 60, signal_is_signed=True))
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x98DAF100, frame_size=8)
+    service = can_decoder.Signal("Service", 8, 8, signal_is_little_endian=False)
+    pid = can_decoder.Signal("PID", 16, 8, signal_is_little_endian=False)
+    pid.add_multiplexed_signal(0x0C, can_decoder.Signal("EngineRPM", 24, 16, False, signal_factor=0.25))
+    pid.add_multiplexed_signal(0x0D, can_decoder.Signal("VehicleSpeed", 24, 8, False))
+    service.add_multiplexed_signal(0x41, pid)
+    frame.add_signal(service)
+    db.add_frame(frame)
+
+    return db
+
+
+def build_records(count: int):
+    rng = Random(1)
+    ids = [0x0CF004FE, 0x18FEF1FE, 0x18FEF2FE, 0x18FEF3FE, 0x18DAF100, 0x7FF]
+    records = []
+
+    for i in range(count):
+        record_id = rng.choice(ids)
+
+        if record_id == 0x18FEF1FE:
+            data = list(struct.pack("<f", rng.uniform(-1000, 1000)) + struct.pack(">f", rng.uniform(-1, 1)))
+        elif record_id == 0x18FEF2FE:
+            data = list(struct.pack("<d", rng.uniform(-1E6, 1E6)))
+        elif record_id == 0x18DAF100:
+            data = [4, 0x41, rng.choice([0x0C, 0x0D, 0x0E])] + [rng.randint(0, 255) for _ in range(5)]
+        else:
+            data = [rng.randint(0, 255) for _ in range(8)]
+
+        records.append({
+            "TimeStamp": (datetime(2020, 1, 1, tzinfo=timezone.utc).timestamp() + i * 1E-3) * 1E9,
+            "ID": record_id,
+            "IDE": record_id > 0x7FF,
+            "DataBytes": data,
+        })
+
+    return records
+
+
+class TestIteratorScalar(object):
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_matches_numpy(self, protocol):
+        db = build_db(protocol)
+        records = build_records(1000)
+
+        expected = list(can_decoder.IteratorDecoder(records, db))
+        result = list(can_decoder.IteratorDecoder(records, db, scalar=True))
+
+        assert len(expected) > 0
+        assert len(result) == len(expected)
+
+        for decoded, reference in zip(result, expected):
+            # The scalar path passes the timestamps on without conversion.
+            assert not isinstance(decoded.TimeStamp, datetime)
+            assert decoded.as_datetime() == reference.TimeStamp
+            assert decoded.CanID == reference.CanID
+            assert decoded.Signal == reference.Signal
+            assert decoded.SignalValueRaw == reference.SignalValueRaw
+            assert decoded.SignalValuePhysical == reference.SignalValuePhysical
+
+        return
+
+    def test_bytes_input(self):
+        db = build_db()
+        records = build_records(100)
+
+        expected = list(can_decoder.IteratorDecoder(records, db, scalar=True))
+
+        for record in records:
+            record["DataBytes"] = bytes(record["DataBytes"])
+
+        result = list(can_decoder.IteratorDecoder(records, db, scalar=True))
+
+        assert result == expected
+
+        return
+
+    def test_invalid_data(self):
+        frames = [
+            {
+                "TimeStamp": 0,
+                "ID": 0x0CF004FE,
+                "IDE": True,
+                "DataBytes": [0x04, 0x41, 0x0C, 0x32]
+            }
+        ]
+
+        uut = can_decoder.IteratorDecoder(frames, build_db(), scalar=True)
+
+        with pytest.warns(can_decoder.CANDecoderWarning):
+            result = list(uut)
+
+        # Only the signals within the first 4 bytes are present.
+        assert [decoded.Signal for decoded in result] == ["Signed12", "Unsigned3"]
+
+        return
+
+    def test_combined_with_batch(self):
+        with pytest.raises(ValueError):
+            can_decoder.IteratorDecoder([], build_db(), scalar=True, batch_size=16)
+
+        return
+
+    pass
@@ -0,0 +1,200 @@
+from random import Random
+
+import numpy as np
+import pytest
+import can_decoder
+
+
+class TestIteratorStateCache(object):
+
+    @pytest.fixture()
+    def protocol(self):
+        return None
+
+    @pytest.fixture()
+    def frame_obd2(self):
+        # OBD2 response frame, with the PID nested in the service.
+        frame = can_decoder.Frame(
+            frame_id=0x000007E8,
+            frame_size=8
+        )
+
+        signal_length = can_decoder.Signal(
+            signal_name="Length",
+            signal_start_bit=0,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_service = can_decoder.Signal(
+            signal_name="Service",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_pid = can_decoder.Signal(
+            signal_name="PID",
+            signal_start_bit=16,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_engine_rpm = can_decoder.Signal(
+            signal_name="EngineRPM",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.25,
+            signal_is_little_endian=False,
+        )
+
+        signal_vehicle_speed = can_decoder.Signal(
+            signal_name="VehicleSpeed",
+            signal_start_bit=24,
+            signal_size=8,
+            signal_is_little_endian=False,
+        )
+
+        signal_intake_temperature = can_decoder.Signal(
+            signal_name="IntakeTemperature",
+            signal_start_bit=24,
+            signal_size=8,
+            signal_offset=-40.0,
+            signal_is_little_endian=False,
+        )
+
+        signal_pid.add_multiplexed_signal(0x0C, signal_engine_rpm)
+        signal_pid.add_multiplexed_signal(0x0D, signal_vehicle_speed)
+        signal_pid.add_multiplexed_signal(0x0F, signal_intake_temperature)
+        signal_service.add_multiplexed_signal(0x41, signal_pid)
+
+        frame.add_signal(signal_length)
+        frame.add_signal(signal_service)
+
+        return frame
+
+    @pytest.fixture()
+    def db(self, protocol, frame_obd2):
+        # Setup decoding rules, a J1939 frame next to the OBD2 responses.
+        db = can_decoder.SignalDB(protocol=protocol)
+
+        frame_eec1 = can_decoder.Frame(
+            frame_id=0x8CF004FE,
+            frame_size=8
+        )
+
+        signal_torque = can_decoder.Signal(
+            signal_name="Torque",
+            signal_start_bit=8,
+            signal_size=8,
+            signal_offset=-125.0,
+        )
+
+        signal_engine_speed = can_decoder.Signal(
+            signal_name="EngineSpeed",
+            signal_start_bit=24,
+            signal_size=16,
+            signal_factor=0.125,
+        )
+
+        signal_temperature = can_decoder.Signal(
+            signal_name="Temperature",
+            signal_start_bit=48,
+            signal_size=12,
+            signal_is_signed=True,
+        )
+
+        frame_eec1.add_signal(signal_torque)
+        frame_eec1.add_signal(signal_engine_speed)
+        frame_eec1.add_signal(signal_temperature)
+
+        db.add_frame(frame_eec1)
+        db.add_frame(frame_obd2)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        # Random records, half of them OBD2 responses. The responses include the unsupported PID 0x0E.
+        rng = Random(5)
+        records = []
+
+        for i in range(200):
+            if rng.random() < 0.5:
+                frame_id, ide, data = 0x0CF004FE, True, [rng.randint(0, 255) for _ in range(8)]
+            else:
+                data = [4, 0x41, rng.choice([0x0C, 0x0D, 0x0E, 0x0F])] + [rng.randint(0, 255) for _ in range(5)]
+                frame_id, ide = 0x7E8, False
+
+            records.append({
+                "TimeStamp": 1577836800000000000 + i * 1000000,
+                "ID": frame_id,
+                "IDE": ide,
+                "DataBytes": data,
+            })
+
+        return records
+
+    def test_codes(self, db):
+        uut = can_decoder.SignalStateCache(db)
+
+        assert len(uut) == 7
+        assert uut.signal_names == (
+            "Torque", "EngineSpeed", "Temperature", "Length", "EngineRPM", "VehicleSpeed", "IntakeTemperature"
+        )
+        assert uut.frame_ids == (0x8CF004FE,) * 3 + (0x7E8,) * 4
+        assert uut.get_signal_code("EngineRPM") == 4
+        assert uut.get_signal_code("Unknown") is None
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 32},), ({"output": "frame"},)])
+    def test_latest_values(self, db, records, kwargs: dict):
+        uut = can_decoder.SignalStateCache(db)
+
+        decoder = can_decoder.IteratorDecoder(records, db, timestamp_format="ns", state_cache=uut, **kwargs)
+        output = list(decoder)
+
+        assert len(output) > 0
+
+        # Build the expected state from the signal stream.
+        expected = {}
+        for decoded in can_decoder.IteratorDecoder(records, db, timestamp_format="ns"):
+            expected[decoded.Signal] = decoded
+
+        state = uut.snapshot()
+
+        for code, name in enumerate(uut.signal_names):
+            if name not in expected:
+                assert not state.Valid[code]
+                assert np.isnan(state.SignalValuePhysical[code])
+                continue
+
+            assert state.Valid[code]
+            assert state.TimeStamp[code] == np.datetime64(expected[name].TimeStamp, "ns")
+            assert state.SignalValueRaw[code] == expected[name].SignalValueRaw
+            assert state.SignalValuePhysical[code] == expected[name].SignalValuePhysical
+
+        return
+
+    def test_snapshot_is_view(self, db, records):
+        uut = can_decoder.SignalStateCache(db)
+
+        state = uut.snapshot()
+        assert not state.Valid.any()
+
+        with pytest.raises(ValueError):
+            state.SignalValuePhysical[0] = 1
+
+        decoder = iter(can_decoder.IteratorDecoder(records, db, state_cache=uut))
+        next(decoder)
+
+        # The snapshot reflects updates without being retaken.
+        assert state.Valid.any()
+
+        uut.reset()
+        assert not state.Valid.any()
+
+        return
+
+    pass
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+import can_decoder
+
+
+class TestIteratorTimestamps(object):
+
+    @pytest.fixture()
+    def db(self):
+        db = can_decoder.SignalDB()
+
+        frame = can_decoder.Frame(frame_id=0x8CF004FE, frame_size=8)
+        frame.add_signal(can_decoder.Signal("EngineSpeed", 24, 16, signal_factor=0.125))
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def frames(self):
+        return [
+            {
+                "TimeStamp": 1577836800123456000,
+                "ID": 0x0CF004FE,
+                "IDE": True,
+                "DataBytes": [0x10, 0x7D, 0x82, 0xBD, 0x12, 0x00, 0xF4, 0x82]
+            }
+        ]
+
+    @pytest.mark.parametrize(
+        ("timestamp_format", "expected"),
+        [
+            ("datetime", datetime(2020, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc)),
+            ("ns", 1577836800123456000),
+            ("datetime64", np.datetime64(1577836800123456000, "ns")),
+            ("raw", 1577836800123456000),
+        ]
+    )
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 16},)])
+    def test_format(self, db, frames, timestamp_format: str, expected, kwargs: dict):
+        uut = can_decoder.IteratorDecoder(frames, db, timestamp_format=timestamp_format, **kwargs)
+
+        result = list(uut)
+
+        assert len(result) == 1
+        assert type(result[0].TimeStamp) == type(expected)
+        assert result[0].TimeStamp == expected
+        assert result[0].as_datetime() == datetime(2020, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc)
+
+        return
+
+    def test_default_formats(self, db, frames):
+        result = list(can_decoder.IteratorDecoder(frames, db))
+        assert isinstance(result[0].TimeStamp, datetime)
+
+        result = list(can_decoder.IteratorDecoder(frames, db, scalar=True))
+        assert result[0].TimeStamp == frames[0]["TimeStamp"]
+
+        return
+
+    def test_float_ns(self, db, frames):
+        frames[0]["TimeStamp"] = float(frames[0]["TimeStamp"])
+
+        result = list(can_decoder.IteratorDecoder(frames, db, timestamp_format="ns"))
+
+        assert isinstance(result[0].TimeStamp, int)
+
+        return
+
+    def test_unknown_format(self, db):
+        with pytest.raises(ValueError):
+            can_decoder.IteratorDecoder([], db, timestamp_format="seconds")
+
+        return
+
+    pass
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+import can_decoder
+
+
+def run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+class TestLazyImports(object):
+
+    def test_import_without_optional_dependencies(self):
+        result = run("import sys, can_decoder; print(sorted(m for m in ('pandas', 'canmatrix') if m in sys.modules))")
+
+        assert result == "[]"
+
+        return
+
+    def test_iterator_members_on_access(self):
+        modules = "('asyncio', 'can_decoder.iterator.ListenerDecoder', 'can_decoder.iterator.Subscription')"
+        result = run("import sys, can_decoder; print(sorted(m for m in {} if m in sys.modules))".format(modules))
+
+        assert result == "[]"
+
+        # Importing the listener decoder also imports the subscription module, which is replaced by its member.
+        result = run(
+            "import can_decoder; can_decoder.ListenerDecoder; "
+            "print(can_decoder.iterator.Subscription.__name__, can_decoder.iterator.ListenerDecoder.__name__)"
+        )
+
+        assert result == "Subscription ListenerDecoder"
+
+        return
+
+    @pytest.mark.env("pandas")
+    def test_load_on_access(self):
+        result = run("import sys, can_decoder; can_decoder.DataFrameDecoder; print('pandas' in sys.modules)")
+
+        assert result == "True"
+
+        return
+
+    def test_members(self):
+        assert "DataFrameDecoder" in dir(can_decoder)
+        assert can_decoder.load_dbc is can_decoder.DBCLoader.load_dbc
+        assert can_decoder.load_dbcs is can_decoder.DBCLoader.load_dbcs
+        assert can_decoder.AsyncIteratorDecoder is can_decoder.iterator.AsyncIteratorDecoder
+        assert "ListenerDecoder" in dir(can_decoder.iterator)
+
+        with pytest.raises(AttributeError):
+            getattr(can_decoder, "NotAMember")
+
+        return
+
+    pass
@@ -0,0 +1,69 @@
+from io import BytesIO
+
+import pytest
+import can_decoder
+
+from test_dbc_parser import DBC_J1939, DBC_OBD2, db_tree
+
+
+DBC_J1939_EXTRA = b"""VERSION ""
+
+BO_ 2566848254 ET1: 8 Vector__XXX
+ SG_ EngineCoolantTemperature : 0|8@1+ (1,-40) [-40|210] "deg C" Vector__XXX
+
+BA_DEF_  "ProtocolType" STRING ;
+BA_ "ProtocolType" "J1939";
+"""
+
+
+class TestLoadDBCs(object):
+
+    @pytest.mark.parametrize(("workers",), [(1,), (2,)])
+    def test_load(self, tmp_path, workers: int):
+        paths = []
+
+        for name, content in (("j1939.dbc", DBC_J1939), ("obd2.dbc", DBC_OBD2), ("copy.dbc", DBC_J1939)):
+            path = tmp_path / name
+            path.write_bytes(content)
+            paths.append(path)
+
+        result = can_decoder.load_dbcs(paths, workers=workers, use_custom_attribute="SPN")
+
+        assert len(result) == 3
+        assert db_tree(result[0]) == db_tree(can_decoder.load_dbc(BytesIO(DBC_J1939), use_custom_attribute="SPN"))
+        assert db_tree(result[1]) == db_tree(can_decoder.load_dbc(BytesIO(DBC_OBD2)))
+
+        # Identical files are parsed once.
+        assert result[2] is result[0]
+
+        return
+
+    @pytest.mark.parametrize(("workers",), [(1,), (2,)])
+    def test_merge(self, workers: int):
+        files = [BytesIO(DBC_J1939), BytesIO(DBC_J1939_EXTRA), BytesIO(DBC_J1939)]
+
+        result = can_decoder.load_dbcs(files, workers=workers, merge=True)
+
+        assert result.protocol == "J1939"
+        assert sorted(frame.name for frame in result.frames.values()) == ["CCVS1", "EEC1", "ET1"]
+
+        return
+
+    def test_merge_conflicts(self):
+        with pytest.raises(ValueError):
+            can_decoder.load_dbcs([BytesIO(DBC_J1939), BytesIO(DBC_OBD2)], workers=1, merge=True)
+
+        # Same PGN from another source address.
+        conflicting = DBC_J1939_EXTRA.replace(b"2566848254", b"2566848000")
+
+        with pytest.raises(ValueError):
+            can_decoder.load_dbcs([BytesIO(DBC_J1939_EXTRA), BytesIO(conflicting)], workers=1, merge=True)
+
+        return
+
+    def test_empty(self):
+        assert can_decoder.load_dbcs([]) == []
+
+        return
+
+    pass
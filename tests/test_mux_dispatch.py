@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+import can_decoder
+
+from can_decoder.MuxDispatch import MuxDispatch
+
+
+def build_multiplexer(value_count: int = 100) -> can_decoder.Signal:
+    multiplexer = can_decoder.Signal("PIDMux", 16, 8, signal_is_little_endian=False)
+
+    for value in range(value_count):
+        multiplexer.add_multiplexed_signal(value, can_decoder.Signal("PID{}".format(value), 24, 8))
+
+        # Some groups with several signals.
+        if value % 3 == 0:
+            multiplexer.add_multiplexed_signal(value, can_decoder.Signal("PID{}Extra".format(value), 32, 8))
+
+    return multiplexer
+
+
+class TestMuxDispatch(object):
+
+    @pytest.mark.parametrize(("dtype",), [(np.uint8,), (np.uint16,), (np.uint64,)])
+    def test_partition_matches_groups(self, dtype):
+        multiplexer = build_multiplexer()
+        uut = MuxDispatch(multiplexer.signals)
+
+        # Include values without a group.
+        mux_values = np.random.default_rng(0).integers(0, 120, size=(5000, 1)).astype(dtype)
+
+        result = uut.partition(mux_values)
+        expected = [
+            (value, multiplexer.signals[value], np.flatnonzero(mux_values[:, 0] == value))
+            for value in np.unique(mux_values).tolist()
+            if value in multiplexer.signals
+        ]
+
+        assert len(result) == len(expected)
+
+        for (signals, indices), (value, expected_signals, expected_indices) in zip(result, expected):
+            assert list(signals) == expected_signals
+            assert np.array_equal(indices, expected_indices)
+
+        return
+
+    def test_single_row(self):
+        uut = MuxDispatch(build_multiplexer().signals)
+
+        signals, indices = uut.partition(np.array([[3]], dtype=np.uint8))[0]
+        assert [signal.name for signal in signals] == ["PID3", "PID3Extra"]
+        assert indices.tolist() == [0]
+
+        assert uut.partition(np.array([[200]], dtype=np.uint8)) == []
+
+        return
+
+    def test_empty(self):
+        uut = MuxDispatch(build_multiplexer().signals)
+
+        # No rows, and rows without data for the multiplexer.
+        assert uut.partition(np.empty((0, 1), dtype=np.uint8)) == []
+        assert uut.partition(np.empty((4, 0), dtype=np.uint8)) == []
+
+        return
+
+    def test_group(self):
+        uut = MuxDispatch(build_multiplexer(4).signals)
+
+        assert [signal.name for signal in uut.group(0)] == ["PID0", "PID0Extra"]
+        assert [signal.name for signal in uut.group(1)] == ["PID1"]
+        assert uut.group(4) == ()
+        assert len(uut.signals) == 6
+
+        return
+
+    def test_ranges(self):
+        a, b, c = (can_decoder.Signal(name, 24, 8) for name in "ABC")
+        uut = MuxDispatch({range(0, 0x10000): [a], 5: [b], range(3, 8): [c]})
+
+        # Split into intervals on the bounds of the keys only: A, A+C, A+B+C, A+C and A.
+        assert len(uut.signals) == 9
+        assert uut.group(0) == (a,)
+        assert uut.group(5) == (a, b, c)
+        assert uut.group(7) == (a, c)
+        assert uut.group(0xFFFF) == (a,)
+        assert uut.group(0x10000) == ()
+
+        mux_values = np.array([9, 5, 0x10000, 4, 100, 2, 5, 0xFFFF], dtype=np.uint32)
+        result = [
+            ([signal.name for signal in signals], indices.tolist()) for signals, indices in uut.partition(mux_values)
+        ]
+
+        # The rows of all values in an interval form a single entry, in the order of the rows.
+        assert result == [
+            (["A"], [5]),
+            (["A", "C"], [3]),
+            (["A", "B", "C"], [1, 6]),
+            (["A"], [0, 4, 7]),
+        ]
+
+        return
+
+    pass
+
+
+class TestRulesChangedAfterDecoding(object):
+
+    @pytest.fixture()
+    def db(self) -> can_decoder.SignalDB:
+        db = can_decoder.SignalDB()
+
+        multiplexer = can_decoder.Signal("Mux", 0, 8)
+        multiplexer.add_multiplexed_signal(1, can_decoder.Signal("A", 8, 8))
+
+        frame = can_decoder.Frame(frame_id=0x123, frame_size=8)
+        frame.add_signal(multiplexer)
+        db.add_frame(frame)
+
+        return db
+
+    @pytest.fixture()
+    def records(self):
+        return [
+            {
+                "TimeStamp": 1577836800000000000 + i * 1000000,
+                "ID": 0x123,
+                "IDE": False,
+                "DataBytes": [value, 0x10 + value] + [0x00] * 6,
+            }
+            for i, value in enumerate([1, 2, 1, 2])
+        ]
+
+    @pytest.mark.parametrize(("kwargs",), [({},), ({"scalar": True},), ({"batch_size": 8},), ({"output": "frame"},)])
+    def test_iterator(self, db, records, kwargs: dict):
+        uut = can_decoder.IteratorDecoder(records, db, **kwargs)
+        assert len(list(uut)) == 2
+
+        # A group added after decoding is used by the same decoder.
+        db.frames[0x123].multiplexer.add_multiplexed_signal(2, can_decoder.Signal("B", 8, 8))
+        result = list(uut)
+
+        if kwargs.get("output", None) == "frame":
+            assert [entry.SignalValuesRaw for entry in result] == [(0x11, None), (None, 0x12)] * 2
+        else:
+            assert [(entry.Signal, entry.SignalValueRaw) for entry in result] == [("A", 0x11), ("B", 0x12)] * 2
+
+        return
+
+    def test_dataframe(self, db, records):
+        df = pd.DataFrame(records).set_index("TimeStamp")
+        uut = can_decoder.DataFrameDecoder(db)
+        assert list(uut.decode_frame(df)["Signal"]) == ["A", "A"]
+
+        db.frames[0x123].multiplexer.add_multiplexed_signal(2, can_decoder.Signal("B", 8, 8))
+        result = uut.decode_frame(df, labels=True)
+
+        assert list(result["Signal"]) == ["A", "B", "A", "B"]
+        assert result["Label"].isna().all()
+
+        # New value descriptions are used as well.
+        db.frames[0x123].multiplexer.signals[2][0].values = {0x12: "High"}
+        result = uut.decode_frame(df, labels=True)
+
+        assert [None if pd.isna(label) else label for label in result["Label"]] == [None, "High", None, "High"]
+
+        return
+
+    @pytest.mark.parametrize(("kwargs",), [({"scalar": True},), ({"batch_size": 8},)])
+    def test_other_rules_changed(self, db, records, kwargs: dict):
+        uut = can_decoder.IteratorDecoder(records, db, **kwargs)
+        list(uut)
+
+        compiled = [entry[2] for entry in list(uut._scalar_frames.values()) + list(uut._mux_dispatch.values())]
+        assert len(compiled) != 0
+
+        # Building and changing other rules does not affect the rules compiled by this decoder.
+        other = can_decoder.SignalDB()
+        multiplexer = can_decoder.Signal("Mux", 0, 8)
+        frame = can_decoder.Frame(frame_id=0x123, frame_size=8)
+        frame.add_signal(multiplexer)
+        other.add_frame(frame)
+        multiplexer.add_multiplexed_signal(1, can_decoder.Signal("C", 8, 8))
+
+        list(uut)
+
+        result = [entry[2] for entry in list(uut._scalar_frames.values()) + list(uut._mux_dispatch.values())]
+        assert len(result) == len(compiled)
+        assert all(before is after for before, after in zip(compiled, result))
+
+        return
+
+    pass
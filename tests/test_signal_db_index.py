@@ -0,0 +1,146 @@
+from io import BytesIO
+
+import can_decoder
+
+from test_dbc_parser import DBC_J1939
+
+
+def build_db() -> can_decoder.SignalDB:
+    db = can_decoder.SignalDB(protocol="OBD2")
+
+    speed = can_decoder.Signal("Speed", 24, 8, signal_is_little_endian=False)
+
+    pid = can_decoder.Signal("PIDMux", 16, 8, signal_is_little_endian=False)
+    pid.add_multiplexed_signal(0x0D, speed)
+    pid.add_multiplexed_signal(0x0E, speed)
+
+    service = can_decoder.Signal("ServiceMux", 8, 8, signal_is_little_endian=False)
+    service.add_multiplexed_signal(0x41, pid)
+
+    frame = can_decoder.Frame(frame_id=0x7E8, frame_size=8, frame_name="Response")
+    frame.add_signal(can_decoder.Signal("Length", 0, 8, signal_is_little_endian=False))
+    frame.add_signal(service)
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x7E9, frame_size=8, frame_name="Response2")
+    frame.add_signal(can_decoder.Signal("Length", 0, 8, signal_is_little_endian=False))
+    db.add_frame(frame)
+
+    return db
+
+
+class TestSignalDBIndex(object):
+
+    def test_signals(self):
+        db = build_db()
+
+        assert db.signals() == ["Length", "ServiceMux", "PIDMux", "Speed", "Speed", "Length"]
+
+        # The result is a copy.
+        db.signals().clear()
+        assert len(db.signals()) == 6
+
+        return
+
+    def test_frame_by_name(self):
+        db = build_db()
+
+        assert db.get_frame_by_name("Response2") is db.frames[0x7E9]
+        assert db.get_frame_by_name("Unknown") is None
+
+        return
+
+    def test_signal_locations(self):
+        db = build_db()
+
+        locations = db.get_signal_locations("Length")
+        assert [location.Frame.id for location in locations] == [0x7E8, 0x7E9]
+        assert all(location.MuxPath == () for location in locations)
+
+        service = db.frames[0x7E8].signals[1]
+        pid = service.signals[0x41][0]
+
+        locations = db.get_signal_locations("Speed")
+        assert [location.MuxPath for location in locations] == [
+            ((service, 0x41), (pid, 0x0D)),
+            ((service, 0x41), (pid, 0x0E)),
+        ]
+        assert all(location.Signal is pid.signals[0x0D][0] for location in locations)
+
+        assert db.get_signal_locations("Unknown") == []
+
+        return
+
+    def test_duplicate_frame_not_indexed(self):
+        db = build_db()
+
+        frame = can_decoder.Frame(frame_id=0x7E9, frame_size=8, frame_name="Duplicate")
+        frame.add_signal(can_decoder.Signal("Other", 0, 8))
+
+        assert db.add_frame(frame) is False
+        assert db.get_frame_by_name("Duplicate") is None
+        assert db.get_signal_locations("Other") == []
+
+        return
+
+    def test_frames_changed_after_adding(self):
+        # Signals added to a frame before the first lookup, and frames placed directly in the dictionary.
+        db = build_db()
+        db.frames[0x7E9].add_signal(can_decoder.Signal("Counter", 8, 8))
+
+        frame = can_decoder.Frame(frame_id=0x7EA, frame_size=8, frame_name="Direct")
+        frame.add_signal(can_decoder.Signal("Other", 0, 8))
+        db.frames[frame.id] = frame
+
+        assert db.signals()[-3:] == ["Length", "Counter", "Other"]
+        assert [location.Frame.id for location in db.get_signal_locations("Counter")] == [0x7E9]
+        assert db.get_frame_by_name("Direct") is frame
+
+        # Frames added after a lookup.
+        frame = can_decoder.Frame(frame_id=0x7EB, frame_size=8, frame_name="Added")
+        frame.add_signal(can_decoder.Signal("Counter", 8, 8))
+        db.add_frame(frame)
+
+        assert [location.Frame.id for location in db.get_signal_locations("Counter")] == [0x7E9, 0x7EB]
+        assert db.get_frame_by_name("Added") is frame
+
+        return
+
+    def test_signals_changed_after_lookup(self):
+        db = build_db()
+        assert db.get_signal_locations("Counter") == []
+
+        # Signals added to a frame or to a multiplexer after a lookup.
+        db.frames[0x7E9].add_signal(can_decoder.Signal("Counter", 8, 8))
+        pid = db.get_signal_locations("PIDMux")[0].Signal
+        pid.add_multiplexed_signal(0x0C, can_decoder.Signal("EngineSpeed", 24, 16, signal_is_little_endian=False))
+
+        assert [location.Frame.id for location in db.get_signal_locations("Counter")] == [0x7E9]
+        assert [location.MuxPath[-1] for location in db.get_signal_locations("EngineSpeed")] == [(pid, 0x0C)]
+        assert db.signals().count("EngineSpeed") == 1
+
+        # A frame replaced under the same ID, and a signal added to it afterwards.
+        frame = can_decoder.Frame(frame_id=0x7E9, frame_size=8, frame_name="Replaced")
+        db.frames[frame.id] = frame
+
+        assert db.get_signal_locations("Counter") == []
+        assert db.get_frame_by_name("Replaced") is frame
+
+        frame.add_signal(can_decoder.Signal("Status", 0, 8))
+        assert db.signals()[-1] == "Status"
+
+        return
+
+    def test_signals_by_attribute(self):
+        db = can_decoder.load_dbc(BytesIO(DBC_J1939))
+
+        locations = db.get_signals_by_attribute("SPN", "190")
+        assert [(location.Frame.id, location.Signal.name) for location in locations] == [(0x8CF004FE, "EngineSpeed")]
+        assert locations[0].Signal.attributes == {"SPN": "190"}
+
+        assert db.get_signals_by_attribute("SPN", "0") == []
+        assert db.get_signals_by_attribute("Unknown", "190") == []
+
+        return
+
+    pass
@@ -0,0 +1,201 @@
+import json
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+import can_decoder
+
+from test_dbc_parser import DBC_J1939, DBC_OBD2, db_tree
+
+
+# Simple multiplexing, with a plain signal in the multiplexed frame.
+DBC_SIMPLE_MUX = b"""VERSION ""
+
+BO_ 1024 Status: 8 Vector__XXX
+ SG_ Page M : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ Counter : 8|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ Voltage m0 : 16|16@1+ (0.01,0) [0|655.35] "V" Vector__XXX
+ SG_ Current m1 : 16|16@1- (0.1,0) [-3276.8|3276.7] "A" Vector__XXX
+"""
+
+
+def build_db() -> can_decoder.SignalDB:
+    db = can_decoder.SignalDB(protocol="OBD2")
+
+    # Signal present in several multiplexer groups.
+    speed = can_decoder.Signal("Speed", 24, 8, signal_is_little_endian=False)
+    rpm = can_decoder.Signal("EngineRPM", 24, 16, signal_factor=0.25, signal_is_little_endian=False)
+
+    pid = can_decoder.Signal("PIDMux", 16, 8, signal_is_little_endian=False)
+    pid.add_multiplexed_signal(0x0C, rpm)
+    pid.add_multiplexed_signal(0x0D, speed)
+    pid.add_multiplexed_signal(0x0E, speed)
+
+    service = can_decoder.Signal("ServiceMux", 8, 8, signal_is_little_endian=False)
+    service.add_multiplexed_signal(0x41, pid)
+
+    frame = can_decoder.Frame(frame_id=0x7E8, frame_size=8, frame_name="Response")
+    frame.add_signal(can_decoder.Signal("Length", 0, 8, signal_is_little_endian=False))
+    frame.add_signal(service)
+    db.add_frame(frame)
+
+    frame = can_decoder.Frame(frame_id=0x9CF004FE, frame_size=8, frame_name="Ünits")
+    frame.add_signal(can_decoder.Signal(
+        "Torque", 8, 8, signal_is_signed=True, signal_offset=-125.0, signal_attributes={"SPN": "513"}
+    ))
+    frame.add_signal(can_decoder.Signal("Ratio", 32, 32, signal_is_float=True))
+    db.add_frame(frame)
+
+    return db
+
+
+def damage_index(path, table: str, field: str, value: int) -> None:
+    # Overwrite a field of the first row of a table, in place.
+    serializer = can_decoder.SignalDBSerializer
+    content = bytearray(path.read_bytes())
+
+    header_start = len(serializer.magic) + 4
+    header_length = int.from_bytes(content[len(serializer.magic):header_start], "little")
+    header = json.loads(content[header_start:header_start + header_length].decode("utf-8"))
+    assert header["tables"][table][1] > 0
+
+    dtype = getattr(serializer, "_{}_dtype".format(table.rstrip("s")))
+    start = serializer._padded(header_start + header_length) + header["tables"][table][0] + dtype.fields[field][1]
+    size = dtype.fields[field][0].itemsize
+    content[start:start + size] = np.array(value, dtype=dtype.fields[field][0]).tobytes()
+
+    path.write_bytes(bytes(content))
+    return
+
+
+class TestSignalDBSerializer(object):
+
+    def test_round_trip(self, tmp_path):
+        db = build_db()
+        path = tmp_path / "rules.candb"
+
+        db.save(path)
+        result = can_decoder.SignalDB.load(path)
+
+        assert result.protocol == "OBD2"
+        assert db_tree(result) == db_tree(db)
+        assert result.frames[0x9CF004FE].name == "Ünits"
+        assert result.frames[0x9CF004FE].signals[0].attributes == {"SPN": "513"}
+
+        frame = result.frames[0x7E8]
+        assert frame.multiplexer is frame.signals[1]
+
+        pid = frame.signals[1].signals[0x41][0]
+        assert list(pid.signals.keys()) == [0x0C, 0x0D, 0x0E]
+        assert pid.signals[0x0D][0] is pid.signals[0x0E][0]
+
+        return
+
+    def test_round_trip_simple_multiplexing(self, tmp_path):
+        db = can_decoder.load_dbc(BytesIO(DBC_SIMPLE_MUX))
+        path = tmp_path / "rules.candb"
+
+        db.save(path)
+        result = can_decoder.SignalDB.load(path)
+
+        assert db_tree(result) == db_tree(db)
+
+        # The plain signal is kept in the group without a multiplexer value.
+        multiplexer = result.frames[1024].multiplexer
+        assert None in multiplexer.signals
+        assert [signal.name for signal in multiplexer.signals[None]] == ["Counter"]
+
+        return
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "empty.candb"
+
+        can_decoder.SignalDB().save(path)
+        result = can_decoder.SignalDB.load(path)
+
+        assert result.protocol is None
+        assert len(result.frames) == 0
+
+        return
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "invalid.candb"
+        path.write_bytes(b"VERSION \"\"\n")
+
+        with pytest.raises(ValueError):
+            can_decoder.SignalDB.load(path)
+
+        return
+
+    @pytest.mark.parametrize(("table", "field", "value"), [
+        ("links", "signal", 1000),
+        ("links", "parent", -2),
+        ("links", "frame", 2),
+        ("signals", "name", 1000),
+        ("attributes", "signal", 1000),
+    ])
+    def test_corrupt_indices(self, tmp_path, table: str, field: str, value: int):
+        path = tmp_path / "corrupt.candb"
+        build_db().save(path)
+        damage_index(path, table, field, value)
+
+        with pytest.raises(ValueError):
+            can_decoder.SignalDB.load(path)
+
+        return
+
+    def test_truncated_file(self, tmp_path):
+        path = tmp_path / "truncated.candb"
+        build_db().save(path)
+        path.write_bytes(path.read_bytes()[:-16])
+
+        with pytest.raises(ValueError):
+            can_decoder.SignalDB.load(path)
+
+        return
+
+    @pytest.mark.parametrize(("dbc",), [(DBC_J1939,), (DBC_OBD2,), (DBC_SIMPLE_MUX,)])
+    def test_load_dbc_cache(self, tmp_path, dbc: bytes):
+        cache_dir = tmp_path / "cache"
+
+        expected = can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN")
+        first = can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN", cache_dir=cache_dir)
+
+        entries = list(cache_dir.iterdir())
+        assert len(entries) == 1
+
+        # Load from the cache.
+        second = can_decoder.load_dbc(BytesIO(dbc), use_custom_attribute="SPN", cache_dir=cache_dir)
+
+        assert db_tree(first) == db_tree(expected)
+        assert db_tree(second) == db_tree(expected)
+        assert list(cache_dir.iterdir()) == entries
+
+        # Other loader options use a separate entry.
+        can_decoder.load_dbc(BytesIO(dbc), cache_dir=cache_dir)
+        assert len(list(cache_dir.iterdir())) == 2
+
+        return
+
+    @pytest.mark.parametrize(("damage",), [(None,), (("links", "signal", 1000),), (("signals", "name", 1000),)])
+    def test_load_dbc_cache_corrupt(self, tmp_path, damage):
+        cache_dir = tmp_path / "cache"
+
+        can_decoder.load_dbc(BytesIO(DBC_OBD2), cache_dir=cache_dir)
+        entry = next(cache_dir.iterdir())
+
+        if damage is None:
+            entry.write_bytes(b"CANDB")
+        else:
+            damage_index(entry, *damage)
+
+        # The unusable entry is replaced.
+        result = can_decoder.load_dbc(BytesIO(DBC_OBD2), cache_dir=cache_dir)
+
+        assert db_tree(result) == db_tree(can_decoder.load_dbc(BytesIO(DBC_OBD2)))
+        assert can_decoder.SignalDB.load(entry).protocol == "OBD2"
+
+        return
+
+    pass
@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+import can_decoder
+
+
+class TestSignalHash(object):
+
+    def test_signal_hash_invalidated(self):
+        uut = can_decoder.Signal("EngineSpeed", 24, 16, signal_factor=0.125)
+        other = can_decoder.Signal("EngineSpeed", 24, 16, signal_factor=0.125)
+
+        assert uut == other
+        assert hash(uut) == hash(other)
+        assert len({uut, other}) == 1
+
+        # Changing a hashed attribute after hashing.
+        uut.name = "190"
+
+        assert uut != other
+        assert hash(uut) == hash(can_decoder.Signal("190", 24, 16, signal_factor=0.125))
+
+        # Multiplexed signals are not part of the hash.
+        uut.add_multiplexed_signal(1, other)
+
+        assert uut == can_decoder.Signal("190", 24, 16, signal_factor=0.125)
+
+        return
+
+    def test_frame_hash_invalidated(self):
+        uut = can_decoder.Frame(0x7E8, 8, "Response")
+        other = can_decoder.Frame(0x7E8, 8, "Other")
+
+        assert uut == other
+        assert hash(uut) == hash(other)
+
+        uut.size = 4
+
+        assert uut != other
+        assert hash(uut) == hash(can_decoder.Frame(0x7E8, 4))
+
+        return
+
+    @pytest.mark.parametrize(("uut",), [
+        (can_decoder.Signal("EngineSpeed", 24, 16),),
+        (can_decoder.Frame(0x7E8, 8, "Response"),),
+    ])
+    def test_slots(self, uut):
+        assert not hasattr(uut, "__dict__")
+
+        with pytest.raises(AttributeError):
+            uut.unknown_attribute = 0
+
+        return
+
+    def test_pickle(self):
+        signal = can_decoder.Signal("EngineSpeed", 24, 16, signal_factor=0.125)
+        frame = can_decoder.Frame(0x8CF004FE, 8, "EEC1")
+        frame.add_signal(signal)
+        hash(signal)
+        hash(frame)
+
+        result = pickle.loads(pickle.dumps(frame))
+
+        # The hashes are computed again on first use.
+        assert result._hash is None
+        assert result.signals[0]._hash is None
+
+        assert result == frame
+        assert result.name == "EEC1"
+        assert result.signals == [signal]
+
+        return
+
+    pass
@@ -0,0 +1,130 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+import can_decoder
+
+from can_decoder.ValueTable import ValueTable
+from test_dbc_parser import DBC_J1939
+
+
+def build_db(protocol=None) -> can_decoder.SignalDB:
+    db = can_decoder.SignalDB(protocol=protocol)
+
+    frame = can_decoder.Frame(frame_id=0x8CF004FE, frame_size=8)
+    frame.add_signal(can_decoder.Signal(
+        "Mode", 0, 4, signal_values={0: "Off", 1: "On", 2: "On", 14: "Error"}
+    ))
+    frame.add_signal(can_decoder.Signal(
+        "Gear", 8, 8, signal_is_signed=True, signal_values={-1: "Reverse", 0: "Neutral", 1: "First"}
+    ))
+    frame.add_signal(can_decoder.Signal("Speed", 16, 16, signal_factor=0.5))
+    db.add_frame(frame)
+
+    return db
+
+
+def build_data_frame() -> pd.DataFrame:
+    records = [
+        [0x00, 0x00, 0x10, 0x00],
+        [0x01, 0xFF, 0x10, 0x00],
+        [0x02, 0x01, 0x10, 0x00],
+        [0x05, 0x02, 0x10, 0x00],
+        [0x0E, 0xFE, 0x10, 0x00],
+    ]
+
+    return pd.DataFrame([
+        {"TimeStamp": i, "ID": 0x0CF004FE, "IDE": True, "DataBytes": data + [0x00] * 4}
+        for i, data in enumerate(records)
+    ]).set_index("TimeStamp")
+
+
+class TestValueTable(object):
+
+    @pytest.mark.parametrize(("largest",), [(4000,), (1 << 40,)])
+    def test_lookup(self, largest: int):
+        # A small range of values uses the dense array, a large one the binary search.
+        uut = ValueTable({3: "A", 10: "B", largest: "A"})
+
+        assert uut.categories == ["A", "B"]
+        assert (uut._dense is not None) == (largest < ValueTable.dense_limit)
+
+        raw_values = np.array([0, 3, 4, 10, largest, largest + 1, -5])
+        assert uut.lookup(raw_values).tolist() == [-1, 0, -1, 1, 0, -1, -1]
+
+        return
+
+    def test_empty(self):
+        uut = ValueTable({})
+
+        assert uut.categories == []
+        assert uut.lookup(np.array([1, 2], dtype=np.uint8)).tolist() == [-1, -1]
+
+        return
+
+    pass
+
+
+class TestDataFrameLabels(object):
+
+    @pytest.mark.parametrize(("protocol",), [(None,), ("J1939",)])
+    def test_labels(self, protocol):
+        result = can_decoder.DataFrameDecoder(build_db(protocol)).decode_frame(build_data_frame(), labels=True)
+
+        assert isinstance(result["Label"].dtype, pd.CategoricalDtype)
+        assert list(result["Label"].cat.categories) == ["Off", "On", "Error", "Reverse", "Neutral", "First"]
+
+        labels = {
+            name: [None if pd.isna(label) else label for label in group["Label"]]
+            for name, group in result.groupby("Signal")
+        }
+
+        assert labels["Mode"] == ["Off", "On", "On", None, "Error"]
+        assert labels["Gear"] == ["Neutral", "Reverse", "First", None, None]
+        assert labels["Speed"] == [None] * 5
+
+        return
+
+    def test_disabled(self):
+        decoder = can_decoder.DataFrameDecoder(build_db())
+
+        assert "Label" not in decoder.decode_frame(build_data_frame()).columns
+        assert "Label" not in decoder.decode_frame(build_data_frame(), labels=True, columns_to_drop=["Label"]).columns
+
+        return
+
+    def test_channels(self):
+        rules = can_decoder.ChannelSignalDB({0: build_db(), 1: build_db("J1939")})
+        df = build_data_frame()
+        df["BusChannel"] = [0, 1, 0, 1, 0]
+
+        result = can_decoder.DataFrameDecoder(rules).decode_frame(df, labels=True)
+        modes = result[result["Signal"] == "Mode"]
+
+        assert isinstance(result["Label"].dtype, pd.CategoricalDtype)
+        assert [None if pd.isna(label) else label for label in modes["Label"]] == ["Off", "On", "On", None, "Error"]
+
+        return
+
+    pass
+
+
+class TestLoadValueTables(object):
+
+    def test_load_dbc(self, tmp_path):
+        db = can_decoder.load_dbc(BytesIO(DBC_J1939))
+        expected = {0: "Low idle governor", 1: "Accelerator pedal", 15: "Not available"}
+
+        assert db.get_signal_locations("EngineTorqueMode")[0].Signal.values == expected
+        assert db.get_signal_locations("EngineSpeed")[0].Signal.values == {}
+
+        # Kept in the binary format.
+        db.save(tmp_path / "rules.candb")
+        result = can_decoder.SignalDB.load(tmp_path / "rules.candb")
+
+        assert result.get_signal_locations("EngineTorqueMode")[0].Signal.values == expected
+
+        return
+
+    pass